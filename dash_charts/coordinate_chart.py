@@ -8,6 +8,7 @@ unless None. This can be used to create all sorts of visualizations that have sp
 import calendar
 import cmath
 import math
+from functools import lru_cache
 from itertools import chain
 
 import numpy as np
@@ -16,12 +17,39 @@ import plotly.graph_objects as go
 
 from .utils_fig import CustomChart, check_raw_data
 
-# PLANNED: subplots for multiple years of calendar charts (Subplot title is year)
+
+@lru_cache(maxsize=32)
+def _calculate_grid_cached(grid_dims, corners_x, corners_y, width, height):
+    """Calculate the grid x and y coordinates for hashable arguments. See `calculate_grid`.
+
+    Args:
+        grid_dims: tuple of the number of tiles in grid. In format `(row, column)`
+        corners_x: tuple of the x corner coordinates
+        corners_y: tuple of the y corner coordinates
+        width: float width in pixels
+        height: float height in pixels
+
+    Returns:
+        dict: with keys `(x, y)` with read-only arrays of float values
+
+    """
+    count_rows, count_cols = grid_dims
+    x_offsets = width * np.tile(np.arange(count_cols), count_rows)
+    y_offsets = height * np.repeat(np.arange(count_rows, 0, -1), count_cols)
+    grid = {
+        'x': (x_offsets[:, np.newaxis] + np.asarray(corners_x, dtype=float)).ravel(),
+        'y': (y_offsets[:, np.newaxis] - np.asarray(corners_y, dtype=float)).ravel(),
+    }
+    for coords in grid.values():
+        coords.setflags(write=False)
+    return grid
 
 
 def calculate_grid(grid_dims, corners, width, height):
     """Calculate the grid x and y coordinates.
 
+    Coordinates are ordered by tile (row by row) then by corner. Results are cached by the arguments
+
     Args:
         grid_dims: tuple of the number of tiles in grid. In format `(row, column)`
         corners: dictionary with keys `(x, y)` containing lists of the four exterior corner coordinates
@@ -29,18 +57,67 @@ def calculate_grid(grid_dims, corners, width, height):
         height: float height in pixels
 
     Returns:
-        dict: with keys `(x, y)` with lists of lists containing float values
+        dict: with keys `(x, y)` with read-only arrays of float values
 
     """
-    grid = {'x': [], 'y': []}
-    for r_idx in range(grid_dims[0]):
-        y_offset = height * (grid_dims[0] - r_idx)
-        y_grid = [y_offset - _y for _y in corners['y']]
-        for c_idx in range(grid_dims[1]):
-            x_offset = width * c_idx
-            grid['x'].extend([x_offset + _x for _x in corners['x']])
-            grid['y'].extend(y_grid)
-    return grid
+    return _calculate_grid_cached(
+        tuple(grid_dims), tuple(np.asarray(corners['x'], dtype=float).tolist()),
+        tuple(np.asarray(corners['y'], dtype=float).tolist()), float(width), float(height),
+    )
+
+
+def align_grid_values(values, count_cells):
+    """Align values with the grid coordinates as a masked array.
+
+    Args:
+        values: array of values for each cell in the order of `calculate_grid`. None or NaN values are not plotted
+        count_cells: number of cells in the grid
+
+    Returns:
+        MaskedArray: of length `count_cells` where missing values and cells without a value are masked
+
+    Raises:
+        ValueError: if there are more values than cells in the grid
+
+    """
+    values = np.asarray(values)
+    if len(values) > count_cells:
+        raise ValueError(f'Received {len(values)} values for a grid of {count_cells} cells')
+    aligned = np.ma.masked_all(count_cells, dtype=values.dtype)
+    aligned[:len(values)] = np.ma.masked_where(pd.isna(values), values)
+    return aligned
+
+
+def calculate_lattice(grid, max_cell_ratio=4):
+    """Calculate the rectangular lattice that contains every grid coordinate for rendering with a heatmap.
+
+    Args:
+        grid: dictionary with keys `(x, y)` from `calculate_grid`
+        max_cell_ratio: maximum number of lattice cells per grid coordinate. Default is 4
+
+    Returns:
+        dict: with keys `(x, y)` for the evenly spaced lattice coordinates and `(x_index, y_index)` for the position of
+            each grid coordinate in the lattice. None if the coordinates are not evenly spaced, overlap, or the lattice
+            would be too sparse
+
+    """
+    lattice = {}
+    for axis in ['x', 'y']:
+        coords = np.asarray(grid[axis], dtype=float)
+        unique = np.unique(coords)
+        step = np.min(np.diff(unique)) if len(unique) > 1 else 1.0
+        positions = (coords - unique[0]) / step
+        indices = np.round(positions).astype(int)
+        if not np.allclose(positions, indices, rtol=0, atol=1e-6):
+            return None
+        lattice[axis] = unique[0] + step * np.arange(indices.max() + 1)
+        lattice[f'{axis}_index'] = indices
+
+    count_cells = len(lattice['x']) * len(lattice['y'])
+    flat_indices = lattice['y_index'] * len(lattice['x']) + lattice['x_index']
+    if count_cells > max_cell_ratio * len(flat_indices) or len(np.unique(flat_indices)) != len(flat_indices):
+        return None
+    return lattice
 
 
 def calculate_border(grid_dims, width, height):
@@ -68,6 +145,42 @@ def calculate_border(grid_dims, width, height):
     ]
 
 
+def calculate_border_path(grid_dims, width, height):
+    """Calculate all border lines as a single path where each line is separated by None.
+
+    Args:
+        grid_dims: tuple of the number of tiles in grid. In format `(row, column)`
+        width: float width in pixels
+        height: float height in pixels
+
+    Returns:
+        dict: with keys `(x, y)` and lists of the start, end, and None for each line (see `calculate_border`)
+
+    """
+    count_rows, count_cols = grid_dims
+    x_vertical = np.arange(count_cols + 1) * width
+    y_horizontal = np.arange(count_rows + 1) * height
+    x_points = [
+        np.concatenate([x_vertical, np.zeros(count_rows + 1)]),
+        np.concatenate([x_vertical, np.full(count_rows + 1, width * count_cols)]),
+    ]
+    y_points = [
+        np.concatenate([np.zeros(count_cols + 1), y_horizontal]),
+        np.concatenate([np.full(count_cols + 1, height * count_rows), y_horizontal]),
+    ]
+    path = {}
+    for axis, (starts, ends) in [('x', x_points), ('y', y_points)]:
+        segments = np.full((len(starts), 3), None, dtype=object)
+        segments[:, 0] = starts
+        segments[:, 1] = ends
+        path[axis] = segments.ravel().tolist()
+    return path
+
+
+RENDER_BACKENDS = ('scatter', 'scattergl', 'heatmap')
+"""Supported values for `CoordinateChart.render_backend`."""
+
+
 class CoordinateChart(CustomChart):  # noqa: H601
     """Coordinate Chart."""
 
@@ -80,9 +193,28 @@ class CoordinateChart(CustomChart):  # noqa: H601
     marker_kwargs = None
     """Marker keyword arguments used in `create_marker()`. Default is None."""
 
+    single_trace_mode = False
+    """If True, draw all borders as one None-separated line trace and the titles as one text trace. Default is False.
+
+    Reduces the number of traces and annotations that Plotly.js must render for grids with many tiles
+
+    """
+
+    render_backend = 'scatter'
+    """Trace type for the values from `RENDER_BACKENDS`. Default is `scatter`.
+
+    `scattergl` draws the same markers with WebGL. `heatmap` draws a `go.Heatmap` when the grid coordinates form an
+    evenly spaced lattice (such as `YearGrid` and `MonthGrid`) and the values are numeric, otherwise `scattergl`
+
+    """
+
     # Private states for managing coordinate chart dimensions
     _grid: dict
+    _lattice: dict
     _borders: list
+    _border_path: dict
+    _titles: dict
+    _title_annotations: list
 
     def __init__(self, *, title, grid_dims, corners, titles=None, layout_overrides=()):
         """Initialize Coordinate Chart and store parameters as data members.
@@ -118,21 +250,24 @@ class CoordinateChart(CustomChart):  # noqa: H601
         # Set grid and border coordinates for traces
         self._grid = calculate_grid(grid_dims, corners, width, height)
         self._borders = calculate_border(grid_dims, width, height)
+        self._border_path = calculate_border_path(grid_dims, width, height)
+        self._lattice = calculate_lattice(self._grid)
 
-        # Add titles to annotations if provided
-        if titles is None:
-            self.annotations = []
-        else:
+        # Calculate the title positions for annotations (or the text trace in `single_trace_mode`)
+        self._titles = {'x': [], 'y': [], 'text': []}
+        if titles is not None:
+            indices = np.array([idx for idx, title in enumerate(titles) if title is not None], dtype=int)
             v_offset = np.min(corners['y']) * 0.4
-            self.annotations = [
-                go.layout.Annotation(
-                    ax=0, ay=0,
-                    x=(idx % grid_dims[1] + 0.5) * width,  # noqa: S001
-                    y=(grid_dims[0] - int(idx / grid_dims[1]) % grid_dims[0]) * height - v_offset,
-                    text=title,
-                )
-                for idx, title in enumerate(titles) if title is not None
-            ]
+            self._titles = {
+                'x': ((indices % grid_dims[1] + 0.5) * width).tolist(),
+                'y': ((grid_dims[0] - (indices // grid_dims[1]) % grid_dims[0]) * height - v_offset).tolist(),
+                'text': [titles[idx] for idx in indices],
+            }
+        self._title_annotations = [
+            go.layout.Annotation(ax=0, ay=0, x=x_title, y=y_title, text=title)
+            for x_title, y_title, title in zip(self._titles['x'], self._titles['y'], self._titles['text'])
+        ]
+        self.annotations = [*self._title_annotations]
 
     def create_traces(self, df_raw):
         """Return traces for plotly chart.
@@ -147,36 +282,103 @@ class CoordinateChart(CustomChart):  # noqa: H601
         # Check that the raw data frame is properly formatted
         check_raw_data(df_raw, min_keys=['values'])
 
-        # Merge x/y grid data with values. Temporarily extend values with None, then drop those rows
-        values = df_raw['values'].to_list()
-        values.extend([None] * (len(self._grid['x']) - len(values)))
+        # Merge x/y grid data with values, skipping the masked cells that have no value
+        values = align_grid_values(df_raw['values'].to_numpy(), len(self._grid['x']))
+        is_visible = ~np.ma.getmaskarray(values)
         df_grid = pd.DataFrame(
             data={
-                'values': values,
-                'x': self._grid['x'],
-                'y': self._grid['y'],
+                'values': values.compressed(),
+                'x': self._grid['x'][is_visible],
+                'y': self._grid['y'][is_visible],
             },
-        ).dropna()
+        )
+
+        markers = self.create_value_trace(df_grid, is_visible)
+        if self.single_trace_mode:
+            return [self.create_border_trace(self._border_path), markers, *self.create_title_traces()]
+        return [self.create_border_trace(border) for border in self._borders] + [markers]
+
+    def create_value_trace(self, df_grid, is_visible):
+        """Return the trace for the values based on `render_backend`.
+
+        Args:
+            df_grid: pandas dataframe with the columns `values`, `x: float`, `y: float` for each visible cell
+            is_visible: boolean array for each grid coordinate that is True if the cell has a value
+
+        Returns:
+            trace: `go.Scatter`, `go.Scattergl`, or `go.Heatmap`
+
+        Raises:
+            ValueError: if `render_backend` is not supported
+
+        """
+        if self.render_backend not in RENDER_BACKENDS:
+            raise ValueError(f'Unknown render_backend: {self.render_backend}. Expected one of {RENDER_BACKENDS}')
+
+        marker = self.create_marker(df_grid, **(self.marker_kwargs or {}))
+        if self.render_backend == 'heatmap' and self._lattice is not None:
+            values = pd.to_numeric(df_grid['values'], errors='coerce').to_numpy(dtype=float)
+            if not np.isnan(values).any():
+                z_values = np.full((len(self._lattice['y']), len(self._lattice['x'])), np.nan)
+                z_values[self._lattice['y_index'][is_visible], self._lattice['x_index'][is_visible]] = values
+                return go.Heatmap(
+                    colorscale=marker.get('colorscale'),
+                    hoverongaps=False,
+                    hovertemplate='%{z}<extra></extra>',
+                    showscale=marker.get('showscale', True),
+                    x=self._lattice['x'],
+                    y=self._lattice['y'],
+                    z=z_values,
+                )
+
+        trace_class = go.Scatter if self.render_backend == 'scatter' else go.Scattergl
+        return trace_class(
+            hoverinfo='text',
+            mode='markers',
+            showlegend=False,
+            text=df_grid['values'],
+            x=df_grid['x'],
+            y=df_grid['y'],
+            marker=marker,
+        )
+
+    def create_border_trace(self, border):
+        """Return the line trace for one or more borders.
+
+        Args:
+            border: dictionary with keys `(x, y)` from `calculate_border` or `calculate_border_path`
 
+        Returns:
+            Scatter: line trace
+
+        """
+        return go.Scatter(
+            hoverinfo='none',
+            line=self.border_line or {'color': 'black'},
+            mode='lines',
+            opacity=self.border_opacity,
+            showlegend=False,
+            x=border['x'],
+            y=border['y'],
+        )
+
+    def create_title_traces(self):
+        """Return the titles as a single text trace for `single_trace_mode`.
+
+        Returns:
+            list: with the text trace or empty if there are no titles
+
+        """
+        if not self._titles['text']:
+            return []
         return [
             go.Scatter(
-                hoverinfo='none',
-                line=self.border_line or {'color': 'black'},
-                mode='lines',
-                opacity=self.border_opacity,
-                showlegend=False,
-                x=border['x'],
-                y=border['y'],
-            ) for border in self._borders
-        ] + [
-            go.Scatter(
-                hoverinfo='text',
-                mode='markers',
+                hoverinfo='skip',
+                mode='text',
                 showlegend=False,
-                text=df_grid['values'],
-                x=df_grid['x'],
-                y=df_grid['y'],
-                marker=self.create_marker(df_grid, **(self.marker_kwargs or {})),
+                text=self._titles['text'],
+                x=self._titles['x'],
+                y=self._titles['y'],
             ),
         ]
 
@@ -211,6 +413,11 @@ class CoordinateChart(CustomChart):  # noqa: H601
 
         """
         layout = super().create_layout()
+        if self.single_trace_mode:
+            title_ids = {id(annotation) for annotation in self._title_annotations}
+            layout['annotations'] = [
+                annotation for annotation in layout['annotations'] if id(annotation) not in title_ids
+            ]
         for axis in ['xaxis', 'yaxis']:
             layout[axis]['showgrid'] = False
             layout[axis]['showticklabels'] = False
@@ -340,6 +547,51 @@ class YearGrid(GridClass):  # noqa: H601
             values.extend([None] * (len(self.corners['x']) - idx_first_day - count_days))
         return values
 
+    def format_series(self, daily_values):
+        """Return the formatted values for each year of a daily time series without iterating over each day.
+
+        Each day's grid position is calculated from the month, day of month, and weekday of the first of the month
+        consistent with `format_data`
+
+        Args:
+            daily_values: pandas series of numeric values with a DatetimeIndex (one value per day). May span many years
+
+        Returns:
+            dict: with the year as key and a dataframe with the column `values` aligned with the grid (NaN if no data)
+
+        """
+        dates = pd.DatetimeIndex(daily_values.index)
+        cells_per_month = len(self.corners['x'])
+        first_weekday = (dates - pd.to_timedelta(dates.day - 1, unit='D')).weekday.to_numpy()
+        # Offset by one to start the week on Sunday (see `format_data`)
+        cells = (dates.month.to_numpy() - 1) * cells_per_month + first_weekday + dates.day.to_numpy()
+        years, year_indices = np.unique(dates.year.to_numpy(), return_inverse=True)
+        values = np.full((len(years), 12 * cells_per_month), np.nan)
+        values[year_indices, cells] = daily_values.to_numpy(dtype=float)
+        return {int(year): pd.DataFrame(data={'values': year_values}) for year, year_values in zip(years, values)}
+
+    def create_figures(self, daily_values, chart=None, title_format='{year}'):
+        """Return one calendar figure for each year of a daily time series.
+
+        Args:
+            daily_values: pandas series of numeric values with a DatetimeIndex. See `format_series`
+            chart: optional `CoordinateChart` created for this grid. Default is None to create a chart with the grid's
+                `marker_kwargs`
+            title_format: format string for the title of each figure. Default is `'{year}'`
+
+        Returns:
+            dict: with the year as key and the figure dictionary as value
+
+        """
+        if chart is None:
+            chart = CoordinateChart(title='', grid_dims=self.grid_dims, corners=self.corners, titles=self.titles)
+            chart.marker_kwargs = {**(self.marker_kwargs or {})}
+        figures = {}
+        for year, df_year in self.format_series(daily_values).items():
+            chart.title = title_format.format(year=year)
+            figures[year] = chart.create_figure(df_raw=df_year)
+        return figures
+
 
 class MonthGrid(GridClass):  # noqa: H601
     """Coordinates of days within a single month."""
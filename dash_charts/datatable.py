@@ -1,7 +1,17 @@
 """DataTable Base Classes."""
 
+import math
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
 from dash import dash_table
 
+from .utils_data import SQLConnection
+
 # TODO: See pattern mathing callbacks for adding buttons (to show modal) to datatables
 #   https://dash.plotly.com/pattern-matching-callbacks
 
@@ -58,10 +68,301 @@ def split_filter_part(filter_part):  # noqa: CCR001
     return [None, None, None]
 
 
+FILTER_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<column>\{[^}]*\})
+        |(?P<quoted>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"|`(?:\\.|[^`\\])*`)
+        |(?P<symbol>&&|\|\||>=|<=|!=|=|<|>|!|\(|\)|\[|\]|,)
+        |(?P<word>[^\s()\[\],{}]+)
+    )""",
+    re.VERBOSE,
+)
+"""Regular expression to split a filter query into column, quoted value, symbol, and word tokens."""
+
+FILTER_OPERATOR_LOOKUP = {
+    alias.strip(): operator_type[0].strip() for operator_type in OPERATORS for alias in operator_type
+}
+"""Lookup from each operator alias (symbol or word) to the operator name used when evaluating the filter."""
+
+TEXT_OPERATORS = ('contains', 'datestartswith')
+"""Operators that compare against the raw string value rather than a number."""
+
+
+def _tokenize_filter_query(filter_query):
+    """Split the filter query into a list of `(token_type, text)` tuples.
+
+    Args:
+        filter_query: Dash datatable string filter query
+
+    Returns:
+        list: of tuples in format `(token_type, text)` where token type is one of `(column, quoted, symbol, word)`
+
+    Raises:
+        ValueError: if the query contains characters that can't be tokenized
+
+    """
+    tokens = []
+    position = 0
+    query = filter_query.rstrip()
+    while position < len(query):
+        match = FILTER_TOKEN_PATTERN.match(query, position)
+        if match is None or match.end() == position:
+            raise ValueError(f'Could not parse filter query at position {position}: `{filter_query}`')
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+def _parse_filter_value(token, as_text=False):
+    """Convert a value token into a string or float. Based on the value logic in `split_filter_part`.
+
+    Args:
+        token: tuple in format `(token_type, text)`
+        as_text: if True, will not attempt to convert unquoted values to float. Default is False
+
+    Returns:
+        str or float: the filter value
+
+    """
+    token_type, text = token
+    if token_type == 'quoted':
+        quote = text[0]
+        return text[1:-1].replace(f'\\{quote}', quote)
+    if as_text:
+        return text
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+class _FilterQueryParser:
+    """Recursive descent parser that converts filter query tokens into an expression tree.
+
+    Grammar (the word forms `or`, `and`, and `not` are also accepted):
+
+    ```
+    expression := conjunction ('||' conjunction)*
+    conjunction := unary ('&&' unary)*
+    unary := '!' unary | '(' expression ')' | comparison
+    comparison := {column} operator value | {column} 'in' '[' value (',' value)* ']'
+    ```
+
+    """
+
+    def __init__(self, filter_query):
+        """Tokenize the filter query.
+
+        Args:
+            filter_query: Dash datatable string filter query
+
+        """
+        self.filter_query = filter_query
+        self.tokens = _tokenize_filter_query(filter_query)
+        self.position = 0
+
+    def parse(self):
+        """Return the expression tree for the full query.
+
+        Returns:
+            tuple: root node of the expression tree
+
+        Raises:
+            ValueError: if there are unexpected tokens after the end of the expression
+
+        """
+        node = self._parse_expression()
+        if self.position != len(self.tokens):
+            self._raise_error('Unexpected token')
+        return node
+
+    def _raise_error(self, message):
+        """Raise a ValueError with the current token and the full query for context.
+
+        Args:
+            message: short description of the error
+
+        Raises:
+            ValueError: always
+
+        """
+        token = self.tokens[self.position][1] if self.position < len(self.tokens) else 'end of query'
+        raise ValueError(f'{message} (`{token}`) in filter query: `{self.filter_query}`')
+
+    def _peek(self, *texts):
+        """Check if the next token matches one of the provided strings.
+
+        Args:
+            texts: strings to compare against the next token
+
+        Returns:
+            bool: True if the next token matches
+
+        """
+        return self.position < len(self.tokens) and self.tokens[self.position][1].lower() in texts
+
+    def _next(self):
+        """Return the next token and advance the position.
+
+        Returns:
+            tuple: in format `(token_type, text)`
+
+        """
+        if self.position >= len(self.tokens):
+            self._raise_error('Incomplete expression')
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expect(self, text):
+        """Consume the next token, which must match the provided text.
+
+        Args:
+            text: expected token string
+
+        """
+        if not self._peek(text):
+            self._raise_error(f'Expected `{text}`')
+        self.position += 1
+
+    def _parse_expression(self):
+        """Parse one or more conjunctions joined by `||`.
+
+        Returns:
+            tuple: expression tree node
+
+        """
+        children = [self._parse_conjunction()]
+        while self._peek('||', 'or'):
+            self.position += 1
+            children.append(self._parse_conjunction())
+        return children[0] if len(children) == 1 else ('or', tuple(children))
+
+    def _parse_conjunction(self):
+        """Parse one or more unary expressions joined by `&&`.
+
+        Returns:
+            tuple: expression tree node
+
+        """
+        children = [self._parse_unary()]
+        while self._peek('&&', 'and'):
+            self.position += 1
+            children.append(self._parse_unary())
+        return children[0] if len(children) == 1 else ('and', tuple(children))
+
+    def _parse_unary(self):
+        """Parse a negation, a parenthesized expression, or a single comparison.
+
+        Returns:
+            tuple: expression tree node
+
+        """
+        if self._peek('!', 'not'):
+            self.position += 1
+            return ('not', self._parse_unary())
+        if self._peek('('):
+            self.position += 1
+            node = self._parse_expression()
+            self._expect(')')
+            return node
+        return self._parse_comparison()
+
+    def _parse_comparison(self):
+        """Parse a single `{column} operator value` comparison.
+
+        Returns:
+            tuple: expression tree node in format `('compare', col_name, operator, value)`
+
+        """
+        token_type, text = self._next()
+        if token_type != 'column':
+            self.position -= 1
+            self._raise_error('Expected a `{column}` name before')
+        col_name = text[1:-1]
+
+        operator_text = self._next()[1].lower()
+        if operator_text == 'in':
+            opening = self._next()[1]
+            closing = {'[': ']', '(': ')'}.get(opening)
+            if closing is None:
+                self.position -= 1
+                self._raise_error('Expected a list after `in`')
+            values = [_parse_filter_value(self._next())]
+            while self._peek(','):
+                self.position += 1
+                values.append(_parse_filter_value(self._next()))
+            self._expect(closing)
+            return ('compare', col_name, 'in', tuple(values))
+
+        operator = FILTER_OPERATOR_LOOKUP.get(operator_text)
+        if operator is None:
+            self.position -= 1
+            self._raise_error('Unknown operator')
+        filter_value = _parse_filter_value(self._next(), as_text=operator in TEXT_OPERATORS)
+        return ('compare', col_name, operator, filter_value)
+
+
+@lru_cache(maxsize=256)
+def compile_filter_query(filter_query):
+    """Parse the filter query into an expression tree. Results are cached by query string.
+
+    Supports `&&`, `||`, `!`, parentheses, the operators in `OPERATORS`, and `in` lists (`{col} in [a, 'b c']`)
+
+    Args:
+        filter_query: Dash datatable string filter query
+
+    Returns:
+        tuple: root node of the expression tree or None if the query is empty
+
+    """
+    if not filter_query or not filter_query.strip():
+        return None
+    return _FilterQueryParser(filter_query).parse()
+
+
+def evaluate_filter_node(df_table, node):
+    """Evaluate the expression tree against the dataframe to create a single boolean mask.
+
+    Args:
+        df_table: pandas dataframe to filter
+        node: expression tree from `compile_filter_query`
+
+    Returns:
+        array: numpy boolean array with one value for each row of `df_table`
+
+    """
+    node_type = node[0]
+    if node_type == 'and':
+        return np.logical_and.reduce([evaluate_filter_node(df_table, child) for child in node[1]])
+    if node_type == 'or':
+        return np.logical_or.reduce([evaluate_filter_node(df_table, child) for child in node[1]])
+    if node_type == 'not':
+        return ~evaluate_filter_node(df_table, node[1])
+
+    _node_type, col_name, operator, filter_value = node
+    column = df_table[col_name]
+    if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+        # these operators match pandas series operator method names
+        mask = getattr(column, operator)(filter_value)
+    elif operator == 'in':
+        mask = column.isin(filter_value)
+    else:
+        text = column.astype(str).where(column.notna())
+        if operator == 'contains':
+            mask = text.str.contains(filter_value, regex=False, na=False)
+        else:
+            # this is a simplification of the front-end filtering logic,
+            # only works with complete fields in standard format
+            mask = text.str.startswith(filter_value, na=False)
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
 def apply_datatable_filters(df_table, filter_query):
     """Filter a dataframe based on Dash datatable filterquery.
 
-    Based on `Backend Paging with Filtering`: https://dash.plot.ly/datatable/callbacks
+    Based on `Backend Paging with Filtering`: https://dash.plot.ly/datatable/callbacks. The query is compiled once
+    (see `compile_filter_query`) and all conditions are combined into a single mask before indexing the dataframe
 
     Args:
         df_table: pandas dataframe to filter
@@ -71,19 +372,225 @@ def apply_datatable_filters(df_table, filter_query):
         dataframe: filtered dataframe
 
     """
-    filtering_expressions = filter_query.split(' && ')
-    for filter_part in filtering_expressions:
-        col_name, operator, filter_value = split_filter_part(filter_part)
-        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
-            # these operators match pandas series operator method names
-            df_table = df_table.loc[getattr(df_table[col_name], operator)(filter_value)]
-        elif operator == 'contains':
-            df_table = df_table.loc[df_table[col_name].str.contains(filter_value)]
-        elif operator == 'datestartswith':
-            # this is a simplification of the front-end filtering logic,
-            # only works with complete fields in standard format
-            df_table = df_table.loc[df_table[col_name].str.startswith(filter_value)]
-    return df_table
+    node = compile_filter_query(filter_query)
+    if node is None:
+        return df_table
+    return df_table.loc[evaluate_filter_node(df_table, node)]
+
+
+def apply_datatable_sort(df_table, sort_by):
+    """Sort a dataframe based on the Dash datatable `sort_by` property.
+
+    Args:
+        df_table: pandas dataframe to sort
+        sort_by: list of dictionaries with keys `(column_id, direction)`. May be None or an empty list
+
+    Returns:
+        dataframe: sorted dataframe
+
+    """
+    if not sort_by:
+        return df_table
+    return df_table.sort_values(
+        [sort['column_id'] for sort in sort_by],
+        ascending=[sort['direction'] == 'asc' for sort in sort_by],
+    )
+
+
+class DataTableSortIndex:  # noqa: H601
+    """Lazily built and cached sort keys for a single dataframe that can be shared between users and pages.
+
+    The dense rank of each sorted column is calculated once. Multi-column sorts combine the cached ranks with
+    `np.lexsort`, and the resulting row order is cached for each `sort_by`. Create a new instance when the dataframe
+    changes
+
+    """
+
+    max_orders = 32
+    """Maximum number of cached row orders (one per unique `sort_by`). Least recently used are discarded first."""
+
+    def __init__(self, df_table):
+        """Store the dataframe. No keys are calculated until the first sort.
+
+        Args:
+            df_table: pandas dataframe that will be sorted
+
+        """
+        self.df_table = df_table
+        self._ranks = {}
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_rank(self, column_id):
+        """Return the dense rank of each row for the column. Missing values are ranked last.
+
+        Args:
+            column_id: column name
+
+        Returns:
+            tuple: `(ranks, count_unique)` where ranks is a numpy integer array
+
+        """
+        if column_id not in self._ranks:
+            ranks, uniques = pd.factorize(self.df_table[column_id], sort=True)
+            ranks[ranks < 0] = len(uniques)
+            self._ranks[column_id] = (ranks, len(uniques))
+        return self._ranks[column_id]
+
+    def _get_key(self, sort):
+        """Return the sort key for one column and direction. Missing values remain last when descending.
+
+        Args:
+            sort: dictionary with keys `(column_id, direction)`
+
+        Returns:
+            array: numpy integer array where lower values are sorted first
+
+        """
+        ranks, count_unique = self.get_rank(sort['column_id'])
+        if sort['direction'] == 'asc':
+            return ranks
+        return np.where(ranks == count_unique, count_unique, count_unique - 1 - ranks)
+
+    def get_order(self, sort_by):
+        """Return the integer row positions of the dataframe in sorted order.
+
+        Args:
+            sort_by: list of dictionaries with keys `(column_id, direction)`
+
+        Returns:
+            array: numpy integer array of row positions
+
+        """
+        key = tuple((sort['column_id'], sort['direction']) for sort in sort_by)
+        with self._lock:
+            if key in self._orders:
+                self._orders.move_to_end(key)
+                return self._orders[key]
+            # np.lexsort uses the last key as the primary sort key
+            order = np.lexsort([self._get_key(sort) for sort in reversed(sort_by)])
+            self._orders[key] = order
+            while len(self._orders) > self.max_orders:
+                self._orders.popitem(last=False)
+        return order
+
+
+def query_datatable_page(df_table, page_current, page_size, sort_by=None, filter_query=None, sort_index=None):
+    """Filter, sort, and return only the requested page of a dataframe for a `custom` backend datatable.
+
+    Based on `Backend Paging with Filtering`: https://dash.plot.ly/datatable/callbacks
+
+    Args:
+        df_table: pandas dataframe with all rows
+        page_current: zero-based index of the page to return
+        page_size: number of rows per page
+        sort_by: Dash datatable `sort_by` property. Default is None for no sorting
+        filter_query: Dash datatable string filter query. Default is None for no filter
+        sort_index: optional `DataTableSortIndex` for `df_table` to reuse sorted row orders. Default is None
+
+    Returns:
+        tuple: `(df_page, page_count)` with the dataframe for the current page and the total number of pages
+
+    """
+    start = page_current * page_size
+    if sort_index is None:
+        # Filter first so that only the remaining rows are sorted
+        df_filtered = apply_datatable_sort(apply_datatable_filters(df_table, filter_query), sort_by)
+        return df_filtered.iloc[start:start + page_size], max(math.ceil(len(df_filtered) / page_size), 1)
+
+    # Select the page from the cached row order, then only index the rows on the current page
+    node = compile_filter_query(filter_query)
+    mask = None if node is None else evaluate_filter_node(df_table, node)
+    if sort_by:
+        positions = sort_index.get_order(sort_by)
+        if mask is not None:
+            positions = positions[mask[positions]]
+    else:
+        positions = np.arange(len(df_table)) if mask is None else np.flatnonzero(mask)
+    return df_table.iloc[positions[start:start + page_size]], max(math.ceil(len(positions) / page_size), 1)
+
+
+SQL_OPERATORS = {'eq': '=', 'ne': '!=', 'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>='}
+"""Lookup from filter operator name to the SQLite comparison operator."""
+
+
+def _quote_sql_name(name):
+    """Quote a table or column name for use in a SQLite query.
+
+    Args:
+        name: string table or column name
+
+    Returns:
+        str: double-quoted name
+
+    """
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def filter_node_to_sql(node):
+    """Convert the expression tree from `compile_filter_query` into a parameterized SQLite `WHERE` clause.
+
+    Args:
+        node: expression tree from `compile_filter_query`
+
+    Returns:
+        tuple: `(sql, params)` where `sql` is the clause without the `WHERE` keyword
+
+    """
+    node_type = node[0]
+    if node_type in ('and', 'or'):
+        clauses = [filter_node_to_sql(child) for child in node[1]]
+        sql = f' {node_type.upper()} '.join(f'({clause})' for clause, _params in clauses)
+        return sql, [param for _clause, params in clauses for param in params]
+    if node_type == 'not':
+        clause, params = filter_node_to_sql(node[1])
+        return f'NOT ({clause})', params
+
+    _node_type, col_name, operator, filter_value = node
+    column = _quote_sql_name(col_name)
+    if operator == 'in':
+        places = ','.join(['?'] * len(filter_value))
+        return f'{column} IN ({places})', [*filter_value]
+    if operator == 'contains':
+        return f'instr(CAST({column} AS TEXT), ?) > 0', [filter_value]
+    if operator == 'datestartswith':
+        return f'substr(CAST({column} AS TEXT), 1, ?) = ?', [len(filter_value), filter_value]
+    return f'{column} {SQL_OPERATORS[operator]} ?', [filter_value]
+
+
+def query_sqlite_page(db_path, table_name, page_current, page_size, sort_by=None, filter_query=None):
+    """Filter, sort, and return only the requested page from a SQLite table for a `custom` backend datatable.
+
+    Args:
+        db_path: path to SQLite database file
+        table_name: SQLite table name
+        page_current: zero-based index of the page to return
+        page_size: number of rows per page
+        sort_by: Dash datatable `sort_by` property. Default is None for no sorting
+        filter_query: Dash datatable string filter query. Default is None for no filter
+
+    Returns:
+        tuple: `(df_page, page_count)` with the dataframe for the current page and the total number of pages
+
+    """
+    node = compile_filter_query(filter_query)
+    where, params = filter_node_to_sql(node) if node else ('1', [])
+    order_terms = []
+    for sort in sort_by or []:
+        column = _quote_sql_name(sort['column_id'])
+        direction = 'ASC' if sort['direction'] == 'asc' else 'DESC'
+        # Sort NULL values last to match `apply_datatable_sort`
+        order_terms.append(f'{column} IS NULL, {column} {direction}')
+    order_clause = f' ORDER BY {", ".join(order_terms)}' if order_terms else ''
+    table = _quote_sql_name(table_name)
+    with SQLConnection(db_path) as conn:
+        row_count = conn.execute(f'SELECT COUNT(*) FROM {table} WHERE {where}', params).fetchone()[0]  # noqa: S608
+        df_page = pd.read_sql_query(
+            f'SELECT * FROM {table} WHERE {where}{order_clause} LIMIT ? OFFSET ?',  # noqa: S608
+            conn, params=[*params, page_size, page_current * page_size],
+        )
+    return df_page, max(math.ceil(row_count / page_size), 1)
 
 
 # PLANNED: Maybe move parameters to attr.ib classes?
@@ -100,6 +607,8 @@ Full documentation at: [https://dash.plot.ly/datatable/filtering](https://dash.p
 but not `2018-03`
 - `ne`, `gt`, `ge`, `lt`, `le`: comparison operators for not equal, greater than, greater or equal, less than, etc.
 Applies to numbers and string columns (uses numbers, symbols, uppercase letter, lowercase letters)
+- `in`: matches any value in a list, such as `{continent} in [Asia, Europe]` (only for filters applied in callbacks)
+- `&&`, `||`, and parentheses: combine filters, such as `({pop} > 1000 || {year} = 2007) && {continent} = Asia`
 
 Press enter of tab to apply the filter"""
     """Markdown text explaining dash_table.DataTable filtering rules with link to full documentation."""
@@ -162,6 +671,9 @@ Press enter of tab to apply the filter"""
     filter_action = 'native'
     """DataTable.filter_action. Default is `'native'`."""
 
+    page_action = 'native'
+    """DataTable.page_action. Default is `'native'`. See `enable_custom_backend()` for server-side paging."""
+
     page_size = 25
     """DataTable.page_size. Default is `'25'`."""
 
@@ -265,6 +777,17 @@ Press enter of tab to apply the filter"""
             },
         }
 
+    def enable_custom_backend(self):
+        """Filter, sort, and page in a callback rather than sending all rows to the browser.
+
+        The table is created with only the first page of data. A callback must then return each page with
+        `query_datatable_page` or `query_sqlite_page` (see `ModuleDataTable.register_custom_backend`)
+
+        """
+        self.filter_action = 'custom'
+        self.sort_action = 'custom'
+        self.page_action = 'custom'
+
     def create_table(self, df_raw, columns=None, **kwargs_datatable):
         """Create the dash_table.DataTable.
 
@@ -309,9 +832,16 @@ Press enter of tab to apply the filter"""
             dict: keys include `(columns, data)` and all data members
 
         """
+        df_table = df_raw.loc[:, columns] if columns is not None else df_raw
+        page_kwargs = {}
+        if self.page_action == 'custom':
+            # Only send the first page. Remaining pages are returned from a callback
+            df_table, page_count = query_datatable_page(df_table, 0, self.page_size)
+            page_kwargs = {'page_current': 0, 'page_count': page_count}
         return {
             'columns': self.format_datatable_columns(df_raw, columns) if isinstance(columns[0], str) else columns,
-            'data': (df_raw.loc[:, columns] if columns is not None else df_raw).to_dict('records'),
+            'data': df_table.to_dict('records'),
+            **page_kwargs,
 
             # Add all datamembers
             'css': self.css,
@@ -328,6 +858,7 @@ Press enter of tab to apply the filter"""
             'export_format': self.export_format,
             'export_headers': self.export_headers,
             'filter_action': self.filter_action,
+            'page_action': self.page_action,
             'page_size': self.page_size,
             'row_selectable': self.row_selectable,
             'style_as_list_view': self.style_as_list_view,
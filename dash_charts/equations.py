@@ -125,3 +125,185 @@ def double_exponential(x_values, factor_a, factor_b, factor_c, factor_d):
             ),
         ),
     )
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Jacobians. Return the partial derivative of the equation for each factor as columns of an `(n, factors)` array
+
+
+def linear_jacobian(x_values, factor_a, factor_b):
+    """Return the jacobian of the linear equation.
+
+    Args:
+        x_values: list of numbers
+        factor_a: number, slope
+        factor_b: number, intercept
+
+    Returns:
+        array: partial derivatives with respect to `(a, b)`
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    return np.column_stack([x_values, np.ones_like(x_values)])
+
+
+def quadratic_jacobian(x_values, factor_a, factor_b, factor_c):
+    """Return the jacobian of the quadratic equation.
+
+    Args:
+        x_values: list of numbers
+        factor_a: number
+        factor_b: number
+        factor_c: number
+
+    Returns:
+        array: partial derivatives with respect to `(a, b, c)`
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    return np.column_stack([np.power(x_values, 2), x_values, np.ones_like(x_values)])
+
+
+def power_jacobian(x_values, factor_a, factor_b):
+    """Return the jacobian of the power equation.
+
+    Args:
+        x_values: list of numbers
+        factor_a: number
+        factor_b: number
+
+    Returns:
+        array: partial derivatives with respect to `(a, b)`
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    x_pow = np.power(x_values, factor_b)
+    # The limit of `x^b * ln(x)` is zero as x approaches zero (for b > 0)
+    log_x = np.log(np.where(x_values > 0, x_values, 1))
+    return np.column_stack([x_pow, factor_a * x_pow * log_x])
+
+
+def exponential_jacobian(x_values, factor_a, factor_b):
+    """Return the jacobian of the exponential equation.
+
+    Args:
+        x_values: list of numbers
+        factor_a: number
+        factor_b: number
+
+    Returns:
+        array: partial derivatives with respect to `(a, b)`
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    exp_b = np.exp(factor_b * x_values)
+    return np.column_stack([exp_b, factor_a * x_values * exp_b])
+
+
+def double_exponential_jacobian(x_values, factor_a, factor_b, factor_c, factor_d):
+    """Return the jacobian of the double exponential equation.
+
+    Args:
+        x_values: list of numbers
+        factor_a: number
+        factor_b: number
+        factor_c: number
+        factor_d: number
+
+    Returns:
+        array: partial derivatives with respect to `(a, b, c, d)`
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    exp_b = np.exp(factor_b * x_values)
+    exp_d = np.exp(factor_d * x_values)
+    return np.column_stack([exp_b, factor_a * x_values * exp_b, -exp_d, -factor_c * x_values * exp_d])
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Initial Guesses. Return the starting factors (`p0`) for scipy or None to use the scipy default
+
+
+def _estimate_log_linear(x_values, y_values):
+    """Estimate `(a, b)` for `ln|y| = ln|a| + b * x` with a linear least squares fit.
+
+    Args:
+        x_values: array of numbers
+        y_values: array of numbers
+
+    Returns:
+        list: `[a, b]` or None if there are less than two usable points
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    mask = np.isfinite(x_values) & np.isfinite(y_values) & (y_values != 0)
+    if np.count_nonzero(mask) < 2 or np.ptp(x_values[mask]) == 0:
+        return None
+    slope, intercept = np.polyfit(x_values[mask], np.log(np.abs(y_values[mask])), 1)
+    return [np.sign(np.median(y_values[mask])) * np.exp(intercept), slope]
+
+
+def power_p0(x_values, y_values):
+    """Estimate the initial factors for the power equation from a fit of `ln|y|` against `ln(x)` for `x > 0`.
+
+    Args:
+        x_values: list of numbers
+        y_values: list of numbers
+
+    Returns:
+        list: `[a, b]` or None
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    mask = x_values > 0
+    return _estimate_log_linear(np.log(x_values[mask]), np.asarray(y_values, dtype=float)[mask])
+
+
+def exponential_p0(x_values, y_values):
+    """Estimate the initial factors for the exponential equation from a fit of `ln|y|` against `x`.
+
+    Args:
+        x_values: list of numbers
+        y_values: list of numbers
+
+    Returns:
+        list: `[a, b]` or None
+
+    """
+    return _estimate_log_linear(x_values, y_values)
+
+
+def double_exponential_p0(x_values, y_values):
+    """Estimate the initial factors for the double exponential equation by starting from a single exponential.
+
+    Args:
+        x_values: list of numbers
+        y_values: list of numbers
+
+    Returns:
+        list: `[a, b, c, d]` or None
+
+    """
+    factors = _estimate_log_linear(x_values, y_values)
+    return None if factors is None else [*factors, 0.0, 0.0]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Register the optional fit helpers on each equation. Used by `scatter_line_charts.fit_curve` when present, so custom
+#   equations can set the same attributes (`polynomial_degree`, `jacobian`, `estimate_p0`)
+
+linear.polynomial_degree = 1
+linear.jacobian = linear_jacobian
+
+quadratic.polynomial_degree = 2
+quadratic.jacobian = quadratic_jacobian
+
+power.jacobian = power_jacobian
+power.estimate_p0 = power_p0
+
+exponential.jacobian = exponential_jacobian
+exponential.estimate_p0 = exponential_p0
+
+double_exponential.jacobian = double_exponential_jacobian
+double_exponential.estimate_p0 = double_exponential_p0
@@ -13,7 +13,6 @@ self.axis_range = {'x': [dates[0], dates[-1]]}
 """
 
 import plotly.graph_objects as go
-from palettable.tableau import TableauMedium_10
 
 from .utils_data import format_unix, get_unix
 from .utils_fig import CustomChart
@@ -25,15 +24,32 @@ class GanttChart(CustomChart):  # noqa: H601
     date_format = '%Y-%m-%d'
     """Date format for bar chart."""
 
-    pallette = TableauMedium_10.hex_colors
-    """Default color pallette for project colors."""
-
     hover_label_settings = {'bgcolor': 'white', 'font_size': 12, 'namelength': 0}
     """Plotly hover label settings."""
 
     rh = 1
     """Height of each rectangular task."""
 
+    _pallette = None
+
+    @property
+    def pallette(self):
+        """Color pallette for project colors. Default is `palettable.tableau.TableauMedium_10.hex_colors`.
+
+        Returns:
+            list: hex colors
+
+        """
+        if self._pallette is None:
+            from palettable.tableau import TableauMedium_10  # Deferred to keep chart imports light
+
+            return TableauMedium_10.hex_colors
+        return self._pallette
+
+    @pallette.setter
+    def pallette(self, pallette):
+        self._pallette = pallette
+
     def create_traces(self, df_raw):
         """Return traces for plotly chart.
 
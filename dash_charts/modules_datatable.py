@@ -4,11 +4,11 @@ import json
 
 import dash_bootstrap_components as dbc
 import pandas as pd
-from dash import dcc, html
+from dash import dcc, html, no_update
 from dash.exceptions import PreventUpdate
 
 from .components import dropdown_group, opts_dd
-from .datatable import BaseDataTable
+from .datatable import BaseDataTable, DataTableSortIndex, query_datatable_page
 from .utils_app_modules import ModuleBase
 from .utils_callbacks import map_args, map_outputs
 
@@ -28,6 +28,36 @@ class ModuleDataTable(ModuleBase):
     all_ids = [id_table_parent, id_table]
     """List of ids to register for this module."""
 
+    custom_backend = False
+    """If True, filter, sort, and page the data in a callback so that only the visible page is sent to the browser.
+
+    Recommended for tables with more than ~50k rows. See `query_page()` to use a SQLite table instead of `mod_df`
+
+    """
+
+    sort_index = None
+    """DataTableSortIndex with the cached sort keys for `mod_df`. Reset whenever `mod_df` is assigned."""
+
+    _mod_df = None
+
+    @property
+    def mod_df(self):
+        """Data frame shown in table. Set in `return_table_map` and used by the `custom_backend` callback.
+
+        Assign a new dataframe rather than modifying in place so that the cached sort keys are reset
+
+        Returns:
+            dataframe: the data frame or None
+
+        """
+        return self._mod_df
+
+    @mod_df.setter
+    def mod_df(self, mod_df):
+        if mod_df is not self._mod_df:
+            self.sort_index = None if mod_df is None else DataTableSortIndex(mod_df)
+        self._mod_df = mod_df
+
     def create_elements(self, ids):
         """Register the callback for creating the main chart.
 
@@ -36,21 +66,25 @@ class ModuleDataTable(ModuleBase):
 
         """
         self.table = BaseDataTable()
+        if self.custom_backend:
+            self.table.enable_custom_backend()
 
-    def return_layout(self, ids):
+    def return_layout(self, ids, df_table=None):
         """Return Dash application layout.
 
         Args:
             ids: `self._il` from base application
+            df_table: optional dataframe for the initial table. Default is None to show a placeholder
 
         Returns:
             dict: Dash HTML object
 
         """
-        placeholder = pd.DataFrame.from_records([['body']], columns=['header'])
+        if df_table is None:
+            df_table = pd.DataFrame.from_records([['body']], columns=['header'])
         return html.Div(
             [
-                self.table.create_table(placeholder, None, id=ids[self.get(self.id_table)]),
+                self.table.create_table(df_table, None, id=ids[self.get(self.id_table)]),
             ], id=ids[self.get(self.id_table_parent)],
         )
 
@@ -66,9 +100,25 @@ class ModuleDataTable(ModuleBase):
             list: list of tuples for `map_outputs`
 
         """
+        self.mod_df = df_table
         datatable = self.table.create_table(df_table, columns, id=ids[self.get(self.id_table)])
         return [(self.get(self.id_table_parent), 'children', datatable)]
 
+    def query_page(self, page_current, page_size, sort_by, filter_query):
+        """Return the requested page of data. Override to query a different source, such as `query_sqlite_page`.
+
+        Args:
+            page_current: zero-based index of the page to return
+            page_size: number of rows per page
+            sort_by: Dash datatable `sort_by` property
+            filter_query: Dash datatable string filter query
+
+        Returns:
+            tuple: `(df_page, page_count)` with the dataframe for the current page and the total number of pages
+
+        """
+        return query_datatable_page(self.mod_df, page_current, page_size, sort_by, filter_query, self.sort_index)
+
     def create_callbacks(self, parent):
         """Register callbacks to handle user interaction.
 
@@ -77,6 +127,51 @@ class ModuleDataTable(ModuleBase):
 
         """
         self.register_highlight_sort_column(parent)
+        if self.custom_backend:
+            self.register_custom_backend(parent)
+
+    def register_custom_backend(self, parent):
+        """Register callback to return only the visible page of data when `custom_backend` is True.
+
+        Args:
+            parent: parent instance (ex: `self`)
+
+        Raises:
+            PreventUpdate: if no data has been set for the table
+
+        """
+        outputs = [(self.get(self.id_table), 'data'), (self.get(self.id_table), 'page_count')]
+        inputs = [
+            (self.get(self.id_table), 'page_current'),
+            (self.get(self.id_table), 'page_size'),
+            (self.get(self.id_table), 'sort_by'),
+            (self.get(self.id_table), 'filter_query'),
+            (self.get(self.id_table), 'columns'),
+        ]
+        states = []
+
+        @parent.callback(outputs, inputs, states)
+        def update_page(*raw_args):
+            a_in, a_states = map_args(raw_args, inputs, states)
+            if self.mod_df is None:
+                raise PreventUpdate
+            table_args = a_in[self.get(self.id_table)]
+            page_args = [table_args['page_current'] or 0, table_args['page_size'] or self.table.page_size]
+            try:
+                df_page, page_count = self.query_page(*page_args, table_args['sort_by'], table_args['filter_query'])
+            except ValueError:
+                # Show the unfiltered data while the filter query is incomplete or invalid (such as while typing)
+                df_page, page_count = self.query_page(*page_args, table_args['sort_by'], None)
+            # Only send the visible columns
+            columns = [col['id'] for col in table_args['columns'] or []]
+            if columns:
+                df_page = df_page.loc[:, [col for col in columns if col in df_page.columns]]
+            return map_outputs(
+                outputs, [
+                    (self.get(self.id_table), 'data', df_page.to_dict('records')),
+                    (self.get(self.id_table), 'page_count', page_count),
+                ],
+            )
 
     def register_highlight_sort_column(self, parent):
         """Register callbacks to handle user interaction.
@@ -143,8 +238,15 @@ class ModuleFilteredTable(ModuleDataTable):
     show_filter = True
     """If True (default), will show an input for entering a global filter."""
 
-    mod_df = None
-    """Data frame shown in table. Passed to `return_layout` and used when creating the table."""
+    column_select_mode = 'rebuild'
+    """Determines how the table is updated when the selected columns change. One of `(rebuild, columns, hidden)`.
+
+    - `rebuild`: (default) create a new DataTable, which sends all rows and styles for each change
+    - `columns`: only update the `columns` property. Data is only sent when a column is added and includes every row,
+        because the native table filter hides rows in the browser and needs all of them when the filter changes
+    - `hidden`: send all columns once and only update `hidden_columns`. Best when the dataframe has few rows
+
+    """
 
     def return_layout(self, ids, mod_df):
         """Return Dash application layout.
@@ -196,7 +298,7 @@ class ModuleFilteredTable(ModuleDataTable):
             ),
             filter_elements,
             html.Br(),
-            super().return_layout(ids),
+            super().return_layout(ids, None if self.column_select_mode == 'rebuild' else self.mod_df),
         ])
 
     def create_callbacks(self, parent):
@@ -207,7 +309,10 @@ class ModuleFilteredTable(ModuleDataTable):
 
         """
         super().create_callbacks(parent)
-        self.register_create_table(parent)
+        if self.column_select_mode == 'rebuild':
+            self.register_create_table(parent)
+        else:
+            self.register_update_columns(parent)
         if self.show_filter:
             self.register_filter_interface(parent)
             self.register_show_query(parent)
@@ -234,6 +339,50 @@ class ModuleFilteredTable(ModuleDataTable):
                 raise PreventUpdate
             return map_outputs(outputs, self.return_table_map(parent.ids, self.mod_df, columns))
 
+    def register_update_columns(self, parent):
+        """Register callback to update the columns of the existing table rather than creating a new table.
+
+        Args:
+            parent: parent instance (ex: `self`)
+
+        Raises:
+            PreventUpdate: if no columns are selected
+
+        """
+        table_id = self.get(self.id_table)
+        if self.column_select_mode == 'hidden':
+            outputs = [(table_id, 'hidden_columns')]
+        elif self.custom_backend:
+            outputs = [(table_id, 'columns')]  # The page data is updated by `register_custom_backend`
+        else:
+            outputs = [(table_id, 'columns'), (table_id, 'data')]
+        inputs = [(self.get(self.id_column_select), 'value')]
+        states = [(table_id, 'columns')]
+
+        @parent.callback(outputs, inputs, states)
+        def update_columns(*raw_args):
+            a_in, a_states = map_args(raw_args, inputs, states)
+            columns = a_in[self.get(self.id_column_select)]['value']
+            if not columns:
+                raise PreventUpdate
+
+            if self.column_select_mode == 'hidden':
+                hidden_columns = [col for col in self.mod_df.columns if col not in columns]
+                return map_outputs(outputs, [(table_id, 'hidden_columns', hidden_columns)])
+
+            new_columns = self.table.format_datatable_columns(self.mod_df, columns)
+            element_info = [(table_id, 'columns', new_columns)]
+            if not self.custom_backend:
+                # The data in the browser has at least the current columns, so only send data when a column is added
+                current_ids = {col['id'] for col in a_states[table_id]['columns'] or []}
+                column_ids = [col['id'] for col in new_columns]
+                is_added = any(col not in current_ids for col in column_ids)
+                data = no_update
+                if is_added:
+                    data = self.mod_df.loc[:, column_ids].to_dict('records')
+                element_info.append((table_id, 'data', data))
+            return map_outputs(outputs, element_info)
+
     def register_filter_interface(self, parent):
         """Register callbacks to handle user interaction.
 
@@ -1,54 +1,652 @@
 """Charts for plotting scatter or fitted data."""
 
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from scipy import optimize
 
 from .utils_fig import CustomChart, check_raw_data
 
+FIT_SAMPLE_COUNT = 100
+"""Default number of points used to plot each fitted equation."""
 
-def create_rolling_traces(df_raw, count_rolling, count_std):
-    """Calculate traces for rolling average and standard deviation.
+
+ROLLING_BAND_TYPES = ('std', 'ewm', 'quantile')
+"""Supported `band_type` values for `RollingChart` and `calculate_rolling_bands`."""
+
+
+def calculate_rolling_bands(df_raw, band_type='std', window=5, count_std=5, quantiles=(0.05, 0.95), ewm_span=5):
+    """Calculate the center line and band for the full series vectorized with pandas.
 
     Args:
-        df_raw: pandas dataframe with columns `x: float`, `y: float` and `label: str`
-        count_rolling: number of points to use for the rolling calculation
-        count_std: number of standard deviations to use for the standard deviation
+        df_raw: pandas dataframe with columns `x: float or datetime` and `y: float`
+        band_type: one of `ROLLING_BAND_TYPES`. `std` for the rolling mean and standard deviation, `ewm` for the
+            exponentially weighted mean and standard deviation, or `quantile` for the rolling median and quantiles
+        window: count of points or an offset string (such as `'5min'`) for a time-based window over the datetime x
+            values. Not used for `ewm`
+        count_std: number of standard deviations for the `std` and `ewm` bands
+        quantiles: lower and upper quantile for the `quantile` band
+        ewm_span: span of the exponentially weighted window
 
     Returns:
-        list: of Scatter traces for rolling mean and std
+        tuple: `(center, lower, upper)` arrays
+
+    Raises:
+        ValueError: if the band type is not supported
+
+    """
+    if band_type not in ROLLING_BAND_TYPES:
+        raise ValueError(f'Unknown band_type: {band_type}. Expected one of {ROLLING_BAND_TYPES}')
+    y_series = pd.Series(df_raw['y'].to_numpy(dtype=float))
+    if band_type == 'ewm':
+        ewm = y_series.ewm(span=ewm_span)
+        center, spread = ewm.mean().to_numpy(), ewm.std().to_numpy()
+        return center, center - count_std * spread, center + count_std * spread
+
+    if isinstance(window, str):
+        y_series.index = pd.DatetimeIndex(df_raw['x'])
+    rolling = y_series.rolling(window)
+    if band_type == 'quantile':
+        return tuple(rolling.quantile(quantile).to_numpy() for quantile in (0.5, *quantiles))
+    center, spread = rolling.mean().to_numpy(), rolling.std().to_numpy()
+    return center, center - count_std * spread, center + count_std * spread
+
+
+def create_band_traces(x_values, center, lower, upper, band_name, center_name):
+    """Create traces for a filled band around a center line.
+
+    Args:
+        x_values: array of x values
+        center: array of center line values
+        lower: array of lower band values
+        upper: array of upper band values
+        band_name: legend name for the filled band
+        center_name: legend name for the center line
+
+    Returns:
+        list: of Scatter traces for the band and center line
 
     """
-    rolling_mean = df_raw['y'].rolling(count_rolling).mean().tolist()
-    rolling_std = df_raw['y'].rolling(count_std).std().tolist()
+    x_values = np.asarray(x_values)
     return [
         go.Scatter(
             fill='toself',
             hoverinfo='skip',
-            name=f'{count_std}x STD Range',
+            name=band_name,
             opacity=0.5,
-            x=(df_raw['x'].tolist() + df_raw['x'].tolist()[::-1]),
-            y=(
-                np.add(rolling_mean, np.multiply(count_std, rolling_std)).tolist()
-                + np.subtract(rolling_mean, np.multiply(count_std, rolling_std)).tolist()[::-1]
-            ),
+            x=np.concatenate([x_values, x_values[::-1]]),
+            y=np.concatenate([upper, np.asarray(lower)[::-1]]),
         ),
         go.Scatter(
             hoverinfo='skip',
             mode='lines',
-            name='Rolling Mean',
+            name=center_name,
             opacity=0.9,
-            x=df_raw['x'],
-            y=rolling_mean,
+            x=x_values,
+            y=center,
         ),
     ]
 
 
+def create_rolling_traces(df_raw, count_rolling, count_std, rolling_mean=None, rolling_std=None):
+    """Calculate traces for rolling average and standard deviation.
+
+    Args:
+        df_raw: pandas dataframe with columns `x: float`, `y: float` and `label: str`
+        count_rolling: number of points to use for the rolling calculation
+        count_std: number of standard deviations to use for the standard deviation
+        rolling_mean: optional array of already calculated rolling means (such as from `RollingStatistics`)
+        rolling_std: optional array of already calculated rolling standard deviations
+
+    Returns:
+        list: of Scatter traces for rolling mean and std
+
+    """
+    if rolling_mean is None:
+        rolling_mean = df_raw['y'].rolling(count_rolling).mean().to_numpy()
+    if rolling_std is None:
+        rolling_std = df_raw['y'].rolling(count_std).std().to_numpy()
+    std_range = count_std * np.asarray(rolling_std)
+    return create_band_traces(
+        df_raw['x'].to_numpy(), rolling_mean, rolling_mean - std_range, rolling_mean + std_range,
+        band_name=f'{count_std}x STD Range', center_name='Rolling Mean',
+    )
+
+
+class _IncrementalStatistics:
+    """Shared storage for the results of the incremental statistics engines."""
+
+    _means = None
+    _stds = None
+    _size = 0
+
+    @property
+    def mean(self):
+        """Return the mean for every point received.
+
+        Returns:
+            array: of means (NaN where the statistic is not yet defined)
+
+        """
+        return self._means[:self._size]
+
+    @property
+    def std(self):
+        """Return the sample standard deviation for every point received.
+
+        Returns:
+            array: of standard deviations (NaN where the statistic is not yet defined)
+
+        """
+        return self._stds[:self._size]
+
+    def _reserve(self, count):
+        """Grow the result arrays geometrically so appending is amortized O(1).
+
+        Args:
+            count: number of values that will be appended
+
+        """
+        capacity = len(self._means)
+        if self._size + count > capacity:
+            new_capacity = max(self._size + count, 2 * capacity, 64)
+            for attr in ['_means', '_stds']:
+                resized = np.full(new_capacity, np.nan)
+                resized[:self._size] = getattr(self, attr)[:self._size]
+                setattr(self, attr, resized)
+
+
+class RollingStatistics(_IncrementalStatistics):
+    """Incremental rolling mean and sample standard deviation over a fixed count window.
+
+    Welford's algorithm is applied to a ring buffer of the last `window` values so each appended point is O(1)
+    rather than recalculating the full series. Results match `pandas.Series.rolling(window).mean()` and `.std()`
+
+    """
+
+    window = None
+    """Number of points in the rolling window."""
+
+    resync_interval = None
+    """Number of updates between exact recalculations from the ring buffer to limit floating point drift."""
+
+    def __init__(self, window):
+        """Initialize the empty rolling window.
+
+        Args:
+            window: number of points in the rolling window
+
+        Raises:
+            ValueError: if the window is not a positive integer
+
+        """
+        if int(window) != window or window < 1:
+            raise ValueError(f'Rolling window must be a positive integer. Received: {window}')
+        self.window = int(window)
+        self.resync_interval = max(self.window, 64)
+        self.reset()
+
+    def reset(self, y_values=()):
+        """Replace all values and calculate the rolling statistics for the full series vectorized with pandas.
+
+        Args:
+            y_values: array of values. Default is an empty series
+
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        rolling = pd.Series(y_values, dtype=float).rolling(self.window)
+        self._means = rolling.mean().to_numpy()
+        self._stds = rolling.std().to_numpy()
+        self._size = len(y_values)
+
+        tail = y_values[-self.window:]
+        self._buffer = np.full(self.window, np.nan)
+        self._buffer[:len(tail)] = tail
+        self._filled = len(tail)
+        self._position = len(tail) % self.window
+        self._resync()
+
+    def extend(self, y_values):
+        """Append new values and calculate their rolling statistics in O(1) each.
+
+        Args:
+            y_values: array of new values
+
+        Returns:
+            tuple: `(mean, std)` arrays for only the new values
+
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        self._reserve(len(y_values))
+        start = self._size
+        for value in y_values:
+            if self._filled == self.window:
+                self._remove(self._buffer[self._position])
+            self._buffer[self._position] = value
+            self._add(value)
+            self._position = (self._position + 1) % self.window
+            self._filled = min(self._filled + 1, self.window)
+
+            self._updates += 1
+            if self._updates >= self.resync_interval:
+                self._resync()
+            self._means[self._size], self._stds[self._size] = self._current()
+            self._size += 1
+        return self._means[start:self._size], self._stds[start:self._size]
+
+    def _add(self, value):
+        """Add a value to the running mean and sum of squared differences.
+
+        Args:
+            value: new value. NaN values are only counted
+
+        """
+        if np.isnan(value):
+            self._count_nan += 1
+            return
+        self._count += 1
+        delta = value - self._run_mean
+        self._run_mean += delta / self._count
+        self._run_m2 += delta * (value - self._run_mean)
+
+    def _remove(self, value):
+        """Remove a value from the running mean and sum of squared differences.
+
+        Args:
+            value: value leaving the window. NaN values are only counted
+
+        """
+        if np.isnan(value):
+            self._count_nan -= 1
+            return
+        self._count -= 1
+        if self._count == 0:
+            self._run_mean = self._run_m2 = 0.0
+            return
+        delta = value - self._run_mean
+        self._run_mean -= delta / self._count
+        self._run_m2 = max(self._run_m2 - delta * (value - self._run_mean), 0.0)
+
+    def _resync(self):
+        """Recalculate the running values exactly from the ring buffer."""
+        values = self._buffer[:self._filled]
+        finite = values[~np.isnan(values)]
+        self._count = len(finite)
+        self._count_nan = self._filled - self._count
+        self._run_mean = float(np.mean(finite)) if self._count else 0.0
+        self._run_m2 = float(np.sum((finite - self._run_mean) ** 2))
+        self._updates = 0
+
+    def _current(self):
+        """Return the statistics for the current window.
+
+        Returns:
+            tuple: `(mean, std)`
+
+        """
+        if self._filled < self.window or self._count_nan:
+            return np.nan, np.nan
+        std = np.sqrt(self._run_m2 / (self._count - 1)) if self._count > 1 else np.nan
+        return self._run_mean, std
+
+
+class EwmStatistics(_IncrementalStatistics):
+    """Incremental exponentially weighted mean and standard deviation.
+
+    Each appended point is O(1) and results match `pandas.Series.ewm(span=span).mean()` and `.std()`
+
+    """
+
+    span = None
+    """Span of the exponentially weighted window."""
+
+    def __init__(self, span):
+        """Initialize the empty series.
+
+        Args:
+            span: span of the exponentially weighted window
+
+        Raises:
+            ValueError: if the span is less than 1
+
+        """
+        if span < 1:
+            raise ValueError(f'EWM span must be at least 1. Received: {span}')
+        self.span = span
+        self._decay = 1 - 2 / (span + 1)
+        self.reset()
+
+    def reset(self, y_values=()):
+        """Replace all values and calculate the statistics for the full series vectorized with pandas.
+
+        Args:
+            y_values: array of values. Default is an empty series
+
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        ewm = pd.Series(y_values, dtype=float).ewm(span=self.span)
+        self._means = ewm.mean().to_numpy()
+        self._stds = ewm.std().to_numpy()
+        self._size = len(y_values)
+
+        # Weights of each observation decay with every following row, including NaN rows
+        ages = len(y_values) - 1 - np.flatnonzero(~np.isnan(y_values))
+        self._count = len(ages)
+        if not self._count:
+            self._run_mean, self._sum_wt, self._sum_wt2, self._cov = np.nan, 1.0, 1.0, 0.0
+            return
+        weights = self._decay ** ages.astype(float)
+        self._sum_wt = float(np.sum(weights))
+        self._sum_wt2 = float(np.sum(weights ** 2))
+        self._run_mean = self._means[-1]
+        correction = (self._sum_wt ** 2 - self._sum_wt2) / self._sum_wt ** 2
+        self._cov = self._stds[-1] ** 2 * correction if correction > 0 and not np.isnan(self._stds[-1]) else 0.0
+
+    def extend(self, y_values):
+        """Append new values and calculate their statistics in O(1) each.
+
+        Args:
+            y_values: array of new values
+
+        Returns:
+            tuple: `(mean, std)` arrays for only the new values
+
+        """
+        y_values = np.asarray(y_values, dtype=float)
+        self._reserve(len(y_values))
+        start = self._size
+        for value in y_values:
+            is_observation = not np.isnan(value)
+            self._count += is_observation
+            if not np.isnan(self._run_mean):
+                self._sum_wt *= self._decay
+                self._sum_wt2 *= self._decay ** 2
+                if is_observation:
+                    old_mean = self._run_mean
+                    if old_mean != value:
+                        self._run_mean = (self._sum_wt * old_mean + value) / (self._sum_wt + 1)
+                    self._cov = (
+                        self._sum_wt * (self._cov + (old_mean - self._run_mean) ** 2) + (value - self._run_mean) ** 2
+                    ) / (self._sum_wt + 1)
+                    self._sum_wt += 1
+                    self._sum_wt2 += 1
+            elif is_observation:
+                self._run_mean = value
+
+            self._means[self._size], self._stds[self._size] = self._current()
+            self._size += 1
+        return self._means[start:self._size], self._stds[start:self._size]
+
+    def _current(self):
+        """Return the statistics for the latest point.
+
+        Returns:
+            tuple: `(mean, std)`
+
+        """
+        if not self._count:
+            return np.nan, np.nan
+        numerator = self._sum_wt ** 2
+        denominator = numerator - self._sum_wt2
+        std = np.sqrt(max(numerator / denominator * self._cov, 0)) if denominator > 0 else np.nan
+        return self._run_mean, std
+
+
+def to_fit_axis(x_values):
+    """Convert x values to floats for fitting. Datetime values are normalized to `[0, 1]` over the data range.
+
+    Args:
+        x_values: pandas series or array of numbers or datetimes
+
+    Returns:
+        tuple: `(x_float, axis_info)` where `axis_info` is None for numeric values or `(origin, span)` for datetimes
+
+    """
+    x_series = pd.Series(x_values)
+    if not pd.api.types.is_datetime64_any_dtype(x_series):
+        return x_series.to_numpy(dtype=float), None
+    origin = x_series.min()
+    span = (x_series.max() - origin) or pd.Timedelta(1, unit='s')
+    return ((x_series - origin) / span).to_numpy(dtype=float), (origin, span)
+
+
+def from_fit_axis(x_float, axis_info):
+    """Convert values from the fit axis back to the original x axis. Inverse of `to_fit_axis`.
+
+    Args:
+        x_float: numpy array of floats on the fit axis
+        axis_info: second value returned by `to_fit_axis`
+
+    Returns:
+        array: values on the original x axis
+
+    """
+    if axis_info is None:
+        return x_float
+    origin, span = axis_info
+    return origin + pd.to_timedelta(x_float * span.value, unit='ns')
+
+
+def fit_polynomial(x_values, y_values, degree):
+    """Fit a polynomial with closed-form linear least squares.
+
+    Args:
+        x_values: array of x values
+        y_values: array of y values
+        degree: polynomial degree (1 for `equations.linear`, 2 for `equations.quadratic`)
+
+    Returns:
+        tuple: `(popt, pcov)` with factors ordered from the highest power. The covariance is infinite when there are
+            too few points to estimate it, which matches `scipy.optimize.curve_fit`
+
+    Raises:
+        ValueError: if the least squares solution does not converge
+
+    """
+    try:
+        if len(x_values) > degree + 2:
+            return np.polyfit(x_values, y_values, degree, cov=True)
+        return np.polyfit(x_values, y_values, degree), np.full((degree + 1, degree + 1), np.inf)
+    except np.linalg.LinAlgError as err:
+        raise ValueError(f'Polynomial fit failed: {err}') from err
+
+
+def fit_curve(fit_equation, x_values, y_values):
+    """Fit the equation to the data with scipy.
+
+    Uses the optional attributes set on the equation (see `dash_charts.equations`): `polynomial_degree` to solve with
+    closed-form least squares, `jacobian` for an analytic jacobian, and `estimate_p0` for the initial guess
+
+    Args:
+        fit_equation: equation used
+        x_values: array of x values
+        y_values: array of y values
+
+    Returns:
+        tuple: `(popt, pcov)` from `scipy.optimize.curve_fit`
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    degree = getattr(fit_equation, 'polynomial_degree', None)
+    if degree is not None:
+        return fit_polynomial(x_values, y_values, degree)
+
+    fit_kwargs = {}
+    if getattr(fit_equation, 'jacobian', None):
+        fit_kwargs['jac'] = fit_equation.jacobian
+    if getattr(fit_equation, 'estimate_p0', None):
+        fit_kwargs['p0'] = fit_equation.estimate_p0(x_values, y_values)
+
+    from scipy import optimize  # Deferred because scipy dominates the import time of this module
+
+    return optimize.curve_fit(fit_equation, xdata=x_values, ydata=y_values, method='lm', **fit_kwargs)
+
+
+def calculate_fit_metrics(fit_equation, x_values, y_values, popt):
+    """Calculate the goodness of fit for fitted parameters.
+
+    AIC and BIC assume normally distributed residuals, so only differences between equations fit to the same data
+    are meaningful (lower is better)
+
+    Args:
+        fit_equation: equation used
+        x_values: array of x values
+        y_values: array of y values
+        popt: fitted parameters from `fit_curve`
+
+    Returns:
+        dict: with keys `r_squared`, `aic`, `bic`, and `residuals`
+
+    """
+    y_values = np.asarray(y_values, dtype=float)
+    residuals = y_values - fit_equation(np.asarray(x_values, dtype=float), *popt)
+    count, count_params = len(y_values), len(popt)
+    sse = float(np.sum(residuals ** 2))
+    sst = float(np.sum((y_values - np.mean(y_values)) ** 2))
+    log_likelihood_term = count * np.log(sse / count) if sse > 0 else -np.inf
+    return {
+        'r_squared': 1 - sse / sst if sst > 0 else np.nan,
+        'aic': log_likelihood_term + 2 * count_params,
+        'bic': log_likelihood_term + count_params * np.log(count),
+        'residuals': residuals,
+    }
+
+
+def fit_equations(equations, x_values, y_values):
+    """Fit each equation to the same data in one pass. Errors are returned rather than raised so each fit is handled.
+
+    Args:
+        equations: list of equations to fit
+        x_values: array of x values
+        y_values: array of y values
+
+    Returns:
+        list: for each equation, a dictionary with keys `popt`, `pcov`, and those from `calculate_fit_metrics` or the
+            RuntimeError/ValueError raised by scipy
+
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    results = []
+    for fit_equation in equations:
+        try:
+            popt, pcov = fit_curve(fit_equation, x_values, y_values)
+        except (RuntimeError, ValueError) as err:
+            results.append(err)
+            continue
+        results.append({'popt': popt, 'pcov': pcov, **calculate_fit_metrics(fit_equation, x_values, y_values, popt)})
+    return results
+
+
+def sample_fit_curve(fit_equation, popt, x_float, count_points=FIT_SAMPLE_COUNT):
+    """Sample the fitted equation at evenly spaced points, extending 5% beyond the data on either side.
+
+    Args:
+        fit_equation: equation used
+        popt: fitted parameters from `fit_curve`
+        x_float: array of x values on the fit axis from `to_fit_axis`
+        count_points: number of points to sample, regardless of the x units. Default is `FIT_SAMPLE_COUNT`
+
+    Returns:
+        tuple: `(x_values, y_values)` arrays on the fit axis
+
+    """
+    x_min = np.min(x_float)
+    x_max = np.max(x_float)
+    x_range = x_max - x_min
+    x_values = np.linspace(x_min - 0.05 * x_range, x_max + 0.05 * x_range, count_points)
+    return x_values, fit_equation(x_values, *popt)
+
+
+def _fit_equations_job(job):
+    """Fit all equations for one group and sample the fitted curves. Called in a worker process with a `fit_pool`.
+
+    Args:
+        job: tuple `(equations, x_values, y_values, count_points)`
+
+    Returns:
+        list: for each equation, the error or the result of `fit_equations` without `residuals` and with the `curve`
+            from `sample_fit_curve`
+
+    """
+    equations, x_values, y_values, count_points = job
+    results = []
+    for fit_equation, result in zip(equations, fit_equations(equations, x_values, y_values)):
+        if not isinstance(result, Exception):
+            result = {key: value for key, value in result.items() if key != 'residuals'}
+            result['curve'] = sample_fit_curve(fit_equation, result['popt'], x_values, count_points)
+        results.append(result)
+    return results
+
+
+def hash_fit_data(x_values, y_values):
+    """Return a hash of the x/y data for use as a fit cache key.
+
+    Args:
+        x_values: numpy array of x values on the fit axis
+        y_values: numpy array of y values
+
+    Returns:
+        str: hex digest of the x/y values
+
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for values in [x_values, y_values]:
+        hasher.update(np.ascontiguousarray(values, dtype=float).tobytes())
+    return hasher.hexdigest()
+
+
+def _create_fitted_trace(name, popt, x_values, y_values):
+    """Return the trace for a fitted equation.
+
+    Args:
+        name: unique name for trace
+        popt: fitted parameters
+        x_values: array of x values on the original x axis
+        y_values: array of y values
+
+    Returns:
+        go.Scatter: trace for the fitted equation
+
+    """
+    return go.Scatter(
+        mode='lines+markers',
+        name=name,
+        opacity=0.9,
+        text=f'popt:{[round(param, 3) for param in popt]}',
+        x=x_values,
+        y=y_values,
+    )
+
+
+def create_fitted_traces(df_raw, name, fit_equation, popt, count_points=FIT_SAMPLE_COUNT):
+    """Create traces for the equation with already fitted parameters.
+
+    Args:
+        df_raw: pandas dataframe with columns `x: float or datetime` and `y: float`
+        name: unique name for trace
+        fit_equation: equation used
+        popt: fitted parameters from `fit_curve` (for datetimes, based on the axis from `to_fit_axis`)
+        count_points: number of evenly spaced points to plot, regardless of the x units. Default is `FIT_SAMPLE_COUNT`
+
+    Returns:
+        list: of Scatter traces for fitted equation
+
+    """
+    x_float, axis_info = to_fit_axis(df_raw['x'])
+    x_values, y_values = sample_fit_curve(fit_equation, popt, x_float, count_points)
+    return [_create_fitted_trace(name, popt, from_fit_axis(x_values, axis_info), y_values)]
+
+
 def create_fit_traces(df_raw, name, fit_equation, suppress_fit_errors=False):  # noqa: CCR001
     """Create traces for specified equation.
 
     Args:
-        df_raw: pandas dataframe with columns `name: str`, `x: float`, `y: float` and `label: str`
+        df_raw: pandas dataframe with columns `name: str`, `x: float or datetime`, `y: float` and `label: str`
         name: unique name for trace
         fit_equation: equation used
         suppress_fit_errors: If True, bury errors from scipy fit. Default is False.
@@ -59,26 +657,8 @@ def create_fit_traces(df_raw, name, fit_equation, suppress_fit_errors=False):  #
     """
     fitted_data = []
     try:
-        popt, pcov = optimize.curve_fit(fit_equation, xdata=df_raw['x'], ydata=df_raw['y'], method='lm')
-        # Calculate representative x values for plotting fit
-        x_min = np.min(df_raw['x'])
-        x_max = np.max(df_raw['x'])
-        x_range = x_max - x_min
-        x_values = sorted([
-            x_min - 0.05 * x_range,
-            *np.divide(range(int(x_min * 10), int(x_max * 10)), 10),
-            x_max + 0.05 * x_range,
-        ])
-        fitted_data = [
-            go.Scatter(
-                mode='lines+markers',
-                name=name,
-                opacity=0.9,
-                text=f'popt:{[round(param, 3) for param in popt]}',
-                x=x_values,
-                y=fit_equation(x_values, *popt),
-            ),
-        ]
+        popt, pcov = fit_curve(fit_equation, to_fit_axis(df_raw['x'])[0], df_raw['y'])
+        fitted_data = create_fitted_traces(df_raw, name, fit_equation, popt)
     except (RuntimeError, ValueError) as err:  # pragma: no cover
         if not suppress_fit_errors:
             raise
@@ -86,6 +666,31 @@ def create_fit_traces(df_raw, name, fit_equation, suppress_fit_errors=False):  #
     return fitted_data  # noqa: R504
 
 
+def hash_rolling_rows(df_raw, count, check_rows):
+    """Return a hash of the first row and of the last `check_rows` rows before `count` of the x/y data.
+
+    Used to check if later data only appended rows without hashing the full series
+
+    Args:
+        df_raw: pandas dataframe with columns `x` and `y`
+        count: number of rows already processed
+        check_rows: number of rows before `count` to hash
+
+    Returns:
+        str: hex digest of the x/y values
+
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    positions = np.r_[0, max(count - check_rows, 1):count] if count else np.array([], dtype=int)
+    for column in ['x', 'y']:
+        values = df_raw[column].to_numpy()[positions]
+        if values.dtype.kind in 'biufcmM':
+            hasher.update(np.ascontiguousarray(values).tobytes())
+        else:
+            hasher.update(pd.util.hash_array(values).tobytes())
+    return hasher.hexdigest()
+
+
 class RollingChart(CustomChart):
     """Rolling Mean and Filled Standard Deviation Chart for monitoring trends."""
 
@@ -98,11 +703,216 @@ class RollingChart(CustomChart):
     label_data = 'Data'
     """Label for the scatter data. Default is 'Data'."""
 
-    def create_traces(self, df_raw):
+    band_type = 'std'
+    """Type of band from `ROLLING_BAND_TYPES`: `std` (default), `ewm`, or `quantile`."""
+
+    rolling_window = None
+    """Window for the `std` and `quantile` bands.
+
+    Default is None to use `count_rolling` for the mean and `count_std` for the standard deviation. Set to a count of
+    points or to an offset string (such as `'5min'`) for a time-based window over datetime x values
+
+    """
+
+    ewm_span = None
+    """Span of the `ewm` band. Default is None to use `count_rolling`."""
+
+    band_quantiles = (0.05, 0.95)
+    """Lower and upper quantile of the `quantile` band. Default is `(0.05, 0.95)`."""
+
+    incremental_rolling = False
+    """If True, store the rolling statistics for each data source and only calculate the rows appended since the
+    previous call (such as for a live feed). Default is False to recalculate the full series on each call.
+
+    Pass a unique `data_key` to `create_figure()` for each data source plotted with the same chart
+
+    """
+
+    rolling_state_size = 8
+    """Maximum number of data sources with stored rolling statistics when `incremental_rolling` is True."""
+
+    rolling_check_rows = 64
+    """Number of rows before the end of the previous data that are compared to detect appended data.
+
+    Only the first row and these rows are compared, so each update is independent of the length of the series. Changes
+    to earlier rows are not detected when `incremental_rolling` is True
+
+    """
+
+    _rolling_states = None
+    _rolling_lock = None
+
+    def initialize_mutables(self):
+        """Initialize the mutable data members to prevent modifying one attribute and impacting all instances."""
+        super().initialize_mutables()
+        self._rolling_states = OrderedDict()
+        self._rolling_lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the state to pickle without the lock or the stored rolling statistics.
+
+        Returns:
+            dict: picklable state
+
+        """
+        state = {key: value for key, value in self.__dict__.items() if key != '_rolling_lock'}
+        state['_rolling_states'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        """Restore the pickled state with a new lock.
+
+        Args:
+            state: dictionary from `__getstate__`
+
+        """
+        self.__dict__.update(state)
+        self._rolling_lock = threading.Lock()
+
+    def _get_rolling_settings(self):
+        """Return the band type and the windows or span used by the engines.
+
+        Returns:
+            tuple: `('ewm', span)` or `('std', mean_window, std_window)`
+
+        """
+        if self.band_type == 'ewm':
+            return ('ewm', self.ewm_span or self.count_rolling)
+        return ('std', self.rolling_window or self.count_rolling, self.rolling_window or self.count_std)
+
+    def _create_rolling_engines(self, settings):
+        """Return new engines for the settings.
+
+        Args:
+            settings: tuple from `_get_rolling_settings`
+
+        Returns:
+            tuple: `(engine_mean, engine_std)`, which may be the same engine
+
+        """
+        if settings[0] == 'ewm':
+            engine = EwmStatistics(settings[1])
+            return engine, engine
+        engine_mean = RollingStatistics(settings[1])
+        return engine_mean, engine_mean if settings[1] == settings[2] else RollingStatistics(settings[2])
+
+    def _get_rolling_state(self, data_key):
+        """Return the stored rolling statistics for the data source. Created if missing or if the settings changed.
+
+        Args:
+            data_key: hashable identifier of the data source
+
+        Returns:
+            dict: with keys `settings`, `engines`, `seen` (count and hash of the processed rows), and `lock`
+
+        """
+        settings = self._get_rolling_settings()
+        with self._rolling_lock:
+            state = self._rolling_states.get(data_key)
+            if state is None or state['settings'] != settings:
+                state = {'settings': settings, 'engines': self._create_rolling_engines(settings), 'seen': None,
+                         'lock': threading.Lock()}
+                self._rolling_states[data_key] = state
+            self._rolling_states.move_to_end(data_key)
+            while len(self._rolling_states) > self.rolling_state_size:
+                self._rolling_states.popitem(last=False)
+        return state
+
+    def update_rolling(self, df_raw, data_key=None):
+        """Return the rolling mean and standard deviation, only calculating new points when data was appended.
+
+        Used for the `std` band with count windows and for the `ewm` band. If `incremental_rolling` is True and
+        `df_raw` is at least as long as the last call for `data_key` and has the same first row and the same last
+        `rolling_check_rows` rows of that call (compared by a hash of only those rows), only the appended rows are
+        passed to the `RollingStatistics` or `EwmStatistics` engines. Otherwise, the full series is recalculated
+
+        Args:
+            df_raw: pandas dataframe with columns `x: float` and `y: float`
+            data_key: hashable identifier of the data source for `incremental_rolling`. Default is None
+
+        Returns:
+            tuple: `(rolling_mean, rolling_std)` arrays
+
+        """
+        y_values = df_raw['y'].to_numpy(dtype=float)
+        if not self.incremental_rolling:
+            engine_mean, engine_std = self._create_rolling_engines(self._get_rolling_settings())
+            for engine in {id(engine_mean): engine_mean, id(engine_std): engine_std}.values():
+                engine.reset(y_values)
+            return engine_mean.mean, engine_std.std
+
+        state = self._get_rolling_state(data_key)
+        check_rows = int(max(self.rolling_check_rows, *state['settings'][1:]))
+        with state['lock']:
+            engine_mean, engine_std = state['engines']
+            count_seen = len(engine_mean.mean)
+            is_appended = (
+                state['seen'] is not None
+                and 0 < count_seen <= len(y_values)
+                and state['seen'] == (count_seen, hash_rolling_rows(df_raw, count_seen, check_rows))
+            )
+            for engine in {id(engine_mean): engine_mean, id(engine_std): engine_std}.values():
+                if is_appended:
+                    engine.extend(y_values[count_seen:])
+                else:
+                    engine.reset(y_values)
+            state['seen'] = (len(y_values), hash_rolling_rows(df_raw, len(y_values), check_rows))
+            return engine_mean.mean, engine_std.std
+
+    def create_rolling_band_traces(self, df_raw, data_key=None):
+        """Return the traces for the band selected by `band_type`.
+
+        Time-based windows and the `quantile` band are recalculated vectorized over the full series, while the others
+        are calculated with `update_rolling`
+
+        Args:
+            df_raw: pandas dataframe with columns `x: float or datetime` and `y: float`
+            data_key: hashable identifier of the data source for `incremental_rolling`. Default is None
+
+        Returns:
+            list: of Scatter traces for the band and center line
+
+        Raises:
+            ValueError: if `band_type` is not supported
+
+        """
+        if self.band_type not in ROLLING_BAND_TYPES:
+            raise ValueError(f'Unknown band_type: {self.band_type}. Expected one of {ROLLING_BAND_TYPES}')
+
+        if self.band_type == 'quantile':
+            center, lower, upper = calculate_rolling_bands(
+                df_raw, 'quantile', window=self.rolling_window or self.count_rolling, quantiles=self.band_quantiles,
+            )
+            lower_pct, upper_pct = (f'P{quantile * 100:g}' for quantile in self.band_quantiles)
+            return create_band_traces(
+                df_raw['x'], center, lower, upper, band_name=f'{lower_pct}-{upper_pct} Range',
+                center_name='Rolling Median',
+            )
+
+        if isinstance(self.rolling_window, str) and self.band_type == 'std':
+            center, lower, upper = calculate_rolling_bands(
+                df_raw, 'std', window=self.rolling_window, count_std=self.count_std,
+            )
+            return create_band_traces(
+                df_raw['x'], center, lower, upper, band_name=f'{self.count_std}x STD Range',
+                center_name='Rolling Mean',
+            )
+
+        rolling_mean, rolling_std = self.update_rolling(df_raw, data_key)
+        if self.band_type == 'ewm':
+            std_range = self.count_std * rolling_std
+            return create_band_traces(
+                df_raw['x'], rolling_mean, rolling_mean - std_range, rolling_mean + std_range,
+                band_name=f'{self.count_std}x EWM STD Range', center_name='EWM Mean',
+            )
+        return create_rolling_traces(df_raw, self.count_rolling, self.count_std, rolling_mean, rolling_std)
+
+    def create_traces(self, df_raw, data_key=None):
         """Return traces for plotly chart.
 
         Args:
             df_raw: pandas dataframe with columns `x: float`, `y: float` and `label: str`
+            data_key: hashable identifier of the data source for `incremental_rolling`. Default is None
 
         Returns:
             list: Dash chart traces
@@ -124,9 +934,7 @@ class RollingChart(CustomChart):
         ]
         # Only add the rolling calculations if there are a sufficient number of points
         if len(df_raw['x']) >= self.count_rolling:
-            chart_data.extend(
-                create_rolling_traces(df_raw, self.count_rolling, self.count_std),
-            )
+            chart_data.extend(self.create_rolling_band_traces(df_raw, data_key))
 
         return chart_data
 
@@ -149,40 +957,230 @@ class FittedChart(CustomChart):
     suppress_fit_errors = False
     """If True, bury errors from scipy fit and will print message to console. Default is True."""
 
+    fit_pool = None
+    """`WorkerPool` used to fit groups in parallel. Default is None to fit in the current process.
+
+    One pool can be shared by all charts. Equations must be importable functions (such as those in
+    `dash_charts.equations`) to be sent to the workers
+
+    """
+
+    count_fit_points = FIT_SAMPLE_COUNT
+    """Number of points used to plot each fitted equation. Default is `FIT_SAMPLE_COUNT`."""
+
+    fit_cache_size = 4096
+    """Maximum number of cached fit results.
+
+    Keyed by a hash of the group's x/y data, the equation, and `count_fit_points`. Each entry stores the parameters,
+    the summary metrics, and the sampled curve, but not the residuals
+
+    """
+
+    best_fit_metric = 'aic'
+    """Metric used to select the best equation for each group. One of `aic`, `bic` (lowest), or `r_squared`."""
+
+    plot_best_fit_only = False
+    """If True, only plot the best equation for each group based on `best_fit_metric`. Default is False."""
+
+    _fit_cache = None
+    _fit_cache_lock = None
+
+    def initialize_mutables(self):
+        """Initialize the mutable data members to prevent modifying one attribute and impacting all instances."""
+        super().initialize_mutables()
+        self._fit_cache = OrderedDict()
+        self._fit_cache_lock = threading.Lock()
+
+    def __getstate__(self):
+        """Return the state to pickle without the lock, the cached fits, or the worker pool.
+
+        Returns:
+            dict: picklable state
+
+        """
+        state = {key: value for key, value in self.__dict__.items() if key not in {'_fit_cache_lock', 'fit_pool'}}
+        state['_fit_cache'] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        """Restore the pickled state with a new lock.
+
+        Args:
+            state: dictionary from `__getstate__`
+
+        """
+        self.__dict__.update(state)
+        self._fit_cache_lock = threading.Lock()
+
+    def calculate_fits(self, fit_jobs):  # noqa: CCR001
+        """Return the fit results of every equation for each job.
+
+        Cached results are reused and the remaining equations are fit in one job per group, in parallel across groups
+
+        Args:
+            fit_jobs: list of tuples `(data_hash, x_values, y_values)` for each group. The x values are on the fit axis
+
+        Returns:
+            list: for each job, a list ordered by `fit_eqs` of the error or a dictionary with keys `popt`, `pcov`,
+                `r_squared`, `aic`, `bic`, and `curve` (the fit axis `(x, y)` from `sample_fit_curve`)
+
+        """
+        equations = [fit_equation for _fit_name, fit_equation in self.fit_eqs]
+        count_points = self.count_fit_points
+        results = {}
+        missing = {}
+        with self._fit_cache_lock:
+            for data_hash, x_values, y_values in fit_jobs:
+                for fit_equation in equations:
+                    cache_key = (data_hash, fit_equation, count_points)
+                    if cache_key in self._fit_cache:
+                        self._fit_cache.move_to_end(cache_key)
+                        results[cache_key] = self._fit_cache[cache_key]
+                    elif cache_key not in results:
+                        missing.setdefault(data_hash, ([], x_values, y_values, count_points))[0].append(fit_equation)
+                        results[cache_key] = None
+
+        if missing:
+            group_jobs = list(missing.values())
+            if self.fit_pool is not None and len(group_jobs) > 1:
+                new_results = self.fit_pool.map(_fit_equations_job, group_jobs)
+            else:
+                new_results = [_fit_equations_job(group_job) for group_job in group_jobs]
+            with self._fit_cache_lock:
+                for (data_hash, (group_equations, *_args)), group_results in zip(missing.items(), new_results):
+                    for fit_equation, result in zip(group_equations, group_results):
+                        results[(data_hash, fit_equation, count_points)] = result
+                        self._fit_cache[(data_hash, fit_equation, count_points)] = result
+                while len(self._fit_cache) > self.fit_cache_size:
+                    self._fit_cache.popitem(last=False)
+
+        return [
+            [results[(fit_job[0], fit_equation, count_points)] for fit_equation in equations] for fit_job in fit_jobs
+        ]
+
+    def select_best_fit(self, fit_results):
+        """Return the index of the best successful fit based on `best_fit_metric`.
+
+        Args:
+            fit_results: list of results for one group from `calculate_fits`
+
+        Returns:
+            int: index of the best fit or None if every fit failed
+
+        """
+        sign = -1 if self.best_fit_metric == 'r_squared' else 1
+        scores = [
+            (sign * result[self.best_fit_metric], idx)
+            for idx, result in enumerate(fit_results)
+            if not isinstance(result, Exception) and not np.isnan(result[self.best_fit_metric])
+        ]
+        return min(scores)[1] if scores else None
+
+    def _group_fit_data(self, df_raw):
+        """Yield the row positions of each group and the data to fit if the group has enough points.
+
+        The groups are split with one stable sort of the group numbers rather than a dataframe per group
+
+        Args:
+            df_raw: pandas dataframe with columns `name: str`, `x: float or datetime`, and `y: float`
+
+        Yields:
+            tuple: `(name, positions, fit_job, axis_info)` where `fit_job` is `(data_hash, x_float, y_values)` or None
+                when the group is not fit and `axis_info` is from `to_fit_axis`
+
+        """
+        codes = df_raw.groupby('name', sort=False, dropna=False).ngroup().to_numpy()
+        order = np.argsort(codes, kind='stable')
+        names = df_raw['name'].to_numpy()
+        x_raw = df_raw['x'].to_numpy()
+        y_raw = df_raw['y'].to_numpy(dtype=float)
+        for positions in np.split(order, np.flatnonzero(np.diff(codes[order])) + 1):
+            fit_job = None
+            axis_info = None
+            if self.fit_eqs and len(positions) > self.min_scatter_for_fit:
+                x_float, axis_info = to_fit_axis(x_raw[positions])
+                y_values = y_raw[positions]
+                fit_job = (hash_fit_data(x_float, y_values), x_float, y_values)
+            yield names[positions[0]], positions, fit_job, axis_info
+
+    def summarize_fits(self, df_raw):
+        """Fit every equation for each group and return the parameters and goodness of fit as a table.
+
+        Args:
+            df_raw: pandas dataframe with columns `name: str`, `x: float or datetime`, and `y: float`
+
+        Returns:
+            dataframe: one row per group and equation with columns `name`, `fit_name`, `popt`, `pcov`, `r_squared`,
+                `aic`, `bic`, `residuals`, `error` (message if the fit failed), and `is_best` (per `best_fit_metric`)
+
+        """
+        check_raw_data(df_raw, ['name', 'x', 'y'])
+        groups = [(name, fit_job) for name, _positions, fit_job, _axis_info in self._group_fit_data(df_raw) if fit_job]
+        rows = []
+        for (name, fit_job), fit_results in zip(groups, self.calculate_fits([fit_job for _, fit_job in groups])):
+            best_idx = self.select_best_fit(fit_results)
+            _data_hash, x_values, y_values = fit_job
+            for idx, ((fit_name, fit_equation), result) in enumerate(zip(self.fit_eqs, fit_results)):
+                row = {'name': name, 'fit_name': fit_name, 'error': None, 'is_best': idx == best_idx}
+                if isinstance(result, Exception):
+                    row['error'] = str(result)
+                else:
+                    row.update(result)
+                    row['residuals'] = y_values - fit_equation(x_values, *result['popt'])
+                rows.append(row)
+        columns = ['name', 'fit_name', 'popt', 'pcov', 'r_squared', 'aic', 'bic', 'residuals', 'error', 'is_best']
+        return pd.DataFrame(rows, columns=columns)
+
     def create_traces(self, df_raw):   # noqa: CCR001
         """Return traces for plotly chart.
 
         Args:
-            df_raw: pandas dataframe with columns `name: str`, `x: float`, `y: float` and `label: str`
+            df_raw: pandas dataframe with columns `name: str`, `x: float or datetime`, `y: float` and `label: str`
 
         Returns:
             list: Dash chart traces
 
+        Raises:
+            RuntimeError: if a fit fails and `suppress_fit_errors` is False
+            ValueError: if a fit fails and `suppress_fit_errors` is False
+
         """
         # Verify data format
         check_raw_data(df_raw, ['name', 'x', 'y', 'label'])
 
         # Separate raw tidy dataframe into separate scatter plots
         scatter_data = []
-        fit_traces = []
-        for name in set(df_raw['name']):
-            df_name = df_raw[df_raw['name'] == name]
+        fit_groups = []
+        fit_jobs = []
+        labels, x_raw, y_raw = (df_raw[column].to_numpy() for column in ['label', 'x', 'y'])
+        for name, positions, fit_job, axis_info in self._group_fit_data(df_raw):
             scatter_data.append(
                 go.Scatter(
                     customdata=[name],
                     mode='markers' if self.fit_eqs else self.fallback_mode,
                     name=name,
                     opacity=0.5,
-                    text=df_name['label'],
-                    x=df_name['x'],
-                    y=df_name['y'],
+                    text=labels[positions],
+                    x=x_raw[positions],
+                    y=y_raw[positions],
                 ),
             )
+            if fit_job:
+                fit_groups.append((name, axis_info))
+                fit_jobs.append(fit_job)
 
-            if len(df_name['x']) > self.min_scatter_for_fit:
-                for fit_name, fit_equation in self.fit_eqs:
-                    fit_traces.extend(
-                        create_fit_traces(df_name, f'{name}-{fit_name}', fit_equation, self.suppress_fit_errors),
-                    )
+        fit_traces = []
+        for (name, axis_info), fit_results in zip(fit_groups, self.calculate_fits(fit_jobs)):
+            best_idx = self.select_best_fit(fit_results) if self.plot_best_fit_only else None
+            for idx, ((fit_name, _fit_equation), result) in enumerate(zip(self.fit_eqs, fit_results)):
+                if isinstance(result, Exception):
+                    if not self.suppress_fit_errors:
+                        raise result
+                    continue
+                if self.plot_best_fit_only and idx != best_idx:
+                    continue
+                x_values, y_values = result['curve']
+                x_values = from_fit_axis(x_values, axis_info)
+                fit_traces.append(_create_fitted_trace(f'{name}-{fit_name}', result['popt'], x_values, y_values))
 
         return scatter_data + fit_traces
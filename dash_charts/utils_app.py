@@ -1,17 +1,26 @@
 """Utility functions and classes for building applications."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from copy import deepcopy
+from functools import wraps
 from itertools import count
 from pathlib import Path
 from pprint import pprint
 from typing import List, Optional
 
 import dash
+import plotly.graph_objects as go
 from box import Box
-from dash import html
+from dash import dcc, html
+from dash.exceptions import PreventUpdate
 from implements import Interface
 
-from .utils_callbacks import format_app_callback
+from .utils_callbacks import (
+    CALLBACK_METRICS, bind_callback_maps, format_app_callback, instrument_callback, limit_payload,
+    register_metrics_endpoint,
+)
 
 ASSETS_DIR = Path(__file__).parent / 'assets'
 """Path to the static files directory."""
@@ -70,6 +79,33 @@ def init_app(**app_kwargs: dict) -> dash.Dash:
     return dash.Dash(__name__, **app_kwargs)
 
 
+def enable_compression(server, algorithms=('br', 'gzip'), min_size=500):
+    """Compress the Flask server responses, including the callback outputs, with Flask-Compress.
+
+    Requires the optional dependency `flask-compress` (and `brotli` for `br`). Only the first call for a server applies
+
+    Args:
+        server: Flask server
+        algorithms: compression algorithms in order of preference. Default is brotli then gzip
+        min_size: minimum response size in bytes to compress. Default is 500
+
+    Raises:
+        RuntimeError: if `flask-compress` is not installed
+
+    """
+    if 'dash_charts_compress' in server.extensions:
+        return
+    try:
+        from flask_compress import Compress
+    except ImportError as err:
+        msg = 'Response compression requires `flask-compress`. Install with `pip install dash_charts[compress]`'
+        raise RuntimeError(msg) from err
+
+    server.config['COMPRESS_ALGORITHM'] = list(algorithms)
+    server.config['COMPRESS_MIN_SIZE'] = min_size
+    server.extensions['dash_charts_compress'] = Compress(server)
+
+
 class AppInterface(Interface):  # noqa: H601
     """Base Dash Application Interface."""
 
@@ -83,7 +119,7 @@ class AppInterface(Interface):  # noqa: H601
     def __init__(self, app: Optional[dash.Dash] = None) -> None:  # noqa: D102, D107
         ...
 
-    def create(self, assign_layout: bool = True) -> None:  # noqa: D102
+    def create(self, assign_layout: bool = True, defer_layout: bool = False) -> None:  # noqa: D102
         ...
 
     def override_module_defaults(self) -> None:  # noqa: D102
@@ -112,7 +148,9 @@ class AppInterface(Interface):  # noqa: H601
     def return_layout(self) -> dict:  # noqa: D102
         ...
 
-    def callback(self, outputs, inputs, states, pic: bool = False, **kwargs: dict):  # noqa: D102
+    def callback(  # noqa: D102
+        self, outputs, inputs, states, pic: bool = False, wait_for_data: bool = False, **kwargs: dict,
+    ):
         ...
 
     def create_callbacks(self) -> None:
@@ -175,6 +213,79 @@ class AppBase:  # noqa: H601
     init_app_kwargs = {}
     """Additional keyword arguments passed to `init_app()`."""
 
+    instrument_callbacks = False
+    """If True, record the wall time, chart creation time, payload size, and call count of each callback.
+
+    Applies to callbacks registered with `self.callback()`, including those from modules. The summary is served as
+    JSON from `utils_callbacks.CALLBACK_METRICS_ROUTE` on the server from `self.get_server()`
+
+    """
+
+    callback_metrics = CALLBACK_METRICS
+    """Registry for the callback metrics. Default is the registry shared by all apps in the process."""
+
+    profile_threshold = None
+    """If set with `instrument_callbacks`, dump cProfile stats for calls that take longer (seconds). Default is None."""
+
+    profile_dir = None
+    """Directory for the cProfile dumps. Default is None for the current working directory."""
+
+    compress_responses = False
+    """If True, compress the server responses with `enable_compression()`. Requires the optional `flask-compress`."""
+
+    compress_algorithms = ('br', 'gzip')
+    """Compression algorithms in order of preference when `compress_responses` is True."""
+
+    payload_budget = None
+    """Maximum size in bytes of the serialized outputs of each callback. Default is None for no budget."""
+
+    payload_action = 'warn'
+    """Action when a callback exceeds `payload_budget`. One of `utils_callbacks.PAYLOAD_ACTIONS`."""
+
+    background_data = False
+    """If True, `self.generate_data()` runs in a background thread so that `self.create()` does not block.
+
+    `self.return_layout()` must not depend on the data. Callbacks that read the data should be registered with
+    `self.callback(..., wait_for_data=True)`, which raises `PreventUpdate` until the first load is complete (see
+    `data_timeout`) and calls them again once the `id_data_ready` interval reports that the data is ready. Lazy tabs
+    and pages show a loading placeholder until the data is ready (see `AppWithNavigation.lazy_layouts`)
+
+    """
+
+    data_timeout = 0
+    """Seconds that `wait_for_data` callbacks wait for the background data before raising `PreventUpdate`.
+
+    Default is 0 to not block the server worker. Waiting holds a server thread for up to this long on each call
+
+    """
+
+    data_poll_interval = 500
+    """Milliseconds between checks for the background data by the `id_data_ready` interval."""
+
+    id_data_ready = 'data-ready'
+    """ID of the `dcc.Interval` added to the layout with `background_data`. Disabled once the data is ready.
+
+    Registered automatically. The `disabled` property is an input of every `wait_for_data` callback
+
+    """
+
+    data_refresh_interval = None
+    """If set, call `self.generate_data()` again in the background every interval (seconds). Default is None.
+
+    Callbacks may read the data during a refresh, so `generate_data` should assign new objects instead of modifying
+    the existing data in place
+
+    """
+
+    data_error = None
+    """Exception from the last failed background refresh or None."""
+
+    figure_pool = None
+    """Optional `utils_workers.FigureWorkerPool` used by `self.create_figure()`. Share one pool between apps."""
+
+    _is_deferred = False
+    """True between `self.create(defer_layout=True)` and `self.build_deferred_layout()`."""
+
     # In child class, declare the rest of the static data members here
 
     def __init__(self, app: Optional[dash.Dash] = None) -> None:
@@ -187,13 +298,20 @@ class AppBase:  # noqa: H601
         default = {'title': self.name, 'external_stylesheets': self.external_stylesheets}
         self.init_app_kwargs = {**default, **self.init_app_kwargs}
         self.app = app or init_app(**self.init_app_kwargs)
+        self._data_future = None
+        self._data_executor = None
+        self._refresh_stop = threading.Event()
+        self._refresh_thread = None
 
-    def create(self, assign_layout: bool = True) -> None:  # noqa: CCR001
+    def create(self, assign_layout: bool = True, defer_layout: bool = False) -> None:  # noqa: CCR001
         """Create the ids, app charts, layout, callbacks, and optional modules.
 
         Args:
             assign_layout: if True, will assign `self.app.layout`. If False, must call `self.return_layout` separately.
                 Default is True
+            defer_layout: if True, only register the ids, module elements, and callbacks. `self.generate_data()` and
+                `self.create_elements()` are deferred to `self.build_deferred_layout()` and no layout is assigned.
+                Callbacks must not depend on the data or charts until the layout is built. Default is False
 
         Raises:
             NotImplementedError: if child class has not set the `self.name` data member
@@ -203,19 +321,21 @@ class AppBase:  # noqa: H601
             raise NotImplementedError('Child class must set `self.name` to a unique string for this app')
 
         # Initialize app and each module
+        self._is_deferred = defer_layout
         self.initialization()
         for mod in self.modules:
             self.register_uniq_ids(mod.all_ids)
         self.override_module_defaults()  # Call optional override method
 
         # Create charts for app and each module
-        self.create_elements()
+        if not defer_layout:
+            self.create_elements()
         for mod in self.modules:
             mod.create_elements(self._il)
 
         # Create app layout. User must call the return_layout method from each module within own return_layout method
-        if assign_layout:
-            self.app.layout = self.return_layout()
+        if assign_layout and not defer_layout:
+            self.app.layout = self.add_data_ready_interval(self.return_layout())
         if assign_layout and self.validation_layout:
             self.app.validation_layout = [deepcopy(self.app.layout)] + self.validation_layout
             pprint('\n\nValidationLayout?')
@@ -225,6 +345,8 @@ class AppBase:  # noqa: H601
         self.create_callbacks()
         for mod in self.modules:
             mod.create_callbacks(self)
+        if self.background_data:
+            self.register_data_ready()
 
         self.verify_app_initialization()
 
@@ -235,12 +357,187 @@ class AppBase:  # noqa: H601
     def initialization(self) -> None:
         """Initialize ids with `self.register_uniq_ids([...])` and other one-time actions."""
         self.register_uniq_ids([*self._id.values()])
-        self.generate_data()
+        if self.background_data:
+            self.register_uniq_ids([self.id_data_ready])
+        if not self._is_deferred:
+            self.load_data()
+
+    def build_deferred_layout(self) -> Optional[dict]:
+        """Generate the data and create the elements skipped by `self.create(defer_layout=True)`.
+
+        With `background_data`, the first call starts `self.generate_data()` and the elements are only created once
+        the data is ready. Does not block
+
+        Returns:
+            dict: Dash HTML object from `self.add_data_ready_interval()` or None if the background data is not ready
+
+        """
+        if self._is_deferred:
+            if self._data_future is None:
+                self.load_data()
+            if not self.is_data_ready():
+                return None
+            self.create_elements()
+            self._is_deferred = False
+        return self.add_data_ready_interval(self.return_layout())
+
+    def add_data_ready_interval(self, layout: dict) -> dict:
+        """Return the layout with the `id_data_ready` interval if `background_data` is True.
+
+        Args:
+            layout: Dash HTML object from `self.return_layout()`
+
+        Returns:
+            dict: Dash HTML object
+
+        """
+        if not self.background_data:
+            return layout
+        interval = dcc.Interval(
+            id=self._il[self.id_data_ready], interval=self.data_poll_interval, disabled=not self._is_data_loading(),
+        )
+        return html.Div([layout, interval])
+
+    def register_data_ready(self) -> None:
+        """Register the callback that disables the `id_data_ready` interval once the background data is ready.
+
+        The change to `disabled` calls each `wait_for_data` callback again with the data. Polling also stops if the
+        load failed so that the callbacks report the error
+
+        """
+        @self.callback([(self.id_data_ready, 'disabled')], [(self.id_data_ready, 'n_intervals')], [])
+        def check_data_ready(n_intervals):
+            if self._is_data_loading():
+                raise PreventUpdate
+            return [True]
+
+    def _is_data_loading(self) -> bool:
+        """Return True while the background `self.generate_data()` from `self.load_data()` is running.
+
+        Returns:
+            bool: True if the first background load has not finished, whether or not it succeeds
+
+        """
+        return self._data_future is not None and not self._data_future.done()
 
     def generate_data(self) -> None:
         """Recommended method for generating data stored in memory. Called in initialization."""
         ...
 
+    def load_data(self) -> None:
+        """Call `self.generate_data()` now or in the background and start the optional periodic refresh.
+
+        See `background_data` and `data_refresh_interval`
+
+        """
+        if self.data_refresh_interval:
+            self._refresh_stop.clear()
+        if self.background_data:
+            if self._data_executor is None:
+                prefix = f'{self.name}-data'.replace(' ', '-')
+                self._data_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=prefix)
+            self._data_future = self._data_executor.submit(self.generate_data)
+            # Refreshing during the first load would call generate_data concurrently
+            self._data_future.add_done_callback(lambda _future: self._start_data_refresh())
+        else:
+            self.generate_data()
+            self._start_data_refresh()
+
+    def _start_data_refresh(self) -> None:
+        """Start the periodic refresh thread if `data_refresh_interval` is set and the refresh was not stopped."""
+        if self.data_refresh_interval and self._refresh_thread is None and not self._refresh_stop.is_set():
+            self._refresh_thread = threading.Thread(target=self._refresh_data, daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_data(self) -> None:
+        """Call `self.generate_data()` every `data_refresh_interval` seconds until `self.stop_data_refresh()`."""
+        while not self._refresh_stop.wait(self.data_refresh_interval):
+            try:
+                self.generate_data()
+                self.data_error = None
+            except Exception as err:  # Keep the previous data and try again on the next interval
+                self.data_error = err
+
+    def stop_data_refresh(self) -> None:
+        """Stop the periodic refresh started by `self.load_data()`."""
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+    def wait_for_data(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the background `self.generate_data()` from `self.load_data()`.
+
+        Args:
+            timeout: maximum seconds to wait. Default is None to wait indefinitely
+
+        Returns:
+            bool: True if the data is ready, False if the timeout was reached
+
+        Raises:
+            RuntimeError: if `generate_data` failed
+
+        """
+        if self._data_future is None:
+            return True
+        try:
+            self._data_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return False
+        except Exception as err:
+            raise RuntimeError(f'Failed to generate data for "{self.name}"') from err
+        return True
+
+    def is_data_ready(self) -> bool:
+        """Return True if the data from `self.load_data()` is ready. Does not block.
+
+        Returns:
+            bool: True if the data is ready or is not loaded in the background
+
+        Raises:
+            RuntimeError: if the background `generate_data` failed
+
+        """
+        return self.wait_for_data(timeout=0)
+
+    def _wait_for_data_callback(self, func, position):
+        """Wrap the callback function to check for the background data.
+
+        Args:
+            func: callback function
+            position: position of the `id_data_ready` input in the arguments, which is not passed to `func`
+
+        Returns:
+            function: wrapped callback that raises `PreventUpdate` if the data is not ready within `data_timeout`
+                (default is 0 to not wait)
+
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.wait_for_data(self.data_timeout):
+                raise PreventUpdate
+            return func(*args[:position], *args[position + 1:], **kwargs)
+
+        return wrapper
+
+    def create_figure(self, chart, df_raw, **kwargs):
+        """Return the chart figure, built in a worker process if `figure_pool` is set.
+
+        Use in CPU-heavy callbacks so that a slow figure does not block the web server worker
+
+        Args:
+            chart: `CustomChart` instance. Must be picklable when using the `figure_pool`
+            df_raw: pandas dataframe passed to `chart.create_figure()`
+            kwargs: keyword arguments for `chart.create_figure()`
+
+        Returns:
+            dict: the figure dictionary (from `go.Figure.to_dict()`) with or without the `figure_pool`
+
+        """
+        if self.figure_pool is None:
+            return go.Figure(chart.create_figure(df_raw, **kwargs)).to_dict()
+        return self.figure_pool.create_figure(chart, df_raw, **kwargs)
+
     def register_uniq_ids(self, app_ids: List[str]) -> None:
         """Register the `app_ids` to the corresponding global_id in the `self._il` lookup dictionary.
 
@@ -276,7 +573,9 @@ class AppBase:  # noqa: H601
         """
         return html.Div(['Welcome to the BaseApp! Override return_layout() in child class.'])  # pragma: no cover
 
-    def callback(self, outputs, inputs, states, pic: bool = False, **kwargs: dict):
+    def callback(
+        self, outputs, inputs, states, pic: bool = False, wait_for_data: bool = False, **kwargs: dict,
+    ):
         """Return app callback decorator based on provided components.
 
         Args:
@@ -284,17 +583,35 @@ class AppBase:  # noqa: H601
             inputs: list of tuples with app_id and property name
             states: list of tuples with app_id and property name
             pic: If True, prevent call on page load (`prevent_initial_call`). Default is False
+            wait_for_data: If True and `background_data` is True, raise `PreventUpdate` until the data is ready and
+                call again once it is. The function only receives the arguments for `inputs` and `states`. Default is
+                False
             **kwargs: any additional keyword arguments for `self.app.callback`
 
         Returns:
             dict: result of `self.app.callback()`
 
         """
-        return self.app.callback(
-            *format_app_callback(self._il, outputs, inputs, states),
+        wait_for_data = wait_for_data and self.background_data
+        app_inputs = [*inputs, (self.id_data_ready, 'disabled')] if wait_for_data else inputs
+        decorator = self.app.callback(
+            *format_app_callback(self._il, outputs, app_inputs, states),
             prevent_initial_call=pic,
             **kwargs,
         )
+        key = ','.join(f'{self._il[_id]}.{prop}' for _id, prop in outputs)
+
+        def instrumented_decorator(func):
+            func = bind_callback_maps(func, inputs, states)
+            if wait_for_data:
+                func = self._wait_for_data_callback(func, len(inputs))
+            if self.payload_budget is not None:
+                func = limit_payload(func, key, self.payload_budget, self.payload_action)
+            if self.instrument_callbacks:
+                func = instrument_callback(func, key, self.callback_metrics, self.profile_threshold, self.profile_dir)
+            return decorator(func)
+
+        return instrumented_decorator
 
     def run(self, **dash_kwargs: dict) -> None:
         """Launch the Dash server instance.
@@ -303,6 +620,7 @@ class AppBase:  # noqa: H601
             **dash_kwargs: keyword arguments for `Dash.run_server()`
 
         """
+        self.get_server()  # pragma: no cover
         self.app.run_server(**dash_kwargs)  # pragma: no cover
 
     def get_server(self):
@@ -312,4 +630,8 @@ class AppBase:  # noqa: H601
             dict: the Flask `server` component of the Dash app
 
         """
+        if self.instrument_callbacks:
+            register_metrics_endpoint(self.app.server, self.callback_metrics)
+        if self.compress_responses:
+            enable_compression(self.app.server, self.compress_algorithms)
         return self.app.server
@@ -1,5 +1,6 @@
 """Classes for more complex applications that have tabbed or paged navigation."""
 
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 
@@ -42,7 +43,34 @@ class AppWithNavigation(AppBase):
     """OrderedDict based on the list of tuples from `self.define_nav_elements()`."""
 
     nav_layouts = None
-    """Dictionary with nav_names as keys and corresponding layout as value."""
+    """OrderedDict with nav_names as keys and corresponding layout as value. Ordered by least recently used."""
+
+    lazy_layouts = False
+    """If True, each tab or page generates data, creates elements, and builds the layout on first navigation.
+
+    Callbacks are still registered in `self.create()`. The validation layout would require every layout, so
+    `suppress_callback_exceptions` is enabled instead
+
+    """
+
+    layout_cache_size = None
+    """Maximum number of layouts kept in `self.nav_layouts`. Least recently used layouts are rebuilt on navigation.
+
+    Only applies if `lazy_layouts` is True. Default is None for no eviction. Data and charts are kept for callbacks
+
+    """
+
+    nav_poll_interval = 500
+    """Milliseconds between checks for a lazy tab or page that is waiting for its `background_data`."""
+
+    id_nav_poll = 'nav-poll'
+    """ID of the `dcc.Interval` that re-renders a tab or page while its data is loading. Add to `app_ids`."""
+
+    _nav_lock = None
+    """Lock for reading and updating `self.nav_layouts`. Not held while a layout is built."""
+
+    _build_locks = None
+    """Lock for each tab or page to build each lazy layout only once when requested concurrently."""
 
     def define_nav_elements(self):
         """Return list of initialized pages or tabs accordingly.
@@ -64,17 +92,120 @@ class AppWithNavigation(AppBase):
         """
         # Initialize the lookup for each tab then configure each tab
         self.nav_lookup = OrderedDict([(tab.name, tab) for tab in self.define_nav_elements()])
-        self.nav_layouts = {}
+        self.nav_layouts = OrderedDict()
+        self._nav_lock = threading.Lock()
+        self._build_locks = {nav_name: threading.Lock() for nav_name in self.nav_lookup}
         for nav_name, nav in self.nav_lookup.items():
-            nav.create(assign_layout=False)
-            self.nav_layouts[nav_name] = nav.return_layout()
+            nav.create(assign_layout=False, defer_layout=self.lazy_layouts)
+            if not self.lazy_layouts:
+                self.nav_layouts[nav_name] = nav.add_data_ready_interval(nav.return_layout())
 
-        # Store validation_layout that is later used for callback verification in base class
-        self.validation_layout = [*map(deepcopy, self.nav_layouts.values())]
+        if self.lazy_layouts:
+            self.app.config.suppress_callback_exceptions = True
+        else:
+            # Store validation_layout that is later used for callback verification in base class
+            self.validation_layout = [*map(deepcopy, self.nav_layouts.values())]
 
         # Initialize parent application that handles navigation
         super().create(**kwargs)
 
+    def get_nav_layout(self, nav_name):
+        """Return the layout for the tab or page, building and caching the layout on first use if lazy.
+
+        Args:
+            nav_name: name of the tab or page
+
+        Returns:
+            dict: Dash HTML object. A placeholder from `self.return_loading_layout()` while the `background_data` of
+                a lazy tab or page is loading
+
+        """
+        layout = self.build_nav_layout(nav_name)
+        return self.return_loading_layout(nav_name) if layout is None else layout
+
+    def build_nav_layout(self, nav_name):
+        """Return the cached layout for the tab or page or build the layout if the data is ready. Does not block.
+
+        Args:
+            nav_name: name of the tab or page
+
+        Returns:
+            dict: Dash HTML object or None if the `background_data` of a lazy tab or page is still loading
+
+        Raises:
+            KeyError: if `nav_name` is not a known tab or page
+
+        """
+        layout = self._get_cached_layout(nav_name)
+        if layout is not None:
+            return layout
+
+        # Build outside of the shared lock so that other tabs or pages can be served in the meantime
+        with self._build_locks[nav_name]:
+            layout = self._get_cached_layout(nav_name)  # May have been built while waiting for the lock
+            if layout is None:
+                layout = self.nav_lookup[nav_name].build_deferred_layout()
+                if layout is None:
+                    return None
+                with self._nav_lock:
+                    self.nav_layouts[nav_name] = layout
+                    if self.layout_cache_size is not None:
+                        while len(self.nav_layouts) > max(self.layout_cache_size, 1):
+                            self.nav_layouts.popitem(last=False)
+        return layout
+
+    def return_loading_layout(self, nav_name):
+        """Return the placeholder shown while the data for a lazy tab or page is loading.
+
+        Args:
+            nav_name: name of the tab or page
+
+        Returns:
+            dict: Dash HTML object
+
+        """
+        return html.Div([f'Loading {nav_name}...'])
+
+    def return_poll_interval(self):
+        """Return the disabled `dcc.Interval` that is enabled while a lazy tab or page is loading.
+
+        Returns:
+            dict: Dash HTML object
+
+        """
+        return dcc.Interval(id=self._il[self.id_nav_poll], interval=self.nav_poll_interval, disabled=True)
+
+    def render_nav(self, nav_name):
+        """Return the layout and whether to stop polling, for navigation callbacks.
+
+        Args:
+            nav_name: name of the tab or page
+
+        Returns:
+            tuple: `(layout, poll_disabled)`. Polling continues until the data of a lazy tab or page is ready
+
+        """
+        layout = self.build_nav_layout(nav_name)
+        if layout is None:
+            return self.return_loading_layout(nav_name), False
+        return layout, True
+
+    def _get_cached_layout(self, nav_name):
+        """Return the cached layout and mark it as the most recently used.
+
+        Args:
+            nav_name: name of the tab or page
+
+        Returns:
+            dict: Dash HTML object or None if not cached
+
+        """
+        with self._nav_lock:
+            if nav_name in self.nav_layouts:
+                self.nav_layouts.move_to_end(nav_name)
+                return self.nav_layouts[nav_name]
+        return None
+
     def initialization(self) -> None:
         """Initialize ids with `self.register_uniq_ids([...])` and other one-time actions."""
         super().initialization()
@@ -121,7 +252,7 @@ class AppWithTabs(AppWithNavigation):
     id_tabs_content = 'tabs-wrapper'
     id_tabs_select = 'tabs-content'
 
-    app_ids = [id_tabs_content, id_tabs_select]
+    app_ids = [id_tabs_content, id_tabs_select, AppWithNavigation.id_nav_poll]
     """List of all ids for the top-level tab view. Will be mapped to `self._il` for globally unique ids."""
 
     def return_layout(self) -> dict:
@@ -139,17 +270,18 @@ class AppWithTabs(AppWithNavigation):
                     children=tabs,
                 ),
                 html.Div(id=self._il[self.id_tabs_content]),
+                self.return_poll_interval(),
             ],
         )
 
     def create_callbacks(self) -> None:
         """Register the navigation callback."""
-        outputs = [(self.id_tabs_content, 'children')]
-        inputs = [(self.id_tabs_select, 'value')]
+        outputs = [(self.id_tabs_content, 'children'), (self.id_nav_poll, 'disabled')]
+        inputs = [(self.id_tabs_select, 'value'), (self.id_nav_poll, 'n_intervals')]
 
         @self.callback(outputs, inputs, [])
-        def render_tab(tab_name):
-            return [self.nav_layouts[tab_name]]
+        def render_tab(tab_name, n_intervals):
+            return [*self.render_nav(tab_name)]
 
 
 # > PLANNED: Make the tabs and chart compact as well when the compact argument is set to True
@@ -191,6 +323,7 @@ class FullScreenAppWithTabs(AppWithTabs):  # noqa: H601
                     style={f'margin-{self.tabs_location}': self.tabs_margin},
                     children=[html.Div(id=self._il[self.id_tabs_content])],
                 ),
+                self.return_poll_interval(),
             ],
         )
 
@@ -282,7 +415,7 @@ class AppMultiPage(AppWithNavigation):  # noqa: H601
     id_toggler = 'nav-toggle'
     id_collapse = 'nav-collapse'
 
-    app_ids = [id_url, id_pages_content, id_toggler, id_collapse]
+    app_ids = [id_url, id_pages_content, id_toggler, id_collapse, AppWithNavigation.id_nav_poll]
     """List of all ids for the top-level pages view. Will be mapped to `self._il` for globally unique ids."""
 
     def return_layout(self) -> dict:
@@ -297,6 +430,7 @@ class AppMultiPage(AppWithNavigation):  # noqa: H601
                 dcc.Location(id=self._il[self.id_url], refresh=False),
                 self.nav_bar(),
                 html.Div(id=self._il[self.id_pages_content]),
+                self.return_poll_interval(),
             ],
         )
 
@@ -363,16 +497,16 @@ class AppMultiPage(AppWithNavigation):  # noqa: H601
 
     def create_callbacks(self) -> None:
         """Register the navigation callback."""
-        outputs = [(self.id_pages_content, 'children')]
-        inputs = [(self.id_url, 'pathname')]
+        outputs = [(self.id_pages_content, 'children'), (self.id_nav_poll, 'disabled')]
+        inputs = [(self.id_url, 'pathname'), (self.id_nav_poll, 'n_intervals')]
 
         @self.callback(outputs, inputs, [])
-        def render_page(pathname):
+        def render_page(pathname, n_intervals):
             try:
                 # TODO: Demo how pages could use parameters from pathname
-                return [self.nav_layouts[self.select_page_name(pathname)]]
+                return [*self.render_nav(self.select_page_name(pathname))]
             except Exception as err:
-                return [html.Div(children=[f'Error rendering "{pathname}":\n{err}'])]
+                return [html.Div(children=[f'Error rendering "{pathname}":\n{err}']), True]
 
         @self.callback(
             [(self.id_collapse, 'is_open')],
@@ -1,8 +1,16 @@
 """Utilities for better Dash callbacks."""
 
 import re
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from pathlib import Path
 
 import dash
+import plotly.graph_objects as go
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 
@@ -27,6 +35,75 @@ def format_app_callback(lookup, outputs, inputs, states):
     )
 
 
+def _as_key(components):
+    """Return the list of `(app_id, prop)` components as a hashable tuple.
+
+    Args:
+        components: list of tuples with app_id and property name
+
+    Returns:
+        tuple: tuple of `(app_id, prop)` tuples
+
+    """
+    return tuple(map(tuple, components))
+
+
+@lru_cache(maxsize=256)
+def compile_arg_map(inputs, states):
+    """Return the index tables used by `map_args` for one layout of inputs and states.
+
+    Compiled once per layout (see `bind_callback_maps`) so each call only indexes `raw_args`
+
+    Args:
+        inputs: tuple of `(app_id, prop)` tuples
+        states: tuple of `(app_id, prop)` tuples
+
+    Returns:
+        tuple: for inputs and states, a tuple of `(app_id, ((prop, arg_index), ...))`
+
+    """
+    tables = []
+    for offset, group in [(0, inputs), (len(inputs), states)]:
+        table = {}
+        for arg_idx, (app_id, prop) in enumerate(group, start=offset):
+            table.setdefault(app_id, {})[prop] = arg_idx
+        tables.append(tuple((app_id, tuple(props.items())) for app_id, props in table.items()))
+    return tuple(tables)
+
+
+_ACTIVE_ARG_MAPS = ContextVar('dash_charts_arg_maps', default=None)
+"""`(inputs, states, tables)` compiled by `bind_callback_maps` for the running callback."""
+
+
+def bind_callback_maps(func, inputs, states):
+    """Compile the `map_args` index tables at registration and return the callback wrapped to use them.
+
+    The tables are kept in the closure of the wrapper and used while the callback runs when `map_args` receives the
+    same `inputs` and `states` list objects, which skips hashing the components. The lists should not be modified
+    after registration
+
+    Args:
+        func: callback function
+        inputs: list of tuples with app_id and property name
+        states: list of tuples with app_id and property name
+
+    Returns:
+        function: wrapped callback
+
+    """
+    arg_maps = (inputs, states, compile_arg_map(_as_key(inputs), _as_key(states)))
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _ACTIVE_ARG_MAPS.set(arg_maps)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _ACTIVE_ARG_MAPS.reset(token)
+
+    return wrapper
+
+
 def map_args(raw_args, inputs, states):
     """Map the function arguments into a dictionary with keys for the input and state names.
 
@@ -55,19 +132,12 @@ def map_args(raw_args, inputs, states):
         dict: with keys of the app_id, property, and arg value (`a_in[key][arg_type]`)
 
     """
-    # Split args into groups of inputs/states
-    a_in = raw_args[:len(inputs)]
-    a_state = raw_args[len(inputs):]
-
-    # Map args into dictionaries
-    arg_map = [{app_id: [] for app_id in {items[0] for items in group}} for group in [inputs, states]]
-    for group_idx, (groups, args) in enumerate([(inputs, a_in), (states, a_state)]):
-        # Assign the arg to the appropriate dictionary in arg_map
-        for arg_idx, (app_id, prop) in enumerate(groups):
-            arg_map[group_idx][app_id].append((prop, args[arg_idx]))
-        for app_id in arg_map[group_idx].keys():
-            arg_map[group_idx][app_id] = dict(arg_map[group_idx][app_id])
-    return arg_map
+    arg_maps = _ACTIVE_ARG_MAPS.get()
+    if arg_maps is not None and arg_maps[0] is inputs and arg_maps[1] is states:
+        tables = arg_maps[2]
+    else:
+        tables = compile_arg_map(_as_key(inputs), _as_key(states))
+    return [{app_id: {prop: raw_args[idx] for prop, idx in props} for app_id, props in table} for table in tables]
 
 
 def map_outputs(outputs, element_info):
@@ -93,14 +163,8 @@ def map_outputs(outputs, element_info):
     if len(outputs) != len(element_info):
         raise RuntimeError(f'Expected same number of items between:\noutputs:{outputs}\nelement_info:{element_info}')
 
-    # Create a dictionary of the elements
-    lookup = {app_id: [] for app_id in {info[0] for info in element_info}}
-    for app_id, prop, element in element_info:
-        lookup[app_id].append((prop, element))
-    for app_id in lookup:
-        lookup[app_id] = dict(lookup[app_id])
-
-    return [lookup[app_id][prop] for app_id, prop in outputs]
+    lookup = {(app_id, prop): element for app_id, prop, element in element_info}
+    return [lookup[app_id, prop] for app_id, prop in outputs]
 
 
 def get_triggered_id():
@@ -121,3 +185,326 @@ def get_triggered_id():
 
     prop_id = ctx.triggered[0]['prop_id']  # in format: `id.key` where we only want the `id`
     return re.search(r'(^.+)\.[^\.]+$', prop_id).group(1)
+
+
+# ==============================================================================
+# Callback Instrumentation
+
+
+CALLBACK_METRICS_ROUTE = '/_dash_charts/metrics'
+"""Flask route for the callback metrics registered by `register_metrics_endpoint`."""
+
+_ACTIVE_SECTIONS = ContextVar('dash_charts_active_sections', default=None)
+"""Section timing for the instrumented callback running in the current context."""
+
+_ACTIVE_PAYLOAD = ContextVar('dash_charts_active_payload', default=None)
+"""Dictionary where `limit_payload` stores the `size` of the outputs so that `instrument_callback` does not
+serialize them again."""
+
+
+class CallbackMetrics:
+    """Thread-safe in-process registry of callback timing and payload statistics."""
+
+    def __init__(self):
+        """Initialize the empty registry."""
+        self._lock = threading.Lock()
+        self._records = {}
+
+    def record(self, key, name, duration, payload_size=0, sections=None, profile_path=None):  # noqa: CFQ002
+        """Record one callback call.
+
+        Args:
+            key: unique callback key (the comma-separated outputs)
+            name: name of the callback function
+            duration: wall time in seconds
+            payload_size: size of the serialized outputs in bytes. Default is 0
+            sections: optional dictionary of time in seconds spent in each section (see `record_section`)
+            profile_path: optional path to the cProfile dump for this call
+
+        """
+        with self._lock:
+            rec = self._records.setdefault(key, {
+                'name': name, 'calls': 0, 'total_time': 0.0, 'max_time': 0.0, 'last_time': 0.0,
+                'last_payload_bytes': 0, 'max_payload_bytes': 0, 'sections': {}, 'last_profile': None,
+            })
+            rec['calls'] += 1
+            rec['total_time'] += duration
+            rec['max_time'] = max(rec['max_time'], duration)
+            rec['last_time'] = duration
+            rec['last_payload_bytes'] = payload_size
+            rec['max_payload_bytes'] = max(rec['max_payload_bytes'], payload_size)
+            for section, section_time in (sections or {}).items():
+                rec['sections'][section] = rec['sections'].get(section, 0.0) + section_time
+            if profile_path:
+                rec['last_profile'] = str(profile_path)
+
+    def summary(self):
+        """Return a copy of the statistics for each callback.
+
+        Returns:
+            dict: with the callback key and a dictionary of statistics that includes the `mean_time`
+
+        """
+        with self._lock:
+            return {
+                key: {**rec, 'sections': {**rec['sections']}, 'mean_time': rec['total_time'] / rec['calls']}
+                for key, rec in self._records.items()
+            }
+
+    def reset(self):
+        """Remove all recorded statistics."""
+        with self._lock:
+            self._records = {}
+
+
+CALLBACK_METRICS = CallbackMetrics()
+"""Default metrics registry shared by all apps in the process."""
+
+
+@contextmanager
+def record_section(section):
+    """Add the time spent in the block to the instrumented callback running in this context, if any.
+
+    Args:
+        section: name of the section (such as `create_figure`)
+
+    Yields:
+        None: the block runs unchanged
+
+    """
+    if _ACTIVE_SECTIONS.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_section_time(section, time.perf_counter() - start)
+
+
+def add_section_time(section, duration):
+    """Add a duration measured elsewhere (such as in a worker process) to the instrumented callback, if any.
+
+    Args:
+        section: name of the section
+        duration: time in seconds
+
+    """
+    sections = _ACTIVE_SECTIONS.get()
+    if sections is not None:
+        sections[section] = sections.get(section, 0.0) + duration
+
+
+def measure_payload(result):
+    """Return the size of the callback outputs serialized to JSON the same way as Dash.
+
+    Args:
+        result: value returned by the callback. `dash.no_update` values are not counted
+
+    Returns:
+        int: size in bytes
+
+    """
+    from plotly.io.json import to_json_plotly  # Deferred to keep the import of the app utilities light
+
+    outputs = result if isinstance(result, (list, tuple)) else [result]
+    return sum(
+        len(to_json_plotly(output).encode()) for output in outputs if not isinstance(output, type(dash.no_update))
+    )
+
+
+def instrument_callback(func, key, metrics, profile_threshold=None, profile_dir=None):
+    """Wrap the callback function to record its wall time, sections, and payload size.
+
+    Args:
+        func: callback function
+        key: unique callback key for the metrics
+        metrics: `CallbackMetrics` registry
+        profile_threshold: if not None, profile each call and dump the cProfile stats when the call takes longer than
+            this number of seconds. Default is None
+        profile_dir: directory for the cProfile dumps. Default is None for the current working directory
+
+    Returns:
+        function: wrapped callback
+
+    """
+    if profile_threshold is not None:
+        import cProfile  # Deferred because profiling is rarely enabled
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        sections = {}
+        payload = {}
+        token = _ACTIVE_SECTIONS.set(sections)
+        payload_token = _ACTIVE_PAYLOAD.set(payload)
+        profiler = None if profile_threshold is None else cProfile.Profile()
+        result = None
+        start = time.perf_counter()
+        try:
+            if profiler:
+                result = profiler.runcall(func, *args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+            return result
+        finally:
+            duration = time.perf_counter() - start
+            _ACTIVE_SECTIONS.reset(token)
+            _ACTIVE_PAYLOAD.reset(payload_token)
+            profile_path = None
+            if profiler and duration >= profile_threshold:
+                profile_path = Path(profile_dir or Path.cwd()) / f'{func.__name__}-{time.time_ns()}.prof'
+                profile_path.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(profile_path)
+            payload_size = payload.get('size')
+            if payload_size is None:
+                payload_size = 0 if result is None else measure_payload(result)
+            metrics.record(key, func.__name__, duration, payload_size, sections, profile_path)
+
+    return wrapper
+
+
+def register_metrics_endpoint(server, metrics, route=CALLBACK_METRICS_ROUTE):
+    """Serve the metrics summary as JSON from the Flask server. Only the first call for a server registers the route.
+
+    Args:
+        server: Flask server
+        metrics: `CallbackMetrics` registry
+        route: URL route. Default is `CALLBACK_METRICS_ROUTE`
+
+    """
+    import flask  # Deferred because the endpoint is only registered when callbacks are instrumented
+
+    endpoint = 'dash_charts_callback_metrics'
+    if endpoint not in server.view_functions:
+        server.add_url_rule(route, endpoint, lambda: flask.jsonify(metrics.summary()))
+
+
+# ======================================================================================================================
+# Payload Budget
+
+
+PAYLOAD_ACTIONS = ('warn', 'downsample')
+"""Supported actions when the serialized callback outputs exceed the payload budget."""
+
+_POINT_KEYS = ('x', 'y', 'text', 'hovertext', 'customdata', 'ids')
+"""Trace keys with one value per point that are decimated by `downsample_figure`."""
+
+DOWNSAMPLE_TRACE_TYPES = ('scatter', 'scattergl')
+"""Trace types decimated by `downsample_figure`. Other traces (heatmaps, bars, etc.) are not point-for-point and
+are returned unchanged."""
+
+_MAX_DOWNSAMPLE_ATTEMPTS = 6
+"""Maximum number of times `limit_payload` doubles the downsampling step before warning."""
+
+
+def _decimate_point_arrays(props, count_points, step):
+    """Return the per-point arrays of the trace or marker properties with every `step`-th point.
+
+    Args:
+        props: trace or marker object
+        count_points: number of points in the trace. Only arrays of this length are decimated
+        step: keep every `step`-th point
+
+    Returns:
+        dict: decimated arrays to apply with `props.update()`
+
+    """
+    updates = {}
+    for key in (*_POINT_KEYS, 'color', 'size'):
+        values = props[key] if key in props else None
+        if values is not None and not isinstance(values, str) and hasattr(values, '__len__'):
+            if len(values) == count_points:
+                updates[key] = values[::step]
+    return updates
+
+
+def downsample_figure(figure, step):
+    """Return a figure with every `step`-th point of each scatter trace. See `DOWNSAMPLE_TRACE_TYPES`.
+
+    Args:
+        figure: `go.Figure` or figure dictionary with keys `data` and `layout`
+        step: keep every `step`-th point. Traces are returned unchanged if less than 2
+
+    Returns:
+        go.Figure: new downsampled figure
+
+    """
+    fig = go.Figure(figure)
+    if step < 2:
+        return fig
+    for trace in fig.data:
+        if trace.type not in DOWNSAMPLE_TRACE_TYPES:
+            continue
+        lengths = [len(trace[key]) for key in ('x', 'y') if key in trace and hasattr(trace[key], '__len__')]
+        if not lengths:
+            continue
+        count_points = max(lengths)
+        marker = trace['marker'] if 'marker' in trace else None
+        if marker is not None:
+            marker.update(_decimate_point_arrays(marker, count_points, step))
+        trace.update(_decimate_point_arrays(trace, count_points, step))
+    return fig
+
+
+def _is_figure(output):
+    """Return True if the callback output is a figure.
+
+    Args:
+        output: single callback output
+
+    Returns:
+        bool: True for `go.Figure` or dictionaries with a `data` key
+
+    """
+    return isinstance(output, go.Figure) or (isinstance(output, dict) and 'data' in output)
+
+
+def limit_payload(func, key, budget, action='warn'):
+    """Wrap the callback function to check the size of the serialized outputs against a budget.
+
+    When wrapped by `instrument_callback`, the measured size is shared so that the outputs are only serialized once
+
+    Args:
+        func: callback function
+        key: unique callback key used in the warning
+        budget: maximum size of the serialized outputs in bytes
+        action: one of `PAYLOAD_ACTIONS`. `warn` raises a `ResourceWarning`. `downsample` decimates the scatter
+            traces of each figure output to fit the budget and only warns if the outputs still exceed the budget
+
+    Returns:
+        function: wrapped callback
+
+    Raises:
+        ValueError: if the action is not in `PAYLOAD_ACTIONS`
+
+    """
+    if action not in PAYLOAD_ACTIONS:
+        raise ValueError(f'Unknown payload action: {action}. Expected one of: {PAYLOAD_ACTIONS}')
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        payload_size = measure_payload(result)
+        if payload_size > budget and action == 'downsample':
+            is_single = not isinstance(result, (list, tuple))
+            outputs = [result] if is_single else list(result)
+            # Start from the proportional step and increase until the fixed overhead (layout, etc.) also fits
+            step = -(-payload_size // budget)  # ceiling division
+            for _idx in range(_MAX_DOWNSAMPLE_ATTEMPTS):
+                downsampled = [downsample_figure(output, step) if _is_figure(output) else output for output in outputs]
+                payload_size = measure_payload(downsampled)
+                if payload_size <= budget:
+                    break
+                step *= 2
+            result = downsampled[0] if is_single else downsampled
+        if payload_size > budget:
+            warnings.warn(
+                f'Callback outputs for "{key}" ({payload_size} bytes) exceed the payload budget of {budget} bytes',
+                ResourceWarning,
+            )
+        payload = _ACTIVE_PAYLOAD.get()
+        if payload is not None:
+            payload['size'] = payload_size
+        return result
+
+    return wrapper
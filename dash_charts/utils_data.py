@@ -9,7 +9,6 @@ from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-from cerberus import Validator
 
 # ----------------------------------------------------------------------------------------------------------------------
 # For Working with Data
@@ -63,6 +62,8 @@ def validate(document, schema, **validator_kwargs):
         list: validation errors
 
     """
+    from cerberus import Validator  # Deferred to keep chart imports light
+
     validator = Validator(schema, **validator_kwargs)
     validator.validate(document)
     return validator.errors
@@ -2,7 +2,6 @@
 
 from contextlib import ContextDecorator
 
-import dataset
 import pandas as pd
 
 from .utils_data import SQLConnection, uniq_table_id, write_csv
@@ -31,19 +30,26 @@ class DBConnect:  # noqa: H601
 
         """
         if self._db is None:
+            import dataset  # Deferred because dataset imports SQLAlchemy
+
             self._db = dataset.connect(f'sqlite:///{self.db_path}')
         return self._db
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, validate=False):
         """Store the database path and ensure the parent directory exists.
 
+        The connection is opened on first use of `self.db`, so an invalid database is only reported at that point
+        unless `validate` is True
+
         Args:
             db_path: Path to the SQLite file
+            validate: if True, open the connection immediately to raise any connection errors. Default is False
 
         """
         self.db_path = db_path.resolve()
         self.db_path.parent.mkdir(exist_ok=True)
-        self.db  # Check initial connection
+        if validate:
+            self.db.tables  # noqa: B018 (reading the table names opens the connection)
 
     def new_table(self, table_name):
         """Create a table. Drop a table if one existed before.
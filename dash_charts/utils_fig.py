@@ -1,9 +1,14 @@
 """Utilities for custom Dash figures."""
 
+import copy
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
 import plotly.graph_objects as go
 from dash import dcc
-from plotly.subplots import make_subplots
 
+from .utils_callbacks import record_section
 from .utils_data import validate
 
 FIGURE_PLACEHOLDER = {'data': [], 'layout': {}, 'frames': []}
@@ -84,6 +89,81 @@ def make_dict_an(coord, text, label=None, color=None, y_offset=10):
     }
 
 
+def _scatter_properties(trace):
+    """Return the properties of a scatter trace without the trace type.
+
+    Args:
+        trace: `go.Scatter` trace
+
+    Returns:
+        dict: trace properties
+
+    """
+    properties = trace.to_plotly_json()
+    properties.pop('type', None)
+    return properties
+
+
+def split_fill_band(trace):
+    """Split a `fill='toself'` band into a lower line and an upper `fill='tonexty'` line drawn with WebGL.
+
+    Only bands drawn as the upper values followed by the lower values in reverse (such as from
+    `scatter_line_charts.create_band_traces`) can be split
+
+    Args:
+        trace: `go.Scatter` trace with `fill='toself'`
+
+    Returns:
+        list: of two `go.Scattergl` traces or None if the trace is not a band
+
+    """
+    x_values = np.asarray(trace.x)
+    count = len(x_values) // 2
+    if len(x_values) % 2 or not np.array_equal(x_values[count:], x_values[:count][::-1]):
+        return None
+    y_values = np.asarray(trace.y, dtype=float)
+    properties = _scatter_properties(trace)
+    properties.pop('fill')
+    properties.setdefault('mode', 'lines')
+    properties['legendgroup'] = properties.get('legendgroup') or trace.name
+    return [
+        go.Scattergl({**properties, 'showlegend': False, 'x': x_values[:count], 'y': y_values[count:][::-1]}),
+        go.Scattergl({**properties, 'fill': 'tonexty', 'x': x_values[:count], 'y': y_values[:count]}),
+    ]
+
+
+def convert_to_webgl(traces, threshold):
+    """Replace SVG scatter traces that have more points than the threshold with `go.Scattergl`.
+
+    Bands with `fill='toself'` are split with `split_fill_band`. Traces that cannot be drawn with WebGL (other fill
+    types or properties that Scattergl does not support) are kept as `go.Scatter`
+
+    Args:
+        traces: list of plotly traces
+        threshold: maximum number of points for a `go.Scatter` trace. None to keep all traces unchanged
+
+    Returns:
+        list: of traces
+
+    """
+    if threshold is None:
+        return traces
+    converted = []
+    for trace in traces:
+        if not isinstance(trace, go.Scatter) or trace.x is None or len(trace.x) <= threshold:
+            converted.append(trace)
+        elif trace.fill == 'toself':
+            converted.extend(split_fill_band(trace) or [trace])
+        elif trace.fill not in {None, 'none'}:
+            converted.append(trace)
+        else:
+            try:
+                converted.append(go.Scattergl(_scatter_properties(trace)))
+            except ValueError:
+                converted.append(trace)
+    return converted
+
+
 class CustomChart:  # noqa: H601
     """Base Class for Custom Charts."""
 
@@ -94,6 +174,13 @@ class CustomChart:  # noqa: H601
 
     """
 
+    webgl_threshold = 10000
+    """Traces with more points are drawn with `go.Scattergl` (see `convert_to_webgl`). Default is 10,000.
+
+    Set to None to always draw `go.Scatter` traces as SVG
+
+    """
+
     _axis_range = {}
     _axis_range_schema = {
         'x': {
@@ -156,10 +243,13 @@ class CustomChart:  # noqa: H601
             dict: keys `data` and `layout` for Dash
 
         """
-        return {
-            'data': self.create_traces(df_raw, **kwargs_data),
-            'layout': go.Layout(self.apply_custom_layout(self.create_layout())),
-        }
+        with record_section('create_figure'):
+            with record_section('create_traces'):
+                traces = self.create_traces(df_raw, **kwargs_data)
+            return {
+                'data': convert_to_webgl(traces, self.webgl_threshold),
+                'layout': go.Layout(self.apply_custom_layout(self.create_layout())),
+            }
 
     def create_traces(self, df_raw, **kwargs_data):
         """Return traces for plotly chart.
@@ -228,9 +318,178 @@ class CustomChart:  # noqa: H601
         return layout
 
 
+def calculate_histogram(values, bins='auto'):
+    """Bin the finite values with `np.histogram`.
+
+    Args:
+        values: array of numbers. NaN and infinite values are ignored
+        bins: bins argument for `np.histogram`. Default is `'auto'`
+
+    Returns:
+        tuple: `(edges, counts)` arrays where `edges` has one more value than `counts`
+
+    """
+    values = np.asarray(values, dtype=float)
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+    return edges, counts
+
+
+def calculate_kde(values, count_points=200, bandwidth=None):
+    """Estimate the Gaussian kernel density of the finite values from a fine histogram.
+
+    The values are binned once, then the counts are convolved with the kernel, so the cost scales with the number of
+    values plus the number of points rather than their product
+
+    Args:
+        values: array of numbers. NaN and infinite values are ignored
+        count_points: number of evenly spaced points for the estimate. Default is 200
+        bandwidth: standard deviation of the kernel. Default is None for Scott's rule
+
+    Returns:
+        tuple: `(x_values, density)` arrays of length `count_points`
+
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) < 2 or np.ptp(values) == 0:
+        return np.array([]), np.array([])
+    if bandwidth is None:
+        bandwidth = np.std(values, ddof=1) * len(values) ** (-1 / 5)
+    x_values = np.linspace(np.min(values) - 3 * bandwidth, np.max(values) + 3 * bandwidth, count_points)
+    step = x_values[1] - x_values[0]
+    indices = np.clip(np.round((values - x_values[0]) / step).astype(int), 0, count_points - 1)
+    counts = np.bincount(indices, minlength=count_points)
+    kernel_offsets = np.arange(-count_points + 1, count_points) * step
+    kernel = np.exp(-0.5 * (kernel_offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel)[count_points - 1:2 * count_points - 1] / len(values)
+    return x_values, density
+
+
+def create_marginal_axes(main_fraction=0.8, spacing=0.02):
+    """Return the layout axes for a 2x2 grid with the main chart in the lower left and marginal charts on the sides.
+
+    Matches the axes from `make_subplots(rows=2, cols=2, shared_xaxes=True, shared_yaxes=True, ...)` where the main
+    chart uses `(x3, y3)`, the top marginal chart uses `(x, y)`, and the right marginal chart uses `(x4, y4)`
+
+    Args:
+        main_fraction: fraction of the width and height used by the main chart. Default is 0.8
+        spacing: space between the main and marginal charts. Default is 0.02
+
+    Returns:
+        dict: layout keys for each axis
+
+    """
+    main_end = round((1 - spacing) * main_fraction, 6)
+    main_domain = [0.0, main_end]
+    marg_domain = [round(main_end + spacing, 6), 1.0]
+    axes = {
+        'xaxis': {'anchor': 'y', 'domain': main_domain, 'matches': 'x3', 'showticklabels': False},
+        'yaxis': {'anchor': 'x', 'domain': marg_domain},
+        'xaxis2': {'anchor': 'y2', 'domain': marg_domain, 'matches': 'x4', 'showticklabels': False},
+        'yaxis2': {'anchor': 'x2', 'domain': marg_domain, 'matches': 'y', 'showticklabels': False},
+        'xaxis3': {'anchor': 'y3', 'domain': main_domain},
+        'yaxis3': {'anchor': 'x3', 'domain': main_domain},
+        'xaxis4': {'anchor': 'y4', 'domain': marg_domain},
+        'yaxis4': {'anchor': 'x4', 'domain': main_domain, 'matches': 'y3', 'showticklabels': False},
+    }
+    for axis in axes.values():
+        # Replace the default blue/white grid introduced in Plotly v4
+        axis.update({'gridcolor': 'white', 'showgrid': True})
+    return axes
+
+
 class MarginalChart(CustomChart):  # noqa: H601
     """Base Class for Custom Charts with Marginal X and Marginal Y Plots."""
 
+    marginal_bins = 'auto'
+    """Bins argument for `np.histogram` used by `create_marginal_histogram`. Default is `'auto'`."""
+
+    marginal_cache_size = 32
+    """Maximum number of cached marginal histograms and densities."""
+
+    _marginal_axes = create_marginal_axes()
+    _marginal_cache = None
+
+    def initialize_mutables(self):
+        """Initialize the mutable data members to prevent modifying one attribute and impacting all instances."""
+        super().initialize_mutables()
+        self._marginal_cache = OrderedDict()
+
+    def _cached_marginal(self, values, calculation, *args):
+        """Return the cached result of the calculation for the values.
+
+        Args:
+            values: array of numbers
+            calculation: function called with `(values, *args)` on a cache miss
+            args: additional hashable arguments for the calculation
+
+        Returns:
+            tuple: result of the calculation
+
+        """
+        values = np.ascontiguousarray(values, dtype=float)
+        cache_key = (hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest(), calculation.__name__, *args)
+        if cache_key in self._marginal_cache:
+            self._marginal_cache.move_to_end(cache_key)
+        else:
+            self._marginal_cache[cache_key] = calculation(values, *args)
+            while len(self._marginal_cache) > self.marginal_cache_size:
+                self._marginal_cache.popitem(last=False)
+        return self._marginal_cache[cache_key]
+
+    def create_marginal_histogram(self, values, orientation='v', **bar_kwargs):
+        """Return a histogram binned on the server as a `go.Bar` so only the bins are sent to the browser.
+
+        Args:
+            values: array of numbers
+            orientation: `v` for the top marginal chart or `h` for the right marginal chart. Default is `v`
+            bar_kwargs: additional keyword arguments for `go.Bar`
+
+        Returns:
+            list: with the `go.Bar` trace
+
+        """
+        bins = self.marginal_bins if np.ndim(self.marginal_bins) == 0 else tuple(self.marginal_bins)
+        edges, counts = self._cached_marginal(values, calculate_histogram, bins)
+        centers = (edges[:-1] + edges[1:]) / 2
+        position, size = ('x', 'y') if orientation == 'v' else ('y', 'x')
+        return [
+            go.Bar(**{
+                'orientation': orientation,
+                'showlegend': False,
+                'width': np.diff(edges),
+                position: centers,
+                size: counts,
+                **bar_kwargs,
+            }),
+        ]
+
+    def create_marginal_kde(self, values, orientation='v', count_points=200, **scatter_kwargs):
+        """Return a kernel density estimate calculated on the server as a line.
+
+        Args:
+            values: array of numbers
+            orientation: `v` for the top marginal chart or `h` for the right marginal chart. Default is `v`
+            count_points: number of points in the estimate. Default is 200
+            scatter_kwargs: additional keyword arguments for `go.Scatter`
+
+        Returns:
+            list: with the `go.Scatter` trace
+
+        """
+        x_values, density = self._cached_marginal(values, calculate_kde, count_points)
+        position, size = ('x', 'y') if orientation == 'v' else ('y', 'x')
+        return [
+            go.Scatter(**{
+                'fill': 'tozeroy' if orientation == 'v' else 'tozerox',
+                'mode': 'lines',
+                'showlegend': False,
+                position: x_values,
+                size: density,
+                **scatter_kwargs,
+            }),
+        ]
+
     def create_figure(self, df_raw, **kwargs_data):
         """Create the figure dictionary.
 
@@ -242,30 +501,29 @@ class MarginalChart(CustomChart):  # noqa: H601
             dict: Dash figure object
 
         """
-        # Initialize figure with subplots
-        fig = make_subplots(
-            rows=2, cols=2,
-            shared_xaxes=True, shared_yaxes=True,
-            vertical_spacing=0.02, horizontal_spacing=0.02,
-            row_width=[0.8, 0.2], column_width=[0.8, 0.2],
-        )
-        # Populate the traces of each subplot
-        traces = [
-            (self.create_traces, 2, 1),
-            (self.create_marg_top, 1, 1),
-            (self.create_marg_right, 2, 2),
-        ]
-        for trace_func, row, col in traces:
-            for trace in trace_func(df_raw, **kwargs_data):
-                fig.add_trace(trace, row, col)
-        # Apply axis labels
-        fig.update_xaxes(title_text=self.labels['x'], row=2, col=1)
-        fig.update_yaxes(title_text=self.labels['y'], row=2, col=1)
-        # Replace the default blue/white grid introduced in Plotly v4
-        fig.update_xaxes(showgrid=True, gridcolor='white')
-        fig.update_yaxes(showgrid=True, gridcolor='white')
-        fig['layout'].update(self.apply_custom_layout(self.create_layout()))
-        return fig
+        with record_section('create_figure'):
+            # Assign each trace to the axes of its subplot
+            traces = [
+                (self.create_traces, 'x3', 'y3'),
+                (self.create_marg_top, 'x', 'y'),
+                (self.create_marg_right, 'x4', 'y4'),
+            ]
+            data = []
+            for trace_func, xaxis, yaxis in traces:
+                with record_section('create_traces'):
+                    subplot_traces = trace_func(df_raw, **kwargs_data)
+                for trace in convert_to_webgl(subplot_traces, self.webgl_threshold):
+                    trace.update(xaxis=xaxis, yaxis=yaxis)
+                    data.append(trace)
+
+            # Merge the custom layout into the precomputed axes and apply axis labels to the main chart
+            layout = self.apply_custom_layout(self.create_layout())
+            axes = copy.deepcopy(self._marginal_axes)
+            axes['xaxis3']['title'] = {'text': self.labels['x']}
+            axes['yaxis3']['title'] = {'text': self.labels['y']}
+            for key, axis in axes.items():
+                layout[key] = {**axis, **layout.get(key, {})}
+            return go.Figure(data=data, layout=layout)
 
     def create_traces(self, df_raw, **kwargs_data):
         """Return traces for the main plotly chart.
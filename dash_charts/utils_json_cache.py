@@ -5,10 +5,14 @@ Full dataset documentation: https://dataset.readthedocs.io/en/latest/api.html
 """
 
 import json
+import os
+import sqlite3
+import tempfile
 import time
+from contextlib import contextmanager
 from pathlib import Path
 
-from .utils_data import uniq_table_id, write_pretty_json
+from .utils_data import uniq_table_id
 from .utils_dataset import DBConnect
 
 #  FIXME: Add versioning to the cache directory with semver logic: https://pypi.org/project/semantic-version/
@@ -33,6 +37,91 @@ FILENAME_KEY = 'filename'
 DATA_VERSION_KEY = 'data_version'
 """Key to indicate the data version."""
 
+LOCK_TIMEOUT = 30.0
+"""Seconds to wait for another process to release the write lock on the cache database."""
+
+
+def _ensure_cache_schema(conn):
+    """Create the cache table and the unique identifier index if either are missing.
+
+    Tables created by earlier versions with `dataset` may be missing columns or contain duplicate identifiers, so
+    any missing columns are added and only the first row for each identifier is kept before creating the index. The
+    files of the removed rows are deleted unless they are also referenced by a kept row
+
+    Args:
+        conn: sqlite3 connection with an open transaction
+
+    """
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS {CACHE_TABLE_NAME} '
+        f'(id INTEGER PRIMARY KEY, {ID_KEY} TEXT, {FILENAME_KEY} TEXT, {TS_KEY} FLOAT)',
+    )
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info({CACHE_TABLE_NAME})')}
+    for column, col_type in [(ID_KEY, 'TEXT'), (FILENAME_KEY, 'TEXT'), (TS_KEY, 'FLOAT')]:
+        if column not in columns:
+            conn.execute(f'ALTER TABLE {CACHE_TABLE_NAME} ADD COLUMN {column} {col_type}')
+
+    index_name = f'uq_{CACHE_TABLE_NAME}_{ID_KEY}'
+    query = "SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?"
+    if conn.execute(query, (index_name,)).fetchone() is None:
+        duplicates = f'id NOT IN (SELECT MIN(id) FROM {CACHE_TABLE_NAME} GROUP BY {ID_KEY})'
+        query = f'SELECT {FILENAME_KEY}, {duplicates} FROM {CACHE_TABLE_NAME}'  # noqa: S608
+        rows = conn.execute(query).fetchall()
+        kept_files = {filename for filename, is_duplicate in rows if not is_duplicate}
+        orphaned_files = {filename for filename, is_duplicate in rows if is_duplicate} - kept_files
+        conn.execute(f'DELETE FROM {CACHE_TABLE_NAME} WHERE {duplicates}')  # noqa: S608
+        conn.execute(f'CREATE UNIQUE INDEX {index_name} ON {CACHE_TABLE_NAME} ({ID_KEY})')
+        for filename in orphaned_files:
+            if filename:
+                Path(filename).unlink(missing_ok=True)
+
+
+@contextmanager
+def cache_write_lock(db_instance):
+    """Open a `BEGIN IMMEDIATE` transaction to serialize cache writes across processes (i.e. gunicorn workers).
+
+    SQLite only allows one `IMMEDIATE` transaction at a time, so the database itself acts as the file lock. Other
+    processes block for up to `LOCK_TIMEOUT` seconds. The transaction is committed on exit or rolled back on error
+
+    Args:
+        db_instance: Connected Database file with `DBConnect()`.
+
+    Yields:
+        connection: sqlite3 connection for the open transaction
+
+    """
+    conn = sqlite3.connect(db_instance.db_path, timeout=LOCK_TIMEOUT, isolation_level=None)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+
+def write_json_atomic(filename, obj):
+    """Write indented JSON to a temporary file, then rename so that readers never see a partial file.
+
+    Args:
+        filename: Path to the destination file
+        obj: JSON object to write
+
+    """
+    filename = Path(filename)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, tmp_name = tempfile.mkstemp(dir=filename.parent, prefix=f'.{filename.stem}_', suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'w') as tmp_file:
+            tmp_file.write(json.dumps(obj, indent=4, separators=(',', ': ')))
+        os.replace(tmp_name, filename)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
 
 def get_files_table(db_instance):
     """Retrieve stored object from cache database.
@@ -50,10 +139,15 @@ def get_files_table(db_instance):
 def initialize_cache(db_instance):
     """Ensure that the directory and database exist. Remove files from database if manually removed.
 
+    Must be called before writing to the cache, which relies on the unique identifier index
+
     Args:
         db_instance: Connected Database file with `DBConnect()`.
 
     """
+    with cache_write_lock(db_instance) as conn:
+        # Create the table and unique identifier index once, before `dataset` loads the table
+        _ensure_cache_schema(conn)
     table = db_instance.db.create_table(CACHE_TABLE_NAME)
 
     removed_files = []
@@ -97,6 +191,8 @@ def match_identifier_in_cache(identifier, db_instance):
 def store_cache_as_file(prefix, identifier, db_instance, cache_dir=CACHE_DIR, suffix='.json'):
     """Store the reference in the cache database and return the file so the user can handle saving the file.
 
+    The check and insert are made in a single locked transaction, so only one process can reserve an identifier
+
     Args:
         prefix: string used to create more recognizable filenames
         identifier: identifier to use as a reference if the corresponding data is already cached
@@ -111,20 +207,28 @@ def store_cache_as_file(prefix, identifier, db_instance, cache_dir=CACHE_DIR, su
         RuntimeError: if duplicate match found when storing
 
     """
-    # Check that the identifier isn't already in the database
-    matches = match_identifier_in_cache(identifier, db_instance)
-    if matches:
-        raise RuntimeError(f'Already have an entry for this identifier (`{identifier}`): {matches}')
-    # Update the database and store the file
     filename = cache_dir / f'{prefix}_{uniq_table_id()}{suffix}'
-    new_row = {FILENAME_KEY: str(filename), ID_KEY: identifier, TS_KEY: time.time()}
-    get_files_table(db_instance).insert(new_row)
+    with cache_write_lock(db_instance) as conn:
+        # Check that the identifier isn't already in the database
+        query = f'SELECT {FILENAME_KEY} FROM {CACHE_TABLE_NAME} WHERE {ID_KEY} = ?'  # noqa: S608
+        matches = conn.execute(query, (identifier,)).fetchall()
+        if matches:
+            raise RuntimeError(f'Already have an entry for this identifier (`{identifier}`): {matches}')
+        # Update the database and return the file
+        conn.execute(
+            f'INSERT INTO {CACHE_TABLE_NAME} ({FILENAME_KEY}, {ID_KEY}, {TS_KEY}) VALUES (?, ?, ?)',  # noqa: S608
+            (str(filename), identifier, time.time()),
+        )
     return filename
 
 
 def store_cache_object(prefix, identifier, obj, db_instance, cache_dir=CACHE_DIR):
     """Store the object as a JSON file and track in a SQLite database to prevent duplicates.
 
+    Safe to call from multiple processes with the same identifier. Writes are serialized with `cache_write_lock` and
+    an existing entry is updated in place (upsert), so the last writer wins. Files are written atomically, so
+    concurrent readers see either the previous or the new file contents
+
     Args:
         prefix: string used to create more recognizable filenames
         identifier: identifier to use as a reference if the corresponding data is already cached
@@ -132,17 +236,18 @@ def store_cache_object(prefix, identifier, obj, db_instance, cache_dir=CACHE_DIR
         db_instance: Connected Database file with `DBConnect()`.
         cache_dir: path to the directory to store the file. Default is `CACHE_DIR
 
-    Raises:
-        Exception: if duplicate match found when storing
-
     """
-    filename = store_cache_as_file(prefix, identifier, db_instance, cache_dir)
-    try:
-        write_pretty_json(filename, obj)
-    except Exception:
-        # If writing the file fails, ensure that the record is removed from the database
-        get_files_table(db_instance).delete(filename=filename)
-        raise
+    with cache_write_lock(db_instance) as conn:
+        query = f'SELECT {FILENAME_KEY} FROM {CACHE_TABLE_NAME} WHERE {ID_KEY} = ?'  # noqa: S608
+        match = conn.execute(query, (identifier,)).fetchone()
+        filename = Path(match[0]) if match else cache_dir / f'{prefix}_{uniq_table_id()}.json'
+        # If writing the file fails, the transaction is rolled back so that no record is added to the database
+        write_json_atomic(filename, obj)
+        conn.execute(
+            f'INSERT INTO {CACHE_TABLE_NAME} ({FILENAME_KEY}, {ID_KEY}, {TS_KEY}) VALUES (?, ?, ?) '  # noqa: S608
+            f'ON CONFLICT({ID_KEY}) DO UPDATE SET {TS_KEY} = excluded.{TS_KEY}',
+            (str(filename), identifier, time.time()),
+        )
 
 
 def retrieve_cache_fn(identifier, db_instance):
@@ -5,10 +5,8 @@ from base64 import b64encode
 
 import dash_bootstrap_components as dbc
 import dominate
-import markdown
 import pandas as pd
 import plotly.io
-from bs4 import BeautifulSoup
 from dominate import tags, util
 
 
@@ -101,6 +99,8 @@ def capture_plotly_body():
         tuple: of the top and the bottom HTML content
 
     """
+    from bs4 import BeautifulSoup  # Deferred with lxml until HTML is parsed
+
     # Capture necessary Plotly boilerplate HTML
     with io.StringIO() as output:
         write_div({}, output, is_div=False, include_mathjax='.js', validate=False)
@@ -194,6 +194,8 @@ def tag_markdown(text, **markdown_kwargs):
         markdown_kwargs: additional keyword arguments for `markdown.markdown`, such as `extensions`
 
     """
+    import markdown  # Deferred until markdown is rendered
+
     util.raw(markdown.markdown(text, **markdown_kwargs))
 
 
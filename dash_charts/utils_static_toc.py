@@ -1,6 +1,5 @@
 """Add a nested Table of Contents to any HTML file with BeautifulSoup and dominate."""
 
-from bs4 import BeautifulSoup
 from dominate import tags
 
 TOC_KEYWORD = '{{toc}}'
@@ -34,6 +33,8 @@ def create_toc(html_text, header_depth=3):
         string: table of contents
 
     """
+    from bs4 import BeautifulSoup  # Deferred with lxml until HTML is parsed
+
     soup = BeautifulSoup(html_text, features='lxml')
     h_lookup = {f'h{idx}': idx for idx in range(1, header_depth + 1)}
     toc = tags.div()
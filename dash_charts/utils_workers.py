@@ -0,0 +1,323 @@
+"""Process pools for building figures and fitting data outside of the web server worker.
+
+Callbacks close over the application instance, which cannot be sent to another process, so the unit of work is a
+chart's `create_figure()`. The chart is pickled (charts only store settings) and the DataFrame is passed through
+shared memory, so a slow figure only blocks the web server worker while it waits for the result.
+
+Each pool belongs to one server process. With a multi-process server, such as gunicorn with several workers, every
+worker starts its own pool, so the real bound is `gunicorn workers x max_workers` processes. Size `max_workers`
+accordingly (often 1 or 2 per server worker).
+
+```py
+FIGURE_POOL = FigureWorkerPool(max_workers=4)
+
+class App(AppBase):
+    figure_pool = FIGURE_POOL
+
+    def create_callbacks(self):
+        @self.callback(outputs, inputs, states)
+        def update_chart(*raw_args):
+            return [self.create_figure(self.chart_main, self.data_raw)]
+```
+
+"""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from .utils_callbacks import add_section_time
+
+SHARED_DTYPE_KINDS = 'biufcmM'
+"""NumPy dtype kinds for columns passed through shared memory. Other columns (strings, objects, etc.) are pickled."""
+
+_ALIGNMENT = 8
+"""Byte alignment of each column in the shared memory block."""
+
+
+class SharedFrame:  # noqa: H601
+    """Picklable handle to a DataFrame with the numeric and datetime columns copied to one shared memory block."""
+
+    def __init__(self, df_raw):
+        """Copy the numeric columns of the DataFrame to a new shared memory block.
+
+        Args:
+            df_raw: pandas dataframe
+
+        """
+        self.columns = list(df_raw.columns)
+        self.index = df_raw.index
+        self.shared = []  # Tuples of `(position, dtype, offset, length)` for the columns in shared memory
+        self.pickled = {}  # Column position and values for the columns that are pickled
+
+        arrays = {}
+        size = 0
+        for position in range(len(self.columns)):
+            column = df_raw.iloc[:, position]
+            if isinstance(column.dtype, np.dtype) and column.dtype.kind in SHARED_DTYPE_KINDS:
+                arrays[position] = np.ascontiguousarray(column.to_numpy())
+                self.shared.append((position, arrays[position].dtype.str, size, len(column)))
+                size += -(-arrays[position].nbytes // _ALIGNMENT) * _ALIGNMENT
+            else:
+                self.pickled[position] = column.to_numpy()
+
+        self._shm = SharedMemory(create=True, size=max(size, 1))
+        self.name = self._shm.name
+        for position, dtype, offset, length in self.shared:
+            np.ndarray(length, dtype=dtype, buffer=self._shm.buf, offset=offset)[:] = arrays[position]
+
+    def __getstate__(self):
+        """Return the state to pickle without the parent's shared memory object.
+
+        Returns:
+            dict: picklable state
+
+        """
+        return {key: value for key, value in self.__dict__.items() if key != '_shm'}
+
+    def to_dataframe(self):
+        """Return a copy of the DataFrame. Called in the worker process.
+
+        Returns:
+            pd.DataFrame: copy of the original dataframe
+
+        """
+        shm = SharedMemory(name=self.name)
+        try:
+            data = {
+                position: np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset).copy()
+                for position, dtype, offset, length in self.shared
+            }
+        finally:
+            shm.close()
+        data.update(self.pickled)
+        df_raw = pd.DataFrame({position: data[position] for position in range(len(self.columns))}, index=self.index)
+        df_raw.columns = self.columns
+        return df_raw
+
+    def unlink(self):
+        """Release the shared memory block. Called in the parent process when the figure is complete."""
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _create_figure_job(chart, shared_frame, submitted, kwargs):
+    """Build the figure in the worker process.
+
+    Args:
+        chart: `CustomChart` instance
+        shared_frame: `SharedFrame` handle to the data
+        submitted: `time.time()` when the figure was requested
+        kwargs: keyword arguments for `chart.create_figure()`
+
+    Returns:
+        tuple: figure dictionary, queue time, and run time in seconds
+
+    """
+    started = time.time()
+    figure = chart.create_figure(shared_frame.to_dataframe(), **kwargs)
+    return go.Figure(figure).to_dict(), started - submitted, time.time() - started
+
+
+class WorkerPool:  # noqa: H601
+    """Process pool with a fixed number of workers that are started on first use and can be shut down."""
+
+    def __init__(self, max_workers=2):
+        """Configure the pool. Worker processes are started on first use.
+
+        Args:
+            max_workers: number of worker processes. Default is 2
+
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """Return the process pool. Will create the pool if one does not exist already.
+
+        Returns:
+            ProcessPoolExecutor: pool instance
+
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def discard_executor(self, executor):
+        """Drop the process pool after a worker process died so that a new pool is created on next use.
+
+        Args:
+            executor: the broken `ProcessPoolExecutor`. Ignored if the pool was already replaced
+
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def map(self, func, iterable, chunksize=None):  # noqa: A003
+        """Return the results of `func` for each item of the iterable, calculated in the worker processes.
+
+        Args:
+            func: picklable function called with each item
+            iterable: picklable items
+            chunksize: number of items sent to a worker at a time. Default is None to split the items into about four
+                chunks per worker
+
+        Returns:
+            list: results in the order of the items
+
+        Raises:
+            RuntimeError: if a worker process died. The pool is restarted on next use
+
+        """
+        items = list(iterable)
+        chunksize = chunksize or max(len(items) // (4 * self.max_workers), 1)
+        executor = self.executor
+        try:
+            return list(executor.map(func, items, chunksize=chunksize))
+        except BrokenProcessPool as err:
+            self.discard_executor(executor)
+            raise RuntimeError('A worker process terminated abruptly. The pool will be restarted') from err
+
+    def shutdown(self):
+        """Stop the worker processes. The pool restarts on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+class FigureWorkerPool(WorkerPool):  # noqa: H601
+    """Bounded process pool that builds chart figures and records queue and run time metrics."""
+
+    def __init__(self, max_workers=2, max_pending=None, queue_timeout=None, result_timeout=60):
+        """Configure the pool. Worker processes are started on first use.
+
+        Args:
+            max_workers: number of worker processes. Default is 2
+            max_pending: maximum number of figures running or queued. Further requests wait for a free slot. Default
+                is None for twice `max_workers`
+            queue_timeout: seconds to wait for a free slot before raising a `RuntimeError`. Default is None to wait
+            result_timeout: seconds to wait for a submitted figure before raising a `RuntimeError`. Default is 60.
+                Set to None to wait indefinitely
+
+        """
+        super().__init__(max_workers=max_workers)
+        self.max_pending = max_pending or 2 * max_workers
+        self.queue_timeout = queue_timeout
+        self.result_timeout = result_timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._stats = {'calls': 0, 'errors': 0, 'total_queue_time': 0.0, 'max_queue_time': 0.0,
+                       'total_run_time': 0.0, 'max_run_time': 0.0}
+
+    def create_figure(self, chart, df_raw, **kwargs):
+        """Return the figure from `chart.create_figure(df_raw, **kwargs)` built in a worker process.
+
+        Changes the chart makes to itself in the worker (such as caches) are not returned
+
+        Args:
+            chart: picklable `CustomChart` instance
+            df_raw: pandas dataframe passed through shared memory
+            kwargs: keyword arguments for `chart.create_figure()`
+
+        Returns:
+            dict: figure dictionary
+
+        Raises:
+            RuntimeError: if no slot is free within `queue_timeout`, the figure is not complete within
+                `result_timeout`, or a worker process died (the pool is restarted on next use). A figure that is
+                already running when `result_timeout` expires keeps its slot and shared memory until it finishes
+
+        """
+        submitted = time.time()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise RuntimeError(f'No free figure worker within {self.queue_timeout}s ({self.max_pending} pending)')
+        with self._lock:
+            self._pending += 1
+        shared_frame = None
+        executor = None
+        is_running = False
+        try:
+            shared_frame = SharedFrame(df_raw)
+            executor = self.executor
+            future = executor.submit(_create_figure_job, chart, shared_frame, submitted, kwargs)
+            figure, queue_time, run_time = future.result(timeout=self.result_timeout)
+        except Exception as err:
+            with self._lock:
+                self._stats['errors'] += 1
+            if isinstance(err, FutureTimeoutError):
+                # A running job cannot be cancelled, so the slot and shared memory are released when it finishes
+                is_running = not future.cancel()
+                if is_running:
+                    future.add_done_callback(lambda _future: self._release(shared_frame))
+                raise RuntimeError(f'Figure was not complete within {self.result_timeout}s') from err
+            if isinstance(err, BrokenProcessPool):
+                self.discard_executor(executor)
+                raise RuntimeError('A figure worker process terminated abruptly. The pool will be restarted') from err
+            raise
+        finally:
+            if not is_running:
+                self._release(shared_frame)
+
+        self._record(queue_time, run_time)
+        return figure
+
+    def _release(self, shared_frame):
+        """Unlink the shared memory of a figure and free its slot.
+
+        Args:
+            shared_frame: `SharedFrame` passed to the worker or None if it was not created
+
+        """
+        if shared_frame is not None:
+            shared_frame.unlink()
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _record(self, queue_time, run_time):
+        """Record the time for one figure in the pool and the instrumented callback, if any.
+
+        Args:
+            queue_time: seconds from the request until the worker started
+            run_time: seconds spent in the worker
+
+        """
+        add_section_time('figure_queue', queue_time)
+        add_section_time('figure_worker', run_time)
+        with self._lock:
+            self._stats['calls'] += 1
+            self._stats['total_queue_time'] += queue_time
+            self._stats['max_queue_time'] = max(self._stats['max_queue_time'], queue_time)
+            self._stats['total_run_time'] += run_time
+            self._stats['max_run_time'] = max(self._stats['max_run_time'], run_time)
+
+    def summary(self):
+        """Return the pool statistics.
+
+        Returns:
+            dict: call and error counts, pending figures, and the total, max, and mean queue and run times
+
+        """
+        with self._lock:
+            calls = max(self._stats['calls'], 1)
+            return {
+                **self._stats,
+                'pending': self._pending,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'mean_queue_time': self._stats['total_queue_time'] / calls,
+                'mean_run_time': self._stats['total_run_time'] / calls,
+            }
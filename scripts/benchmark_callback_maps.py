@@ -0,0 +1,45 @@
+"""Microbenchmark `map_args` and `map_outputs` with and without the tables compiled at callback registration.
+
+Run with: `poetry run python scripts/benchmark_callback_maps.py`
+
+"""
+
+import timeit
+
+from dash_charts.utils_callbacks import bind_callback_maps, map_args, map_outputs
+
+COUNT = 100_000
+"""Number of calls for each benchmark."""
+
+inputs = [('interval', 'n_intervals'), ('slider', 'value'), ('dropdown', 'value'), ('dropdown', 'options')]
+states = [('store', 'data'), ('table', 'data'), ('table', 'columns')]
+outputs = [('chart', 'figure'), ('table', 'data'), ('table', 'columns'), ('store', 'data')]
+raw_args = list(range(len(inputs) + len(states)))
+element_info = [('store', 'data', 1), ('chart', 'figure', 2), ('table', 'columns', 3), ('table', 'data', 4)]
+
+
+def callback():
+    """Map the arguments and outputs like a typical callback.
+
+    Returns:
+        list: ordered outputs
+
+    """
+    map_args(raw_args, inputs, states)
+    return map_outputs(outputs, element_info)
+
+
+def run_benchmark(label, func):
+    """Print the time per call of the callback.
+
+    Args:
+        label: description of the benchmark
+        func: callback to time
+
+    """
+    duration = timeit.timeit(func, number=COUNT)
+    print(f'{label:>12} {duration / COUNT * 1e6:.2f} µs/call')  # noqa: T001
+
+
+run_benchmark('unregistered', callback)
+run_benchmark('registered', bind_callback_maps(callback, inputs, states))
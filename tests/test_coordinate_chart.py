@@ -0,0 +1,138 @@
+"""Test coordinate_chart."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_charts import coordinate_chart
+
+
+def test_calculate_grid():
+    """Test the grid coordinates for each tile and corner."""
+    grid = coordinate_chart.CircleGrid(grid_dims=(3, 2))
+    width, height = 2.0, 2.0
+    expected = {'x': [], 'y': []}
+    for r_idx in range(3):
+        for c_idx in range(2):
+            expected['x'].extend([width * c_idx + _x for _x in grid.corners['x']])
+            expected['y'].extend([height * (3 - r_idx) - _y for _y in grid.corners['y']])
+
+    result = coordinate_chart.calculate_grid(grid.grid_dims, grid.corners, width, height)  # act
+
+    assert np.allclose(result['x'], expected['x'])
+    assert np.allclose(result['y'], expected['y'])
+    assert result is coordinate_chart.calculate_grid(grid.grid_dims, grid.corners, width, height)
+    assert not result['x'].flags.writeable
+
+
+def test_align_grid_values():
+    """Test that missing values and trailing cells are masked."""
+    result = coordinate_chart.align_grid_values(pd.Series([1, None, 3], dtype=object).to_numpy(), 5)  # act
+
+    assert np.ma.getmaskarray(result).tolist() == [False, True, False, True, True]
+    assert result.compressed().tolist() == [1, 3]
+
+
+def test_coordinate_chart_large_grid():
+    """Test that only cells with values are plotted for a large grid."""
+    grid = coordinate_chart.YearGrid()
+    chart = coordinate_chart.CoordinateChart(title='', grid_dims=(50, 50), corners=grid.corners)
+    count_cells = 50 * 50 * len(grid.corners['x'])
+    values = np.arange(count_cells - 10, dtype=float)
+    values[::2] = np.nan
+
+    result = chart.create_traces(pd.DataFrame({'values': values}))  # act
+
+    assert len(result[-1].x) == len(result[-1].marker.color) == (count_cells - 10) // 2
+    assert np.all(result[-1].marker.color % 2 == 1)
+
+
+def test_calculate_border_path():
+    """Test that the single border path contains each border line separated by None."""
+    grid_dims, width, height = (4, 3), 2.5, 1.5
+    borders = coordinate_chart.calculate_border(grid_dims, width, height)
+
+    result = coordinate_chart.calculate_border_path(grid_dims, width, height)  # act
+
+    for axis in ['x', 'y']:
+        assert result[axis][2::3] == [None] * len(borders)
+        assert np.allclose(result[axis][0::3], [border[axis][0] for border in borders])
+        assert np.allclose(result[axis][1::3], [border[axis][1] for border in borders])
+
+
+def test_coordinate_chart_single_trace_mode():
+    """Test that borders and titles are merged into single traces."""
+    grid = coordinate_chart.CircleGrid(grid_dims=(5, 4))
+    chart = coordinate_chart.CoordinateChart(
+        title='', grid_dims=grid.grid_dims, corners=grid.corners, titles=grid.titles,
+    )
+    chart.annotations.append({'text': 'extra'})
+    chart.single_trace_mode = True
+    df_raw = pd.DataFrame({'values': np.arange(20 * len(grid.corners['x']))})
+
+    result = chart.create_figure(df_raw)  # act
+
+    assert [trace.mode for trace in result['data']] == ['lines', 'markers', 'text']
+    assert list(result['data'][2].text) == grid.titles
+    assert [annotation.text for annotation in result['layout'].annotations] == ['extra']
+
+
+def test_year_grid_format_series():
+    """Test that a multi-year daily series is aligned the same as the month lists for each year."""
+    grid = coordinate_chart.YearGrid()
+    dates = pd.date_range('2016-03-15', '2021-02-10', freq='D')
+    daily_values = pd.Series(np.arange(len(dates), dtype=float), index=dates)
+
+    result = grid.format_series(daily_values)  # act
+
+    assert list(result) == [2016, 2017, 2018, 2019, 2020, 2021]
+    for year, df_year in result.items():
+        month_starts = [pd.Timestamp(year, month, 1) for month in range(1, 13)]
+        month_lists = [
+            daily_values.reindex(pd.date_range(start, start + pd.offsets.MonthEnd(0))).to_numpy()
+            for start in month_starts
+        ]
+        expected = pd.Series(grid.format_data(month_lists, year), dtype=float)
+        assert np.allclose(df_year['values'], expected, equal_nan=True)
+
+
+def test_year_grid_create_figures():
+    """Test that one figure is created for each year."""
+    grid = coordinate_chart.YearGrid()
+    dates = pd.date_range('2019-01-01', '2020-12-31', freq='D')
+
+    result = grid.create_figures(pd.Series(1.0, index=dates), title_format='Year {year}')  # act
+
+    assert {year: figure['layout'].title.text for year, figure in result.items()} == {
+        2019: 'Year 2019', 2020: 'Year 2020',
+    }
+    assert [len(figure['data'][-1].x) for figure in result.values()] == [365, 366]
+
+
+@pytest.mark.parametrize(
+    ('grid', 'render_backend', 'trace_type'),
+    [
+        (coordinate_chart.YearGrid(), 'scatter', 'scatter'),
+        (coordinate_chart.YearGrid(), 'scattergl', 'scattergl'),
+        (coordinate_chart.YearGrid(), 'heatmap', 'heatmap'),
+        (coordinate_chart.MonthGrid(), 'heatmap', 'heatmap'),
+        (coordinate_chart.CircleGrid(grid_dims=(3, 3)), 'heatmap', 'scattergl'),
+    ],
+)
+def test_coordinate_chart_render_backend(grid, render_backend, trace_type):
+    """Test that each backend renders the same visible cells."""
+    chart = coordinate_chart.CoordinateChart(title='', grid_dims=grid.grid_dims, corners=grid.corners)
+    chart.render_backend = render_backend
+    count_cells = np.multiply(*grid.grid_dims) * len(grid.corners['x'])
+    values = np.arange(count_cells, dtype=float)
+    values[::3] = np.nan
+
+    result = chart.create_traces(pd.DataFrame({'values': values}))[-1]  # act
+
+    assert result.type == trace_type
+    if trace_type == 'heatmap':
+        z_values = np.array(result.z, dtype=float)
+        assert np.nansum(z_values) == np.nansum(values)
+        assert np.count_nonzero(~np.isnan(z_values)) == np.count_nonzero(~np.isnan(values))
+    else:
+        assert len(result.x) == np.count_nonzero(~np.isnan(values))
@@ -3,6 +3,7 @@
 import math
 
 import numpy as np
+import pytest
 
 from dash_charts import equations
 
@@ -80,3 +81,47 @@ def test_double_exponential():
 
     assert np.allclose(y_values, y_expected)
     assert y_single == y_expected_single
+
+
+@pytest.mark.parametrize(
+    ('equation', 'factors'),
+    [
+        (equations.linear, (0.5, 100)),
+        (equations.quadratic, (0.4, 2.1, 30)),
+        (equations.power, (5, 1.5)),
+        (equations.exponential, (5, 0.3)),
+        (equations.double_exponential, (2, 0.5, 0.5, 0.1)),
+    ],
+)
+def test_jacobian(equation, factors):
+    """Test that each analytic jacobian matches a finite difference approximation."""
+    x_values = np.linspace(0.5, 5, 10)
+    step = 1e-6
+    expected = np.column_stack([
+        (
+            equation(x_values, *np.add(factors, np.eye(len(factors))[idx] * step))
+            - equation(x_values, *np.subtract(factors, np.eye(len(factors))[idx] * step))
+        ) / (2 * step)
+        for idx in range(len(factors))
+    ])
+
+    result = equation.jacobian(x_values, *factors)
+
+    assert result.shape == (len(x_values), len(factors))
+    assert np.allclose(result, expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize(
+    ('equation', 'factors'),
+    [
+        (equations.power, (5, 1.5)),
+        (equations.exponential, (-5, 0.3)),
+    ],
+)
+def test_estimate_p0(equation, factors):
+    """Test that the initial guess recovers the factors for noise-free data."""
+    x_values = np.linspace(0.5, 5, 10)
+
+    result = equation.estimate_p0(x_values, equation(x_values, *factors))
+
+    assert np.allclose(result, factors)
@@ -0,0 +1,93 @@
+"""Test datatable."""
+
+import pandas as pd
+import pytest
+
+from dash_charts import datatable
+
+DF_TABLE = pd.DataFrame(
+    data={
+        'continent': ['Asia', 'Europe', 'North America', 'Asia', None],
+        'pop': [1500, 20, 330, 125, 5],
+        'date': ['2018-03-01 12:59', '2018-04-01', '2019-03-01', '2018-03-11', '2020-01-01'],
+    },
+)
+
+
+@pytest.mark.parametrize(
+    ('filter_query', 'expected_index'),
+    [
+        ('', [0, 1, 2, 3, 4]),
+        ('{continent} = Asia', [0, 3]),
+        ('{pop} gt 100 && {continent} ne Asia', [2]),
+        ('{pop} < 25 || {continent} eq "North America"', [1, 2, 4]),
+        ('({pop} > 1000 || {pop} < 25) && !{continent} = Europe', [0, 4]),
+        ("{continent} in [Europe, 'North America']", [1, 2]),
+        ('{continent} contains si', [0, 3]),
+        ('{date} datestartswith 2018-03', [0, 3]),
+    ],
+)
+def test_apply_datatable_filters(filter_query, expected_index):
+    """Test apply_datatable_filters with the compiled filter query."""
+    result = datatable.apply_datatable_filters(DF_TABLE, filter_query)
+
+    assert result.index.to_list() == expected_index
+
+
+def test_compile_filter_query():
+    """Test that compile_filter_query caches the expression tree and raises on invalid queries."""
+    query = '{pop} ge 5 && {continent} in (Asia, Europe)'
+
+    result = datatable.compile_filter_query(query)
+
+    assert result == ('and', (('compare', 'pop', 'ge', 5.0), ('compare', 'continent', 'in', ('Asia', 'Europe'))))
+    assert datatable.compile_filter_query(query) is result
+    with pytest.raises(ValueError, match='Unknown operator'):
+        datatable.compile_filter_query('{pop} between 5')
+
+
+def test_query_datatable_page():
+    """Test query_datatable_page filters and sorts before returning a single page."""
+    sort_by = [{'column_id': 'pop', 'direction': 'desc'}]
+
+    df_page, page_count = datatable.query_datatable_page(DF_TABLE, 1, 2, sort_by, '{pop} > 10')  # act
+
+    assert df_page['pop'].to_list() == [125, 20]
+    assert page_count == 2
+
+
+def test_query_sqlite_page(fix_test_cache):
+    """Test query_sqlite_page returns the same page as query_datatable_page."""
+    db_path = fix_test_cache / 'datatable.db'
+    with datatable.SQLConnection(db_path) as conn:
+        DF_TABLE.to_sql('table', con=conn, index=False)
+    sort_by = [{'column_id': 'continent', 'direction': 'asc'}, {'column_id': 'pop', 'direction': 'desc'}]
+    filter_query = "{continent} in [Asia, Europe] || ({pop} < 400 && !{date} datestartswith '2019')"
+
+    df_page, page_count = datatable.query_sqlite_page(db_path, 'table', 0, 3, sort_by, filter_query)  # act
+
+    expected, expected_count = datatable.query_datatable_page(DF_TABLE, 0, 3, sort_by, filter_query)
+    assert df_page['pop'].to_list() == expected['pop'].to_list()
+    assert page_count == expected_count
+
+
+@pytest.mark.parametrize(
+    'sort_by',
+    [
+        [],
+        [{'column_id': 'pop', 'direction': 'asc'}],
+        [{'column_id': 'continent', 'direction': 'desc'}, {'column_id': 'pop', 'direction': 'asc'}],
+    ],
+)
+def test_query_datatable_page_sort_index(sort_by):
+    """Test that the cached DataTableSortIndex returns the same page as sorting the dataframe."""
+    sort_index = datatable.DataTableSortIndex(DF_TABLE)
+    filter_query = '{pop} < 1000'
+
+    df_page, page_count = datatable.query_datatable_page(DF_TABLE, 0, 3, sort_by, filter_query, sort_index)  # act
+
+    expected, expected_count = datatable.query_datatable_page(DF_TABLE, 0, 3, sort_by, filter_query)
+    assert df_page.index.to_list() == expected.index.to_list()
+    assert page_count == expected_count
+    if sort_by:
+        assert sort_index.get_order(sort_by) is sort_index.get_order(sort_by)
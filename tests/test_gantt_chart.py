@@ -0,0 +1,16 @@
+"""Test gantt_chart."""
+
+from palettable.tableau import TableauMedium_10
+
+from dash_charts.gantt_chart import GanttChart
+
+
+def test_gantt_chart_pallette():
+    """Test that the default pallette is resolved on access and can be overridden."""
+    chart = GanttChart(title='', xlabel='', ylabel='')
+    chart_custom = GanttChart(title='', xlabel='', ylabel='')
+
+    chart_custom.pallette = ['#000000']  # act
+
+    assert chart.pallette == TableauMedium_10.hex_colors
+    assert chart_custom.pallette == ['#000000']
@@ -0,0 +1,95 @@
+"""Test modules_datatable."""
+
+import pandas as pd
+import pytest
+from dash import no_update
+from dash.exceptions import PreventUpdate
+
+from dash_charts.modules_datatable import ModuleDataTable, ModuleFilteredTable
+
+DF_TABLE = pd.DataFrame(data={'x': [3, 1, 2, 5, 4], 'label': list('abcde')})
+
+
+class CallbackRecorder:  # noqa: H601
+    """Parent application that stores the registered callbacks by function name."""
+
+    def __init__(self):
+        """Initialize the lookup of callbacks."""
+        self.callbacks = {}
+
+    def callback(self, outputs, inputs, states):
+        """Return a decorator that stores the callback.
+
+        Args:
+            outputs: unused
+            inputs: unused
+            states: unused
+
+        Returns:
+            function: decorator
+
+        """
+        def decorator(func):
+            self.callbacks[func.__name__] = func
+            return func
+        return decorator
+
+
+def test_custom_backend_incomplete_filter():
+    """Test that the custom backend returns the unfiltered page when the filter query cannot be parsed."""
+    module = ModuleDataTable('table')
+    module.custom_backend = True
+    module.create_elements({})
+    module.mod_df = DF_TABLE
+    parent = CallbackRecorder()
+    module.create_callbacks(parent)
+    update_page = parent.callbacks['update_page']
+    sort_by = [{'column_id': 'x', 'direction': 'asc'}]
+
+    data, page_count = update_page(0, 2, sort_by, '{x} >', None)  # act
+
+    assert data == [{'x': 1, 'label': 'b'}, {'x': 2, 'label': 'c'}]
+    assert page_count == 3
+    assert update_page(0, 2, sort_by, '{x} > 2', None)[0] == [{'x': 3, 'label': 'a'}, {'x': 4, 'label': 'e'}]
+
+
+def create_update_columns(column_select_mode):
+    """Return the `update_columns` callback of a filtered table in the column select mode.
+
+    Args:
+        column_select_mode: value for `column_select_mode`
+
+    Returns:
+        function: registered callback
+
+    """
+    module = ModuleFilteredTable('table')
+    module.column_select_mode = column_select_mode
+    module.create_elements({})
+    module.mod_df = DF_TABLE
+    parent = CallbackRecorder()
+    module.create_callbacks(parent)
+    return parent.callbacks['update_columns']
+
+
+def test_column_select_mode_columns():
+    """Test that the columns mode sends every row only when a column is added so the native filter can be changed."""
+    update_columns = create_update_columns('columns')
+    current_columns = [{'id': 'x', 'name': 'x'}]
+
+    columns, data = update_columns(['x', 'label'], current_columns)  # act
+
+    assert [col['id'] for col in columns] == ['x', 'label']
+    assert data == DF_TABLE.to_dict('records')
+    assert update_columns(['x'], columns)[1] is no_update
+    with pytest.raises(PreventUpdate):
+        update_columns([], columns)
+
+
+def test_column_select_mode_hidden():
+    """Test that the hidden mode only updates the hidden columns."""
+    update_columns = create_update_columns('hidden')
+
+    result = update_columns(['label'], None)  # act
+
+    assert result == [['x']]
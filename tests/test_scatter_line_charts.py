@@ -0,0 +1,273 @@
+"""Test scatter_line_charts."""
+
+import pickle
+import timeit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dash_charts import equations, scatter_line_charts
+from dash_charts.utils_workers import WorkerPool
+
+
+class TestChart(scatter_line_charts.FittedChart):  # noqa: H601
+    """Custom chart for testing."""
+
+    __test__ = False
+
+    fit_eqs = [('linear', equations.linear), ('quadratic', equations.quadratic)]
+
+
+def _create_df_fit(count_groups=6):
+    """Create sample data with a separate linear trend for each group.
+
+    Args:
+        count_groups: number of unique names. Default is 6
+
+    Returns:
+        dataframe: with columns `name`, `x`, `y`, and `label`
+
+    """
+    x_values = np.linspace(0, 5, 20)
+    return pd.concat([
+        pd.DataFrame({'name': f'group-{idx}', 'x': x_values, 'y': idx * x_values + 1, 'label': None})
+        for idx in range(count_groups)
+    ])
+
+
+def test_fitted_chart_cache(monkeypatch):
+    """Test that FittedChart only fits each group and equation once."""
+    calls = []
+    fit_curve = scatter_line_charts.fit_curve
+
+    def count_fit_curve(*args):
+        calls.append(args[0])
+        return fit_curve(*args)
+
+    monkeypatch.setattr(scatter_line_charts, 'fit_curve', count_fit_curve)
+    chart = TestChart(title='', xlabel='', ylabel='')
+    df_raw = _create_df_fit()
+
+    traces = chart.create_traces(df_raw)
+    traces_cached = chart.create_traces(df_raw)  # act
+
+    assert len(calls) == 12
+    assert len(traces) == len(traces_cached) == 6 + 12
+    assert [trace.text for trace in traces[6:]] == [trace.text for trace in traces_cached[6:]]
+
+
+def test_fitted_chart_cache_time():
+    """Test that a refresh with cached fits is much faster than the first call and the cache only keeps summaries."""
+    chart = TestChart(title='', xlabel='', ylabel='')
+    chart.fit_eqs = [*chart.fit_eqs, ('exponential', equations.exponential)]
+    x_values = np.linspace(0, 3, 30)
+    noise = np.random.default_rng(3).normal(0, 0.1, (200, 30))
+    df_raw = pd.concat([
+        pd.DataFrame({'name': f'group-{idx}', 'x': x_values, 'y': (idx % 7 + 1) * x_values + 1 + noise[idx]})
+        for idx in range(200)
+    ]).assign(label=None)
+    cold_time = timeit.timeit(lambda: chart.create_traces(df_raw), number=1)
+
+    warm_time = min(timeit.repeat(lambda: chart.create_traces(df_raw), number=1, repeat=3))  # act
+
+    assert warm_time < cold_time / 2, f'Cached: {warm_time:.3f}s, uncached: {cold_time:.3f}s'
+    assert len(chart._fit_cache) == 600
+    assert all('residuals' not in result for result in chart._fit_cache.values() if isinstance(result, dict))
+
+
+def test_fitted_chart_workers():
+    """Test that fitting in a process pool matches fitting in the current process."""
+    chart = TestChart(title='', xlabel='', ylabel='')
+    chart_parallel = TestChart(title='', xlabel='', ylabel='')
+    chart_parallel.fit_pool = WorkerPool(max_workers=2)
+    df_raw = _create_df_fit()
+
+    try:
+        result = chart_parallel.create_traces(df_raw)  # act
+    finally:
+        chart_parallel.fit_pool.shutdown()
+
+    assert [trace.text for trace in result[6:]] == [trace.text for trace in chart.create_traces(df_raw)[6:]]
+    chart_copy = pickle.loads(pickle.dumps(chart_parallel))
+    assert chart_copy.fit_pool is None
+    assert not chart_copy._fit_cache
+
+
+def test_create_fitted_traces_bounded_samples():
+    """Test that the number of fit points does not depend on the units of the x axis."""
+    unix_x = np.linspace(1.6e9, 1.7e9, 20)
+    df_unix = pd.DataFrame({'x': unix_x, 'y': 2 * (unix_x - 1.6e9) + 1})
+    df_date = pd.DataFrame({'x': pd.to_datetime(unix_x, unit='s'), 'y': df_unix['y']})
+
+    traces_unix = scatter_line_charts.create_fit_traces(df_unix, 'unix', equations.linear)
+    traces_date = scatter_line_charts.create_fit_traces(df_date, 'date', equations.linear)  # act
+
+    assert len(traces_unix[0].x) == len(traces_date[0].x) == scatter_line_charts.FIT_SAMPLE_COUNT
+    assert pd.api.types.is_datetime64_any_dtype(pd.Series(traces_date[0].x))
+    assert np.allclose(traces_date[0].y, traces_unix[0].y)
+
+
+def test_fit_curve_polynomial():
+    """Test that polynomial equations are fit with closed-form least squares."""
+    x_values = np.linspace(-2, 2, 15)
+
+    popt, pcov = scatter_line_charts.fit_curve(equations.quadratic, x_values, 3 * x_values ** 2 - x_values + 2)
+
+    assert np.allclose(popt, [3, -1, 2])
+    assert pcov.shape == (3, 3)
+
+
+def test_summarize_fits():
+    """Test that the fit summary reports metrics for every equation and selects the best fit per group."""
+    chart = TestChart(title='', xlabel='', ylabel='')
+    chart.fit_eqs = [('linear', equations.linear), ('exponential', equations.exponential)]
+    x_values = np.linspace(0, 3, 25)
+    df_raw = pd.DataFrame({
+        'name': ['line'] * 25 + ['exp'] * 25,
+        'x': np.concatenate([x_values, x_values]),
+        'y': np.concatenate([2 * x_values + 1, 2 * np.exp(0.8 * x_values)]),
+    })
+
+    result = chart.summarize_fits(df_raw)  # act
+
+    assert result[['name', 'fit_name']].values.tolist() == [
+        ['line', 'linear'], ['line', 'exponential'], ['exp', 'linear'], ['exp', 'exponential'],
+    ]
+    assert result['error'].isna().all()
+    assert result.loc[result['is_best'], 'fit_name'].tolist() == ['linear', 'exponential']
+    assert np.allclose(result.loc[result['is_best'], 'r_squared'], 1)
+    assert all(len(residuals) == 25 for residuals in result['residuals'])
+
+
+def test_fitted_chart_plot_best_fit_only():
+    """Test that only the best equation is plotted for each group."""
+    chart = TestChart(title='', xlabel='', ylabel='')
+    chart.plot_best_fit_only = True
+    df_raw = _create_df_fit(count_groups=3)
+    df_raw['y'] += np.tile([0.01, -0.01], 30)
+
+    result = chart.create_traces(df_raw)  # act
+
+    assert [trace.name for trace in result[3:]] == ['group-0-linear', 'group-1-linear', 'group-2-linear']
+
+
+@pytest.mark.parametrize('window', [1, 3, 10])
+def test_rolling_statistics(window):
+    """Test that incremental rolling statistics match pandas."""
+    y_values = np.random.default_rng(0).normal(100, 5, 200)
+    y_values[[50, 120]] = np.nan
+    expected = pd.Series(y_values).rolling(window)
+    engine = scatter_line_charts.RollingStatistics(window)
+    engine.reset(y_values[:30])
+
+    for start in range(30, 200, 17):
+        engine.extend(y_values[start:start + 17])  # act
+
+    assert np.allclose(engine.mean, expected.mean(), equal_nan=True)
+    assert np.allclose(engine.std, expected.std(), equal_nan=True)
+
+
+def test_rolling_chart_appended_data(monkeypatch):
+    """Test that RollingChart only calculates the appended points for a growing series when incremental."""
+    chart = scatter_line_charts.RollingChart(title='', xlabel='', ylabel='')
+    chart.incremental_rolling = True
+    df_raw = pd.DataFrame({'x': range(100), 'y': np.sin(np.arange(100)), 'label': None})
+    chart.create_traces(df_raw.iloc[:60])
+    chart.create_traces(df_raw.iloc[:30], data_key='other')
+    reset = scatter_line_charts.RollingStatistics.reset
+    calls = []
+
+    def count_reset(engine, y_values=()):
+        calls.append(len(y_values))
+        reset(engine, y_values)
+
+    monkeypatch.setattr(scatter_line_charts.RollingStatistics, 'reset', count_reset)
+
+    result = chart.create_traces(df_raw)  # act
+
+    assert calls == []
+    assert np.allclose(result[2].y, df_raw['y'].rolling(chart.count_rolling).mean(), equal_nan=True)
+    # A change within the last `rolling_check_rows` rows is recalculated rather than treated as an append
+    df_edited = df_raw.assign(y=df_raw['y'].where(df_raw.index != 50, 10.0))
+    result = chart.create_traces(df_edited)
+    assert calls == [100]
+    assert np.allclose(result[2].y, df_edited['y'].rolling(chart.count_rolling).mean(), equal_nan=True)
+    assert list(chart._rolling_states) == ['other', None]
+
+
+def test_rolling_chart_append_cost():
+    """Test that an incremental tick on a long series is much cheaper than recalculating the full series."""
+    chart = scatter_line_charts.RollingChart(title='', xlabel='', ylabel='')
+    count = 1_000_000
+    df_raw = pd.DataFrame({'x': np.arange(count + 100), 'y': np.random.default_rng(2).normal(size=count + 100)})
+    chart.update_rolling(df_raw.iloc[:count])
+    full_time = min(timeit.repeat(lambda: chart.update_rolling(df_raw.iloc[:count]), number=1, repeat=3))
+    chart.incremental_rolling = True
+    chart.update_rolling(df_raw.iloc[:count])
+    ticks = iter(range(count + 10, count + 101, 10))
+
+    tick_time = min(timeit.repeat(lambda: chart.update_rolling(df_raw.iloc[:next(ticks)]), number=1, repeat=9))  # act
+
+    assert tick_time < full_time / 5, f'Incremental tick: {tick_time:.4f}s, full recalculation: {full_time:.4f}s'
+    result, _std = chart.update_rolling(df_raw)
+    assert np.allclose(result[-200:], df_raw['y'].rolling(chart.count_rolling).mean()[-200:])
+
+
+def test_rolling_chart_pickle():
+    """Test that a RollingChart can be pickled (such as for a worker process) without the stored statistics."""
+    chart = scatter_line_charts.RollingChart(title='', xlabel='', ylabel='')
+    chart.incremental_rolling = True
+    df_raw = pd.DataFrame({'x': range(20), 'y': np.arange(20.0), 'label': None})
+    chart.create_traces(df_raw)
+
+    result = pickle.loads(pickle.dumps(chart))  # act
+
+    assert not result._rolling_states
+    assert len(result.create_traces(df_raw)) == 3
+
+
+@pytest.mark.parametrize('span', [1, 4, 20])
+def test_ewm_statistics(span):
+    """Test that incremental exponentially weighted statistics match pandas."""
+    y_values = np.random.default_rng(1).normal(10, 2, 150)
+    y_values[[0, 1, 60, 61, 100]] = np.nan
+    expected = pd.Series(y_values).ewm(span=span)
+    engine = scatter_line_charts.EwmStatistics(span)
+    engine.reset(y_values[:40])
+
+    for start in range(40, 150, 13):
+        engine.extend(y_values[start:start + 13])  # act
+
+    assert np.allclose(engine.mean, expected.mean(), equal_nan=True)
+    assert np.allclose(engine.std, expected.std(), equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    ('attributes', 'names'),
+    [
+        ({}, ['5x STD Range', 'Rolling Mean']),
+        ({'rolling_window': '5min'}, ['5x STD Range', 'Rolling Mean']),
+        ({'band_type': 'ewm', 'ewm_span': 10}, ['5x EWM STD Range', 'EWM Mean']),
+        ({'band_type': 'quantile', 'rolling_window': '10min'}, ['P5-P95 Range', 'Rolling Median']),
+    ],
+)
+def test_rolling_chart_band_type(attributes, names):
+    """Test each type of rolling band."""
+    chart = scatter_line_charts.RollingChart(title='', xlabel='', ylabel='')
+    for attr, value in attributes.items():
+        setattr(chart, attr, value)
+    minutes = np.cumsum(np.random.default_rng(2).uniform(0.1, 3, 80))
+    df_raw = pd.DataFrame({
+        'x': pd.Timestamp('2020-01-01') + pd.to_timedelta(minutes, unit='min'),
+        'y': np.sin(minutes),
+        'label': None,
+    })
+
+    result = chart.create_traces(df_raw)  # act
+
+    assert [trace.name for trace in result[1:]] == names
+    upper, lower_reversed = np.split(result[1].y, 2)
+    is_valid = ~np.isnan(result[2].y) & ~np.isnan(upper)
+    assert np.all(lower_reversed[::-1][is_valid] <= result[2].y[is_valid] + 1e-12)
+    assert np.all(upper[is_valid] >= result[2].y[is_valid] - 1e-12)
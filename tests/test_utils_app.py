@@ -0,0 +1,147 @@
+"""Test utils_app."""
+
+import threading
+import time
+
+import dash
+import pytest
+from dash import html
+from dash.exceptions import PreventUpdate
+
+from dash_charts.utils_app import AppBase
+
+
+class BackgroundApp(AppBase):  # noqa: H601
+    """App with data generation controlled by an event."""
+
+    __test__ = False
+
+    name = 'Background App'
+    background_data = True
+
+    def __init__(self, **kwargs):
+        """Initialize the events and counters.
+
+        Args:
+            kwargs: keyword arguments passed to `AppBase`
+
+        """
+        self.release = threading.Event()
+        self.count_generated = 0
+        self.data_raw = None
+        super().__init__(**kwargs)
+
+    def initialization(self) -> None:
+        """Register the ids."""
+        super().initialization()
+        self.register_uniq_ids(['button', 'text'])
+
+    def generate_data(self) -> None:
+        """Wait for the release event then assign new data."""
+        self.release.wait(5)
+        self.count_generated += 1
+        self.data_raw = list(range(self.count_generated))
+
+    def create_elements(self) -> None:
+        """No elements."""
+        ...
+
+    def return_layout(self) -> dict:
+        """Return the layout without referencing the data.
+
+        Returns:
+            dict: Dash HTML object
+
+        """
+        return html.Div([html.Button(id=self._il['button']), html.Div(id=self._il['text'])])
+
+    def create_callbacks(self) -> None:
+        """Register a callback that depends on the data and one that does not."""
+        @self.callback([('text', 'children')], [('button', 'n_clicks')], [], wait_for_data=True)
+        def update_text(n_clicks):
+            return [str(len(self.data_raw))]
+
+        @self.callback([('button', 'children')], [('button', 'n_clicks')], [])
+        def update_button(n_clicks):
+            return [f'Clicked {n_clicks}']
+
+        self.update_text = update_text
+        self.update_button = update_button
+
+
+def test_background_data():
+    """Test that create does not block and callbacks do not update until the background data is ready."""
+    app = BackgroundApp(app=dash.Dash(__name__))
+
+    app.create()  # act
+
+    assert app.data_raw is None
+    assert not app.is_data_ready()
+    start = time.time()
+    with pytest.raises(PreventUpdate):
+        app.update_text(1, False)
+    assert time.time() - start < 1
+    assert app.update_button(1) == ['Clicked 1']
+    app.release.set()
+    assert app.wait_for_data(timeout=5)
+    assert app.update_text(1, True) == ['1']
+
+
+def test_background_data_ready_interval():
+    """Test that the layout polls for the data and that the interval is the last input of wait_for_data callbacks."""
+    app = BackgroundApp(app=dash.Dash(__name__))
+    app.create()
+    ready_id = app._il[app.id_data_ready]
+
+    interval = app.app.layout.children[-1]  # act
+
+    assert interval.id == ready_id
+    assert not interval.disabled
+    callbacks = {key.strip('.').split('.')[0]: spec for key, spec in app.app.callback_map.items()}
+    assert callbacks[app._il['text']]['inputs'][-1] == {'id': ready_id, 'property': 'disabled'}
+    assert len(callbacks[app._il['button']]['inputs']) == 1
+    check_data_ready = callbacks[ready_id]['callback']
+    with pytest.raises(PreventUpdate):
+        check_data_ready.__wrapped__(1)
+    app.release.set()
+    assert app.wait_for_data(timeout=5)
+    assert check_data_ready.__wrapped__(1) == [True]
+    assert app.add_data_ready_interval(html.Div()).children[-1].disabled
+
+
+def test_background_data_error():
+    """Test that errors from the background generate_data are raised when waiting."""
+    class FailingApp(BackgroundApp):  # noqa: H601
+        name = 'Failing App'
+
+        def generate_data(self):
+            raise ValueError('No data')
+
+    app = FailingApp(app=dash.Dash(__name__))
+    app.create()
+
+    with pytest.raises(RuntimeError, match='Failed to generate data') as exc_info:
+        app.wait_for_data(timeout=5)
+    assert isinstance(exc_info.value.__cause__, ValueError)
+
+
+def test_data_refresh_interval():
+    """Test that the data is periodically regenerated after the first load until the refresh is stopped."""
+    class RefreshApp(BackgroundApp):  # noqa: H601
+        name = 'Refresh App'
+        data_refresh_interval = 0.01
+
+    app = RefreshApp(app=dash.Dash(__name__))
+    app.create()
+    time.sleep(0.05)
+    assert app._refresh_thread is None
+    app.release.set()
+
+    time.sleep(0.2)  # act
+    app.stop_data_refresh()
+
+    count_generated = app.count_generated
+    assert count_generated > 2
+    assert app.data_error is None
+    time.sleep(0.05)
+    assert app.count_generated == count_generated
@@ -0,0 +1,188 @@
+"""Test utils_app_with_navigation."""
+
+import threading
+
+import dash
+import pytest
+from dash import html
+
+from dash_charts.utils_app import AppBase
+from dash_charts.utils_app_with_navigation import AppWithTabs
+
+
+class CountingTab(AppBase):  # noqa: H601
+    """Tab that counts the calls to each creation step."""
+
+    __test__ = False
+
+    def __init__(self, name, **kwargs):
+        """Initialize the tab with a unique name and empty counters.
+
+        Args:
+            name: tab name
+            kwargs: keyword arguments passed to `AppBase`
+
+        """
+        self.name = name
+        self.counts = {'generate_data': 0, 'create_elements': 0, 'return_layout': 0}
+        super().__init__(**kwargs)
+
+    def initialization(self) -> None:
+        """Register the ids."""
+        super().initialization()
+        self.register_uniq_ids(['button', 'text'])
+
+    def generate_data(self) -> None:
+        """Count the data generation."""
+        self.counts['generate_data'] += 1
+
+    def create_elements(self) -> None:
+        """Count the element creation."""
+        self.counts['create_elements'] += 1
+
+    def return_layout(self) -> dict:
+        """Return the tab layout.
+
+        Returns:
+            dict: Dash HTML object
+
+        """
+        self.counts['return_layout'] += 1
+        return html.Div([html.Button(id=self._il['button']), html.Div(id=self._il['text'])])
+
+    def create_callbacks(self) -> None:
+        """Register a callback for the button."""
+        @self.callback([('text', 'children')], [('button', 'n_clicks')], [])
+        def update_text(n_clicks):
+            return [str(n_clicks)]
+
+
+def create_tab_app(lazy_layouts, layout_cache_size=None):
+    """Return a created AppWithTabs with three counting tabs.
+
+    Args:
+        lazy_layouts: value for `lazy_layouts`
+        layout_cache_size: value for `layout_cache_size`. Default is None
+
+    Returns:
+        AppWithTabs: created application
+
+    """
+    class TabApp(AppWithTabs):  # noqa: H601
+        name = 'Test Tab App'
+
+        def define_nav_elements(self):
+            return [CountingTab(f'Tab {idx}', app=self.app) for idx in range(3)]
+
+    TabApp.lazy_layouts = lazy_layouts
+    TabApp.layout_cache_size = layout_cache_size
+    app = TabApp(app=dash.Dash(__name__))
+    app.create()
+    return app
+
+
+def test_eager_layouts():
+    """Test that each tab is created up front by default."""
+    app = create_tab_app(lazy_layouts=False)
+
+    assert [tab.counts for tab in app.nav_lookup.values()] == [
+        {'generate_data': 1, 'create_elements': 1, 'return_layout': 1},
+    ] * 3
+    assert len(app.app.validation_layout) == 4
+
+
+@pytest.mark.parametrize('layout_cache_size', [None, 1])
+def test_lazy_layouts(layout_cache_size):
+    """Test that tabs are built on first navigation, cached, and optionally evicted."""
+    app = create_tab_app(lazy_layouts=True, layout_cache_size=layout_cache_size)
+    tab_zero, tab_one = [*app.nav_lookup.values()][:2]
+
+    # Callbacks are registered eagerly, but no data or layout is created
+    assert len(app.app.callback_map) == 4
+    assert app.app.config.suppress_callback_exceptions
+    assert [tab.counts for tab in app.nav_lookup.values()] == [
+        {'generate_data': 0, 'create_elements': 0, 'return_layout': 0},
+    ] * 3
+
+    layout = app.get_nav_layout(tab_zero.name)  # act
+    app.get_nav_layout(tab_zero.name)
+    app.get_nav_layout(tab_one.name)
+    app.get_nav_layout(tab_zero.name)
+
+    assert layout.children[0].id == tab_zero._il['button']
+    assert tab_one.counts == {'generate_data': 1, 'create_elements': 1, 'return_layout': 1}
+    if layout_cache_size is None:
+        assert tab_zero.counts == {'generate_data': 1, 'create_elements': 1, 'return_layout': 1}
+        assert list(app.nav_layouts) == [tab_one.name, tab_zero.name]
+    else:
+        # Only the layout is rebuilt after eviction
+        assert tab_zero.counts == {'generate_data': 1, 'create_elements': 1, 'return_layout': 2}
+        assert list(app.nav_layouts) == [tab_zero.name]
+    with pytest.raises(KeyError):
+        app.get_nav_layout('Unknown Tab')
+    assert app.render_nav(tab_zero.name) == (app.get_nav_layout(tab_zero.name), True)
+
+
+def test_lazy_layouts_concurrent():
+    """Test that a slow tab does not block building or serving the other tabs."""
+    app = create_tab_app(lazy_layouts=True)
+    tab_zero, tab_one = [*app.nav_lookup.values()][:2]
+    release = threading.Event()
+    generate_data = tab_zero.generate_data
+
+    def slow_generate_data():
+        release.wait(5)
+        generate_data()
+
+    tab_zero.generate_data = slow_generate_data
+    threads = [threading.Thread(target=app.get_nav_layout, args=(tab_zero.name,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+
+    layout = app.get_nav_layout(tab_one.name)  # act
+
+    assert not release.is_set()
+    assert layout.children[0].id == tab_one._il['button']
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert tab_zero.counts == {'generate_data': 1, 'create_elements': 1, 'return_layout': 1}
+
+
+def test_lazy_layouts_background_data():
+    """Test that a lazy tab with background data shows a placeholder until the data is ready."""
+    release = threading.Event()
+
+    class BackgroundTab(CountingTab):  # noqa: H601
+        background_data = True
+
+        def generate_data(self):
+            release.wait(5)
+            super().generate_data()
+
+    class TabApp(AppWithTabs):  # noqa: H601
+        name = 'Test Background Tab App'
+        lazy_layouts = True
+
+        def define_nav_elements(self):
+            return [BackgroundTab('Background Tab', app=self.app)]
+
+    app = TabApp(app=dash.Dash(__name__))
+    app.create()
+    tab = app.nav_lookup['Background Tab']
+
+    layout, poll_disabled = app.render_nav(tab.name)  # act
+
+    assert not poll_disabled
+    assert layout.children == ['Loading Background Tab...']
+    assert tab.counts == {'generate_data': 0, 'create_elements': 0, 'return_layout': 0}
+    assert app.nav_layouts == {}
+    release.set()
+    assert tab.wait_for_data(timeout=5)
+    layout, poll_disabled = app.render_nav(tab.name)
+    assert poll_disabled
+    tab_layout, ready_interval = layout.children
+    assert tab_layout.children[0].id == tab._il['button']
+    assert ready_interval.id == tab._il[tab.id_data_ready]
+    assert ready_interval.disabled
+    assert tab.counts == {'generate_data': 1, 'create_elements': 1, 'return_layout': 1}
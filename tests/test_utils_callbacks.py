@@ -0,0 +1,283 @@
+"""Test utils_callbacks."""
+
+import importlib
+import json
+import time
+from importlib.util import find_spec
+
+import dash
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from dash_charts import utils_callbacks
+from dash_charts.utils_app import AppBase, enable_compression
+from dash_charts.utils_callbacks import (
+    CALLBACK_METRICS_ROUTE, CallbackMetrics, bind_callback_maps, downsample_figure, instrument_callback,
+    limit_payload, map_args, map_outputs, measure_payload, record_section, register_metrics_endpoint,
+)
+from dash_charts.utils_fig import CustomChart
+
+
+class TestChart(CustomChart):  # noqa: H601
+    """Custom chart for testing."""
+
+    __test__ = False
+
+    def create_traces(self, df_raw):
+        """Return an empty list of traces.
+
+        Args:
+            df_raw: unused
+
+        Returns:
+            list: empty
+
+        """
+        return []
+
+
+@pytest.mark.parametrize('register', [False, True])
+def test_map_args_and_outputs(register):
+    """Test map_args and map_outputs with and without the tables compiled at registration."""
+    inputs = [('interval', 'n_intervals'), ('dropdown', 'value'), ('dropdown', 'options')]
+    states = [('store', 'data')]
+    outputs = [('chart', 'figure'), ('store', 'data')]
+
+    def update(*raw_args):
+        return map_args(raw_args, inputs, states)
+
+    if register:
+        update = bind_callback_maps(update, inputs, states)
+
+    a_in, a_state = update(1, 'a', ['a', 'b'], {})  # act
+    result = map_outputs(outputs, [('store', 'data', 'new'), ('chart', 'figure', 'fig')])
+
+    assert a_in == {'interval': {'n_intervals': 1}, 'dropdown': {'value': 'a', 'options': ['a', 'b']}}
+    assert a_state == {'store': {'data': {}}}
+    assert result == ['fig', 'new']
+    with pytest.raises(RuntimeError, match='Expected same number'):
+        map_outputs(outputs, [('chart', 'figure', 'fig')])
+
+
+def test_instrument_callback(tmp_path):
+    """Test that instrument_callback records the sections, payload, and slow call profiles."""
+    metrics = CallbackMetrics()
+    chart = TestChart(title='Test', xlabel='x', ylabel='y')
+
+    def update(value):
+        with record_section('sleep'):
+            time.sleep(0.01)
+        return [chart.create_figure(None), value, dash.no_update]
+
+    wrapped = instrument_callback(update, 'graph.figure', metrics, profile_threshold=0, profile_dir=tmp_path)
+    result = wrapped('text')  # act
+    wrapped('text')
+
+    summary = metrics.summary()['graph.figure']
+    assert summary['name'] == 'update'
+    assert summary['calls'] == 2
+    assert summary['mean_time'] >= 0.01
+    assert set(summary['sections']) == {'sleep', 'create_figure', 'create_traces'}
+    assert summary['sections']['sleep'] >= 0.02
+    assert summary['last_payload_bytes'] == measure_payload(result) > len('"text"')
+    assert len(list(tmp_path.glob('update-*.prof'))) == 2
+
+
+def test_instrument_callback_exception():
+    """Test that a failing callback is still counted and the error is raised."""
+    metrics = CallbackMetrics()
+
+    def update():
+        raise dash.exceptions.PreventUpdate
+
+    wrapped = instrument_callback(update, 'out.children', metrics)
+
+    with pytest.raises(dash.exceptions.PreventUpdate):
+        wrapped()
+
+    assert metrics.summary()['out.children']['calls'] == 1
+    assert metrics.summary()['out.children']['last_payload_bytes'] == 0
+
+
+def test_record_section_without_callback():
+    """Test that record_section is a no-op outside of an instrumented callback."""
+    with record_section('create_figure'):
+        result = 1
+
+    assert result == 1
+
+
+def test_register_metrics_endpoint():
+    """Test that the metrics endpoint serves the summary and is only registered once."""
+    metrics = CallbackMetrics()
+    metrics.record('out.children', 'update', 0.5, payload_size=10)
+    app = dash.Dash(__name__)
+    app.layout = dash.html.Div()
+    server = app.server
+
+    register_metrics_endpoint(server, metrics)
+    register_metrics_endpoint(server, metrics)
+    response = server.test_client().get(CALLBACK_METRICS_ROUTE)  # act
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['out.children']['calls'] == 1
+    assert data['out.children']['mean_time'] == 0.5
+    assert data['out.children']['max_payload_bytes'] == 10
+    metrics.reset()
+    assert metrics.summary() == {}
+
+
+def test_app_base_instrument_callbacks():
+    """Test that AppBase wraps registered callbacks when instrument_callbacks is True."""
+    class InstrumentedApp(AppBase):  # noqa: H601
+        name = 'Instrumented App'
+        instrument_callbacks = True
+        callback_metrics = CallbackMetrics()
+
+        def initialization(self):
+            super().initialization()
+            self.register_uniq_ids(['input', 'output'])
+
+        def create_elements(self):
+            pass  # noqa: Q000
+
+        def return_layout(self):
+            return dash.html.Div()
+
+        def create_callbacks(self):
+            @self.callback([('output', 'children')], [('input', 'value')], [])
+            def update(value):
+                return f'value: {value}'
+
+            self.update = update
+
+    app = InstrumentedApp()
+    app.create()
+    server = app.get_server()
+
+    assert CALLBACK_METRICS_ROUTE in [rule.rule for rule in server.url_map.iter_rules()]
+    app.update('a')
+    assert list(app.callback_metrics.summary()) == [f'{app._il["output"]}.children']
+
+
+def test_downsample_figure():
+    """Test that downsample_figure decimates the per-point arrays of each trace."""
+    x_values = np.arange(1000)
+    figure = go.Figure([
+        go.Scatter(x=x_values, y=x_values ** 2, text=[str(val) for val in x_values], marker={'color': x_values}),
+        go.Scatter(x=[0, 1], y=[1, 2], name='short'),
+    ])
+
+    result = downsample_figure(figure, 10)  # act
+
+    assert len(result.data[0].x) == 100
+    assert list(result.data[0].y[:2]) == [0, 100]
+    assert list(result.data[0].text[:2]) == ['0', '10']
+    assert len(result.data[0].marker.color) == 100
+    assert list(result.data[1].x) == [0]
+
+
+def test_downsample_figure_other_traces():
+    """Test that downsample_figure does not modify heatmaps or bars with per-bar widths."""
+    x_values = np.arange(100)
+    figure = go.Figure([
+        go.Heatmap(x=x_values, y=x_values[:20], z=np.ones((20, 100))),
+        go.Bar(x=x_values, y=x_values, width=np.full(100, 0.5)),
+    ])
+
+    result = downsample_figure(figure, 10)  # act
+
+    assert len(result.data[0].x) == 100
+    assert np.shape(result.data[0].z) == (20, 100)
+    assert len(result.data[1].x) == len(result.data[1].width) == 100
+
+
+@pytest.mark.parametrize('action', ['warn', 'downsample'])
+def test_limit_payload(action):
+    """Test that limit_payload warns or downsamples when the budget is exceeded."""
+    budget = 20000
+    x_values = np.arange(5000)
+
+    def update():
+        return [go.Figure([go.Scatter(x=x_values, y=x_values)]), 'text']
+
+    wrapped = limit_payload(update, 'graph.figure', budget, action)
+
+    if action == 'warn':
+        with pytest.warns(ResourceWarning, match='graph.figure'):
+            result = wrapped()
+        assert measure_payload(result) > budget
+    else:
+        result = wrapped()
+        assert 0 < measure_payload(result) <= budget
+        assert result[1] == 'text'
+
+    with pytest.raises(ValueError, match='Unknown payload action'):
+        limit_payload(update, 'graph.figure', budget, 'drop')
+
+
+def test_limit_payload_instrumented(monkeypatch):
+    """Test that the outputs are only serialized once when the payload budget and instrumentation are both used."""
+    calls = []
+
+    def count_measure_payload(result):
+        calls.append(result)
+        return measure_payload(result)
+
+    monkeypatch.setattr(utils_callbacks, 'measure_payload', count_measure_payload)
+    metrics = CallbackMetrics()
+
+    def update():
+        return [go.Figure([go.Scatter(x=np.arange(100), y=np.arange(100))])]
+
+    wrapped = instrument_callback(limit_payload(update, 'graph.figure', 1e6), 'graph.figure', metrics)
+    result = wrapped()  # act
+
+    assert len(calls) == 1
+    assert metrics.summary()['graph.figure']['last_payload_bytes'] == measure_payload(result)
+
+
+@pytest.mark.skipif(find_spec('flask_compress') is not None, reason='flask-compress is installed')
+def test_enable_compression_missing_dependency():
+    """Test that enable_compression raises a helpful error without flask-compress."""
+    app = dash.Dash(__name__)
+
+    with pytest.raises(RuntimeError, match='flask-compress'):
+        enable_compression(app.server)
+
+
+@pytest.mark.parametrize(('example', 'max_bytes'), [
+    ('ex_coordinate_chart', 50000),
+    ('ex_fitted_chart', 50000),
+    ('ex_gantt_chart', 50000),
+    ('ex_marginal_chart', 50000),
+    ('ex_pareto_chart', 20000),
+    ('ex_rolling_chart', 200000),
+    ('ex_time_vis_chart', 75000),
+])
+def test_example_payload_sizes(example, max_bytes):
+    """Test that the serialized initial layout of each example app stays within the expected payload size."""
+    module = importlib.import_module(f'tests.examples.{example}')
+
+    payload_size = measure_payload(module.app.app.layout)  # act
+
+    assert 0 < payload_size <= max_bytes
+
+
+@pytest.mark.parametrize(('example', 'output_id', 'args', 'max_bytes'), [
+    ('ex_rolling_chart', 'rolling', ([0, 1000],), 150000),
+    ('ex_rolling_chart', 'rolling', ([150, 825],), 100000),
+])
+def test_example_callback_payload_sizes(example, output_id, args, max_bytes):
+    """Test that the serialized outputs of example callbacks stay within the expected payload size."""
+    module = importlib.import_module(f'tests.examples.{example}')
+    output_key = f'{module.app._il[output_id]}.'
+    callback = next(
+        spec['callback'] for key, spec in module.app.app.callback_map.items() if key.strip('.').startswith(output_key)
+    )
+
+    payload_size = measure_payload(callback.__wrapped__(*args))  # act
+
+    assert 0 < payload_size <= max_bytes
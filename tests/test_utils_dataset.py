@@ -20,3 +20,17 @@ def test_db_connect():
         result = csv_filename.read_text()
 
     assert result == 'id,username,value\n1,username,1\n'
+
+
+def test_db_connect_validate():
+    """Test that DBConnect only connects on first use unless validate is True."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        database = utils_dataset.DBConnect(tmp_dir / 'lazy.db')
+        database_validated = utils_dataset.DBConnect(tmp_dir / 'validated.db', validate=True)
+
+        result = (database._db, database_validated._db)
+        database_validated.close()
+
+    assert result[0] is None
+    assert result[1] is not None
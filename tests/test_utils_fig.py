@@ -1,8 +1,14 @@
 """Test utils_fig."""
 
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
 import pytest
+from plotly.subplots import make_subplots
 
-from dash_charts.utils_fig import CustomChart
+from dash_charts import utils_fig
+from dash_charts.scatter_line_charts import RollingChart
+from dash_charts.utils_fig import CustomChart, MarginalChart, convert_to_webgl
 
 
 class TestChart(CustomChart):  # noqa: H601
@@ -11,6 +17,48 @@ class TestChart(CustomChart):  # noqa: H601
     __test__ = False
 
 
+class TestMarginalChart(MarginalChart):  # noqa: H601
+    """Marginal chart for testing."""
+
+    __test__ = False
+
+    def create_traces(self, df_raw):
+        """Return traces for the main chart.
+
+        Args:
+            df_raw: pandas dataframe with columns `x` and `y`
+
+        Returns:
+            list: of traces
+
+        """
+        return [go.Scatter(x=df_raw['x'], y=df_raw['y'], name=f'main-{idx}') for idx in range(3)]
+
+    def create_marg_top(self, df_raw):
+        """Return traces for the top marginal chart.
+
+        Args:
+            df_raw: pandas dataframe with columns `x` and `y`
+
+        Returns:
+            list: of traces
+
+        """
+        return [go.Histogram(x=df_raw['x'])]
+
+    def create_marg_right(self, df_raw):
+        """Return traces for the right marginal chart.
+
+        Args:
+            df_raw: pandas dataframe with columns `x` and `y`
+
+        Returns:
+            list: of traces
+
+        """
+        return [go.Histogram(y=df_raw['y'])]
+
+
 def test_axis_range_property():
     """Test setting the axis_range property on the CustomChart base class."""
     test_chart = TestChart(title='', xlabel='', ylabel='')
@@ -27,3 +75,89 @@ def test_axis_range_property():
     assert test_chart.axis_range == pass_range_1
     test_chart.axis_range = pass_range_2
     assert test_chart.axis_range == pass_range_2
+
+
+def test_convert_to_webgl():
+    """Test that only scatter traces above the threshold are converted."""
+    x_values = np.arange(50)
+    traces = [
+        go.Scatter(x=x_values[:10], y=x_values[:10]),
+        go.Scatter(x=x_values, y=x_values, mode='markers', name='large'),
+        go.Scatter(x=x_values, y=x_values, fill='tozeroy'),
+        go.Bar(x=x_values, y=x_values),
+    ]
+
+    result = convert_to_webgl(traces, threshold=20)  # act
+
+    assert [trace.type for trace in result] == ['scatter', 'scattergl', 'scatter', 'bar']
+    assert result[1].name == 'large'
+    assert convert_to_webgl(traces, threshold=None) is traces
+
+
+def test_rolling_chart_webgl_band():
+    """Test that the large rolling band is split into WebGL traces bounding the same region."""
+    chart = RollingChart(title='', xlabel='', ylabel='')
+    chart.webgl_threshold = 100
+    y_values = np.sin(np.linspace(0, 20, 500))
+    df_raw = pd.DataFrame({'x': np.arange(500), 'y': y_values, 'label': None})
+    rolling_mean = df_raw['y'].rolling(chart.count_rolling).mean()
+    rolling_std = df_raw['y'].rolling(chart.count_std).std()
+
+    result = chart.create_figure(df_raw)['data']  # act
+
+    assert [trace.type for trace in result] == ['scattergl'] * 4
+    assert [trace.fill for trace in result[1:3]] == [None, 'tonexty']
+    assert np.allclose(result[1].y, rolling_mean - chart.count_std * rolling_std, equal_nan=True)
+    assert np.allclose(result[2].y, rolling_mean + chart.count_std * rolling_std, equal_nan=True)
+
+
+def test_marginal_chart_layout():
+    """Test that the marginal chart axes match the equivalent `make_subplots` figure."""
+    chart = TestMarginalChart(title='', xlabel='X Label', ylabel='Y Label')
+    expected = make_subplots(
+        rows=2, cols=2,
+        shared_xaxes=True, shared_yaxes=True,
+        vertical_spacing=0.02, horizontal_spacing=0.02,
+        row_width=[0.8, 0.2], column_width=[0.8, 0.2],
+    )
+
+    result = chart.create_figure(pd.DataFrame({'x': [1, 2, 3], 'y': [4, 5, 6]}))  # act
+
+    assert [(trace.xaxis, trace.yaxis) for trace in result.data] == [('x3', 'y3')] * 3 + [('x', 'y'), ('x4', 'y4')]
+    for axis in ['xaxis', 'yaxis', 'xaxis2', 'yaxis2', 'xaxis3', 'yaxis3', 'xaxis4', 'yaxis4']:
+        for key in ['anchor', 'domain', 'matches', 'showticklabels']:
+            assert result.layout[axis][key] == expected.layout[axis][key]
+    assert (result.layout.xaxis3.title.text, result.layout.yaxis3.title.text) == ('X Label', 'Y Label')
+
+
+def test_marginal_histogram_cache(monkeypatch):
+    """Test that marginal histograms are binned once and sent as bars."""
+    calls = []
+    calculate_histogram = utils_fig.calculate_histogram
+
+    def count_calculate_histogram(*args):
+        calls.append(args)
+        return calculate_histogram(*args)
+
+    monkeypatch.setattr(utils_fig, 'calculate_histogram', count_calculate_histogram)
+    chart = TestMarginalChart(title='', xlabel='', ylabel='')
+    chart.marginal_bins = 20
+    values = np.random.default_rng(0).normal(size=100_000)
+
+    result = chart.create_marginal_histogram(values, orientation='h')  # act
+
+    assert result[0].type == 'bar'
+    assert len(result[0].y) == len(result[0].width) == 20
+    assert np.sum(result[0].x) == len(values)
+    assert chart.create_marginal_histogram(values)[0].y.tolist() == result[0].x.tolist()
+    assert len(calls) == 1
+
+
+def test_calculate_kde():
+    """Test that the binned kernel density estimate matches the normal distribution."""
+    values = np.random.default_rng(1).normal(size=50_000)
+
+    x_values, density = utils_fig.calculate_kde(values, count_points=400)  # act
+
+    assert np.isclose(np.sum(density) * (x_values[1] - x_values[0]), 1, atol=1e-3)
+    assert np.allclose(density, np.exp(-x_values ** 2 / 2) / np.sqrt(2 * np.pi), atol=0.02)
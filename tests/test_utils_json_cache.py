@@ -1,10 +1,12 @@
 """Test utils_json_cache."""
 
+import multiprocessing
 import shutil
+import sqlite3
 
 from dash_charts.utils_dataset import DBConnect
 from dash_charts.utils_json_cache import (
-    CACHE_DIR, get_files_table, initialize_cache, retrieve_cache_object, store_cache_object,
+    CACHE_DIR, get_cache_dict, get_files_table, initialize_cache, retrieve_cache_object, store_cache_object,
 )
 
 
@@ -25,3 +27,63 @@ def test_utils_json_cache():
     assert result == obj
     test_db.close()
     shutil.rmtree(CACHE_DIR)
+
+
+def _store_from_worker(args):
+    """Store an object in the cache from a separate process.
+
+    Args:
+        args: tuple of `(db_path, cache_dir, identifier, worker_idx)`
+
+    """
+    db_path, cache_dir, identifier, worker_idx = args
+    worker_db = DBConnect(db_path)
+    try:
+        store_cache_object('Stress', identifier, {'identifier': identifier, 'worker': worker_idx}, worker_db, cache_dir)
+    finally:
+        worker_db.close()
+
+
+def test_store_cache_object_concurrent(tmp_path):
+    """Test that multiple processes can store the same identifiers without duplicate rows or partial files."""
+    db_path = tmp_path / '_stress_lookup.db'
+    test_db = DBConnect(db_path)
+    initialize_cache(test_db)
+    identifiers = [f'Stress-{idx}' for idx in range(5)]
+    jobs = [(db_path, tmp_path, identifier, idx) for idx in range(8) for identifier in identifiers]
+
+    with multiprocessing.Pool(processes=4) as pool:
+        pool.map(_store_from_worker, jobs)  # act
+
+    cache_dict = get_cache_dict(test_db)
+    assert sorted(cache_dict) == identifiers
+    assert len([*get_files_table(test_db).all()]) == len(identifiers)
+    for identifier in identifiers:
+        assert retrieve_cache_object(identifier, test_db)['identifier'] == identifier
+    assert len([*tmp_path.glob('Stress_*.json')]) == len(identifiers)
+    assert not [*tmp_path.glob('*.tmp')]
+    test_db.close()
+
+
+def test_initialize_cache_legacy_duplicates(tmp_path):
+    """Test that duplicate rows from a legacy table are removed along with their files."""
+    db_path = tmp_path / '_legacy_lookup.db'
+    filenames = [tmp_path / f'Legacy_{idx}.json' for idx in range(3)]
+    for filename in filenames:
+        filename.write_text('{}')
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE files (id INTEGER PRIMARY KEY, identifier TEXT, filename TEXT, timestamp FLOAT)')
+    conn.executemany(
+        'INSERT INTO files (identifier, filename, timestamp) VALUES (?, ?, 0)',
+        [('Legacy', str(filenames[0])), ('Legacy', str(filenames[1])), ('Legacy', str(filenames[0])),
+         ('Other', str(filenames[2]))],
+    )
+    conn.commit()
+    conn.close()
+    test_db = DBConnect(db_path)
+
+    initialize_cache(test_db)  # act
+
+    assert get_cache_dict(test_db) == {'Legacy': filenames[0], 'Other': filenames[2]}
+    assert [filename.is_file() for filename in filenames] == [True, False, True]
+    test_db.close()
@@ -0,0 +1,161 @@
+"""Test utils_workers."""
+
+import os
+import pickle
+import time
+
+import dash
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from plotly.io.json import to_json_plotly
+
+from dash_charts.pareto_chart import ParetoChart
+from dash_charts.utils_app import AppBase
+from dash_charts.utils_callbacks import CallbackMetrics, instrument_callback
+from dash_charts.utils_fig import CustomChart
+from dash_charts.utils_workers import FigureWorkerPool, SharedFrame
+
+
+class WorkerTestChart(CustomChart):  # noqa: H601
+    """Chart that can sleep or exit the worker process."""
+
+    __test__ = False
+
+    def create_traces(self, df_raw, sleep=0, exit_code=None):
+        """Return an empty list of traces after the optional sleep or exit.
+
+        Args:
+            df_raw: unused
+            sleep: seconds to sleep. Default is 0
+            exit_code: if not None, exit the process with this code. Default is None
+
+        Returns:
+            list: empty
+
+        """
+        if exit_code is not None:
+            os._exit(exit_code)
+        time.sleep(sleep)
+        return []
+
+
+@pytest.fixture(scope='module')
+def figure_pool():
+    """Return a single worker pool shared by the tests in this module.
+
+    Yields:
+        FigureWorkerPool: pool that is shut down after the tests
+
+    """
+    pool = FigureWorkerPool(max_workers=1, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_shared_frame():
+    """Test that SharedFrame round trips numeric, datetime, and object columns."""
+    df_raw = pd.DataFrame({
+        'x': np.arange(5, dtype=float),
+        'count': np.arange(5),
+        'flag': [True, False, True, False, True],
+        'date': pd.date_range('2020-01-01', periods=5),
+        'label': list('abcde'),
+    }, index=list('vwxyz'))
+    shared_frame = SharedFrame(df_raw)
+
+    try:
+        result = pickle.loads(pickle.dumps(shared_frame)).to_dataframe()  # act
+    finally:
+        shared_frame.unlink()
+
+    pd.testing.assert_frame_equal(result, df_raw)
+    assert [position for position, *_args in shared_frame.shared] == [0, 1, 2, 3]
+    assert list(shared_frame.pickled) == [4]
+
+
+def test_figure_pool(figure_pool):
+    """Test that the pool builds the same figure as the chart and records queue and run times."""
+    chart = ParetoChart(title='Pareto', xlabel='Category', ylabel='Count')
+    df_raw = pd.DataFrame({'category': list('aabbbc'), 'value': [1, 2, 3, 4, 5, 6]})
+    metrics = CallbackMetrics()
+
+    def update():
+        return [figure_pool.create_figure(chart, df_raw)]
+
+    result = instrument_callback(update, 'pareto.figure', metrics)()[0]  # act
+
+    assert to_json_plotly(result) == to_json_plotly(go.Figure(chart.create_figure(df_raw)))
+    summary = figure_pool.summary()
+    assert summary['calls'] == 1
+    assert summary['pending'] == 0
+    assert summary['mean_run_time'] > 0
+    assert set(metrics.summary()['pareto.figure']['sections']) >= {'figure_queue', 'figure_worker'}
+
+
+def test_figure_pool_errors(figure_pool):
+    """Test that worker errors are raised, counted, and free the slot."""
+    chart = ParetoChart(title='Pareto', xlabel='Category', ylabel='Count')
+    errors = figure_pool.summary()['errors']
+
+    with pytest.raises(RuntimeError, match='must have keys'):
+        figure_pool.create_figure(chart, pd.DataFrame({'other': [1]}))
+
+    assert figure_pool.summary()['errors'] == errors + 1
+    assert figure_pool.summary()['pending'] == 0
+
+
+def test_figure_pool_queue_timeout():
+    """Test that a full pool raises after the queue timeout."""
+    pool = FigureWorkerPool(max_workers=1, max_pending=1, queue_timeout=0.01)
+    pool._slots.acquire()  # Simulate a figure that is already running
+
+    with pytest.raises(RuntimeError, match='No free figure worker'):
+        pool.create_figure(None, pd.DataFrame())
+
+
+def test_figure_pool_result_timeout():
+    """Test that a slow figure raises after the result timeout and keeps its slot until the worker finishes."""
+    pool = FigureWorkerPool(max_workers=1, result_timeout=0.5)
+    chart = WorkerTestChart(title='', xlabel='', ylabel='')
+    pool.create_figure(chart, pd.DataFrame({'x': [1.0]}))  # Start the worker process
+    pool.result_timeout = 0.05
+
+    try:
+        with pytest.raises(RuntimeError, match='not complete within'):
+            pool.create_figure(chart, pd.DataFrame({'x': [1.0]}), sleep=1)
+        assert pool.summary()['pending'] == 1
+    finally:
+        pool.shutdown()
+
+    assert pool.summary()['errors'] == 1
+    assert pool.summary()['pending'] == 0
+
+
+def test_figure_pool_broken():
+    """Test that the pool is restarted after a worker process dies."""
+    pool = FigureWorkerPool(max_workers=1)
+    chart = WorkerTestChart(title='', xlabel='', ylabel='')
+
+    try:
+        with pytest.raises(RuntimeError, match='terminated abruptly'):
+            pool.create_figure(chart, pd.DataFrame(), exit_code=1)
+        result = pool.create_figure(chart, pd.DataFrame())  # act
+    finally:
+        pool.shutdown()
+
+    assert result['data'] == []
+    assert pool.summary()['calls'] == 1
+
+
+def test_app_base_create_figure():
+    """Test that AppBase.create_figure builds the figure inline without a pool and returns a dictionary."""
+    app = AppBase(app=dash.Dash(__name__))
+    chart = ParetoChart(title='Pareto', xlabel='Category', ylabel='Count')
+    df_raw = pd.DataFrame({'category': list('ab'), 'value': [1, 2]})
+
+    result = app.create_figure(chart, df_raw)  # act
+
+    assert isinstance(result, dict)
+    assert result['layout']['title']['text'] == 'Pareto'
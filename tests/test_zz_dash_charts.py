@@ -1,12 +1,91 @@
 """Final test alphabetically (zz) to catch general integration cases."""
 
+import os
+import re
+import subprocess  # noqa: S404
+import sys
+
+import pytest
 import toml
 
 from dash_charts import __version__
 
+HEAVY_IMPORTS = ('bs4', 'cerberus', 'dataset', 'lxml', 'markdown', 'palettable', 'scipy', 'sqlalchemy')
+"""Optional or slow dependencies that must only be imported on first use."""
+
+IMPORT_TIME_BUDGETS = {
+    'dash_charts.app_px': 0.40,
+    'dash_charts.coordinate_chart': 0.10,
+    'dash_charts.gantt_chart': 0.10,
+    'dash_charts.modules_datatable': 0.20,
+    'dash_charts.modules_upload': 0.20,
+    'dash_charts.pareto_chart': 0.10,
+    'dash_charts.scatter_line_charts': 0.12,
+    'dash_charts.time_vis_chart': 0.12,
+    'dash_charts.utils_app_with_navigation': 0.30,
+    'dash_charts.utils_json_cache': 0.10,
+    'dash_charts.utils_static': 0.20,
+    'dash_charts.utils_static_toc': 0.10,
+    'dash_charts.utils_workers': 0.12,
+}
+"""Maximum seconds to import each `dash_charts` module after its core dependencies (dash, numpy, pandas, plotly).
+
+About 1.5-2x the measured import times, so that a new top-level import of a slow dependency fails the test
+
+"""
+
+IMPORT_TIME_OVERRIDE = os.getenv('DASH_CHARTS_IMPORT_TIME_BUDGET')
+"""If set, seconds that replace every budget in `IMPORT_TIME_BUDGETS` (such as on a slow machine). `0` to not check."""
+
+IMPORT_TIME_ATTEMPTS = 3
+"""Number of measurements before an import over budget fails. The fastest measurement is compared to the budget."""
+
+CORE_IMPORTS = 'import dash, numpy, pandas, plotly.graph_objects'
+"""Imports that are shared by all applications and excluded from the import time budget."""
+
+
+def measure_import(module_name):
+    """Import the module in a new interpreter with `python -X importtime`.
+
+    Args:
+        module_name: name of the module to import
+
+    Returns:
+        dict: cumulative import time in seconds for each imported module name
+
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', f'{CORE_IMPORTS}; import {module_name}'],
+        capture_output=True, check=True, env=env, text=True,
+    )
+    pattern = re.compile(r'import time:\s+\d+ \|\s+(?P<cumulative>\d+) \|\s*(?P<name>\S+)')
+    return {
+        match.group('name'): int(match.group('cumulative')) / 1e6
+        for match in map(pattern.match, result.stderr.splitlines()) if match
+    }
+
 
 def test_version():
     """Check that PyProject and __version__ are equivalent."""
     result = toml.load('pyproject.toml')['tool']['poetry']['version']
 
     assert result == __version__
+
+
+@pytest.mark.parametrize('module_name', IMPORT_TIME_BUDGETS)
+def test_import_time(module_name):
+    """Check that heavy dependencies are deferred and that the import time stays within the budget."""
+    budget = IMPORT_TIME_BUDGETS[module_name] if IMPORT_TIME_OVERRIDE is None else float(IMPORT_TIME_OVERRIDE)
+    import_times = measure_import(module_name)
+
+    assert module_name in import_times
+    assert [name for name in import_times if name.split('.')[0] in HEAVY_IMPORTS] == []
+    if budget > 0:
+        # Measure again before failing to ignore a single slow run on a busy machine
+        import_time = import_times[module_name]
+        for _idx in range(IMPORT_TIME_ATTEMPTS - 1):
+            if import_time < budget:
+                break
+            import_time = min(import_time, measure_import(module_name)[module_name])
+        assert import_time < budget, f'{module_name} import time: {import_time:.3f}s (budget: {budget:.3f}s)'